@@ -170,6 +170,9 @@ const injectedRtkApi = api.injectEndpoints({
         method: "POST",
       }),
     }),
+    listSaves: build.query<ListSavesApiResponse, ListSavesApiArg>({
+      query: () => ({ url: `/saves/` }),
+    }),
     listSupplyRoutes: build.query<
       ListSupplyRoutesApiResponse,
       ListSupplyRoutesApiArg
@@ -321,6 +324,8 @@ export type OpenControlPointInfoDialogApiResponse =
 export type OpenControlPointInfoDialogApiArg = {
   cpId: string;
 };
+export type ListSavesApiResponse = /** status 200 Successful Response */ Save[];
+export type ListSavesApiArg = void;
 export type ListSupplyRoutesApiResponse =
   /** status 200 Successful Response */ SupplyRoute[];
 export type ListSupplyRoutesApiArg = void;
@@ -427,6 +432,21 @@ export type Tgo = {
   dead: boolean;
   sidc: string;
 };
+export type Save = {
+  path: string;
+  name: string;
+  modified: string;
+  size: number;
+  turn?: number;
+  date?: string;
+  theater?: string;
+  player_faction?: string;
+  enemy_faction?: string;
+  player_budget?: number;
+  enemy_budget?: number;
+  player_bases?: number;
+  enemy_bases?: number;
+};
 export type SupplyRoute = {
   id: string;
   points: LatLng[];
@@ -514,6 +534,7 @@ export const {
   useOpenTgoInfoDialogMutation,
   useOpenNewControlPointPackageDialogMutation,
   useOpenControlPointInfoDialogMutation,
+  useListSavesQuery,
   useListSupplyRoutesQuery,
   useListTgosQuery,
   useGetTgoByIdQuery,
@@ -10,12 +10,12 @@
 from pathlib import Path
 from typing import Any, ClassVar, Dict, Optional, TYPE_CHECKING, Tuple
 
-import yaml
 from dcs.terrain import Airport
 from dcs.task import Modulation
 
 from game.radio.radios import RadioFrequency
 from game.radio.tacan import TacanChannel
+from game.resourcecache import load_resource
 
 if TYPE_CHECKING:
     from game.theater import ConflictTheater
@@ -98,8 +98,7 @@ def ils_freq(self, runway: str) -> Optional[RadioFrequency]:
 
     @classmethod
     def from_file(cls, airfield_yaml: Path) -> AirfieldData:
-        with airfield_yaml.open() as yaml_file:
-            data = yaml.safe_load(yaml_file)
+        data = load_resource(airfield_yaml)
 
         tacan_channel = None
         tacan_callsign = None
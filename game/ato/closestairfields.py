@@ -1,27 +1,137 @@
 """Objective adjacency lists."""
 from __future__ import annotations
 
-from typing import Dict, Iterator, List, Optional, TYPE_CHECKING
+import itertools
+from collections.abc import Iterable, Sequence
+from typing import Dict, Iterator, List, Optional, TYPE_CHECKING, TypeVar
+
+import numpy as np
 
 from game.utils import Distance
 
 if TYPE_CHECKING:
     from game.theater import ConflictTheater, ControlPoint, MissionTarget
 
+MissionTargetType = TypeVar("MissionTargetType", bound="MissionTarget")
+
+
+def _positions(targets: Iterable[MissionTarget]) -> np.ndarray:
+    return np.array(
+        [(t.position.x, t.position.y) for t in targets], dtype=float
+    ).reshape(-1, 2)
+
+
+class TheaterDistanceMatrix:
+    """Distances between every mission target and every control point in a theater.
+
+    Row i of `distances` holds the distance from target i to each control point, in
+    the order of `control_points`. Rows for the theater's control points and ground
+    objects are computed when the matrix is built. Rows for other targets (front
+    lines, for example) are added the first time they're requested, and a row is
+    recomputed whenever its target has moved since it was last requested.
+
+    Targets are identified by name, as they were by the original per-target cache.
+    Control point moves must be reported with `update_control_point`.
+    """
+
+    def __init__(
+        self, control_points: List[ControlPoint], targets: Iterable[MissionTarget]
+    ) -> None:
+        self.control_points = control_points
+        self._columns = {cp: i for i, cp in enumerate(control_points)}
+        self._control_point_positions = _positions(control_points)
+        self._rows: dict[str, int] = {}
+        unique_targets: list[MissionTarget] = []
+        for target in targets:
+            if target.name not in self._rows:
+                self._rows[target.name] = len(unique_targets)
+                unique_targets.append(target)
+        self._target_positions = _positions(unique_targets)
+        self.distances = self._distances_from(self._target_positions)
+
+    @classmethod
+    def for_theater(cls, theater: ConflictTheater) -> TheaterDistanceMatrix:
+        return TheaterDistanceMatrix(
+            theater.controlpoints,
+            itertools.chain(theater.controlpoints, theater.ground_objects),
+        )
+
+    def _distances_from(self, positions: np.ndarray) -> np.ndarray:
+        delta = positions[:, np.newaxis, :] - self._control_point_positions
+        return np.hypot(delta[..., 0], delta[..., 1])
+
+    def row_index(self, target: MissionTarget) -> int:
+        """Returns the row for the target, adding or updating it as needed."""
+        position = np.array([[target.position.x, target.position.y]])
+        index = self._rows.get(target.name)
+        if index is None:
+            index = len(self._rows)
+            self._rows[target.name] = index
+            self._target_positions = np.vstack([self._target_positions, position])
+            self.distances = np.vstack([self.distances, self._distances_from(position)])
+        elif not np.array_equal(self._target_positions[index], position[0]):
+            self._target_positions[index] = position[0]
+            self.distances[index] = self._distances_from(position)[0]
+        return index
+
+    def distances_to(self, target: MissionTarget) -> np.ndarray:
+        """Returns the distance from the target to each control point.
+
+        The returned array is a view into the matrix, so it must not be modified and
+        is only valid until the next change to the matrix.
+        """
+        index = self.row_index(target)
+        return self.distances[index]
+
+    def update_control_point(self, control_point: ControlPoint) -> None:
+        """Recomputes the distances to a control point that has moved."""
+        column = self._columns[control_point]
+        position = np.array([control_point.position.x, control_point.position.y])
+        self._control_point_positions[column] = position
+        delta = self._target_positions - position
+        self.distances[:, column] = np.hypot(delta[:, 0], delta[:, 1])
+
+    def nearest_distances(
+        self,
+        targets: Sequence[MissionTarget],
+        control_points: Iterable[ControlPoint],
+    ) -> np.ndarray:
+        """Returns the distance from each target to the closest of the control points.
+
+        Targets with no control points to measure against are infinitely far away.
+        """
+        columns = [self._columns[cp] for cp in control_points]
+        if not columns:
+            return np.full(len(targets), np.inf)
+        rows = [self.row_index(t) for t in targets]
+        return self.distances[np.ix_(rows, columns)].min(axis=1)
+
 
 class ClosestAirfields:
     """Precalculates which control points are closes to the given target."""
 
     def __init__(
-        self, target: MissionTarget, all_control_points: List[ControlPoint]
+        self,
+        target: MissionTarget,
+        all_control_points: List[ControlPoint],
+        distances: np.ndarray,
     ) -> None:
         self.target = target
+        self.position = (target.position.x, target.position.y)
         # This cache is configured once on load, so it's important that it is
         # complete and deterministic to avoid different behaviors across loads.
         # E.g. https://github.com/dcs-liberation/dcs_liberation/issues/819
-        self.closest_airfields: List[ControlPoint] = sorted(
-            all_control_points, key=lambda c: self.target.distance_to(c)
-        )
+        #
+        # A stable sort breaks ties in control point order, as sorted() did.
+        order = np.argsort(distances, kind="stable")
+        self.sorted_distances = distances[order]
+        self.closest_airfields: List[ControlPoint] = [
+            all_control_points[i] for i in order
+        ]
+
+    def is_current_for(self, target: MissionTarget) -> bool:
+        """Returns True if the target has not moved since this list was built."""
+        return self.position == (target.position.x, target.position.y)
 
     @property
     def operational_airfields(self) -> Iterator[ControlPoint]:
@@ -30,14 +140,10 @@ def operational_airfields(self) -> Iterator[ControlPoint]:
     def _airfields_within(
         self, distance: Distance, operational: bool
     ) -> Iterator[ControlPoint]:
-        airfields = (
-            self.operational_airfields if operational else self.closest_airfields
-        )
-        for cp in airfields:
-            if cp.distance_to(self.target) < distance.meters:
+        count = int(np.searchsorted(self.sorted_distances, distance.meters))
+        for cp in self.closest_airfields[:count]:
+            if not operational or cp.runway_is_operational():
                 yield cp
-            else:
-                break
 
     def operational_airfields_within(
         self, distance: Distance
@@ -60,21 +166,65 @@ def all_airfields_within(self, distance: Distance) -> Iterator[ControlPoint]:
 
 class ObjectiveDistanceCache:
     theater: Optional[ConflictTheater] = None
+    distance_matrix: Optional[TheaterDistanceMatrix] = None
     closest_airfields: Dict[str, ClosestAirfields] = {}
 
     @classmethod
     def set_theater(cls, theater: ConflictTheater) -> None:
-        if cls.theater is not None:
-            cls.closest_airfields = {}
+        cls.closest_airfields = {}
         cls.theater = theater
+        cls.distance_matrix = TheaterDistanceMatrix.for_theater(theater)
 
     @classmethod
-    def get_closest_airfields(cls, location: MissionTarget) -> ClosestAirfields:
-        if cls.theater is None:
+    def _matrix(cls) -> TheaterDistanceMatrix:
+        if cls.distance_matrix is None:
             raise RuntimeError("Call ObjectiveDistanceCache.set_theater before using")
+        return cls.distance_matrix
 
-        if location.name not in cls.closest_airfields:
-            cls.closest_airfields[location.name] = ClosestAirfields(
-                location, cls.theater.controlpoints
+    @classmethod
+    def get_closest_airfields(cls, location: MissionTarget) -> ClosestAirfields:
+        matrix = cls._matrix()
+        closest = cls.closest_airfields.get(location.name)
+        if closest is None or not closest.is_current_for(location):
+            closest = ClosestAirfields(
+                location, matrix.control_points, matrix.distances_to(location)
             )
-        return cls.closest_airfields[location.name]
+            cls.closest_airfields[location.name] = closest
+        return closest
+
+    @classmethod
+    def control_point_moved(cls, control_point: ControlPoint) -> None:
+        """Updates the cache after a carrier or LHA has moved.
+
+        Every closest airfield list may include the moved control point, so all of
+        them are rebuilt on their next use.
+        """
+        if cls.distance_matrix is None:
+            return
+        cls.distance_matrix.update_control_point(control_point)
+        cls.closest_airfields = {}
+
+    @classmethod
+    def nearest_distances(
+        cls,
+        targets: Sequence[MissionTarget],
+        control_points: Iterable[ControlPoint],
+    ) -> np.ndarray:
+        """Returns the distance from each target to the closest of the control points."""
+        return cls._matrix().nearest_distances(targets, control_points)
+
+    @classmethod
+    def targets_within(
+        cls,
+        targets: Iterable[MissionTargetType],
+        control_points: Iterable[ControlPoint],
+        distance: Distance,
+    ) -> list[MissionTargetType]:
+        """Returns the targets within the given distance of any of the control points."""
+        target_list = list(targets)
+        nearest = cls.nearest_distances(target_list, control_points)
+        return [
+            target
+            for target, in_range in zip(target_list, nearest < distance.meters)
+            if in_range
+        ]
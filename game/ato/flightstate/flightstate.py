@@ -77,6 +77,23 @@ def estimate_position(self) -> Point:
     def spawn_type(self) -> StartType:
         ...
 
+    def time_until_transition(self, time: datetime) -> Optional[timedelta]:
+        """Returns the time remaining before this state ends on its own.
+
+        The state will end on the first tick at or after the returned duration. None
+        means that the state never ends on its own, either because it is final or
+        because it is ended by something else (such as a combat).
+        """
+        return None
+
+    def estimate_position_after(self, duration: timedelta) -> Point:
+        """Estimates the position of the flight after the given duration.
+
+        Assumes that the state does not end before then. Flights travel in a straight
+        line between their current position and the returned position.
+        """
+        return self.estimate_position()
+
     def a2a_commit_region(self) -> Optional[ThreatPoly]:
         return None
 
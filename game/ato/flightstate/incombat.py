@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING
 
 from dcs import Point
 
@@ -55,6 +55,10 @@ def on_game_tick(
         # across multiple flights.
         pass
 
+    def time_until_transition(self, time: datetime) -> Optional[timedelta]:
+        # Ended by the combat.
+        return None
+
     @property
     def is_at_ip(self) -> bool:
         return False
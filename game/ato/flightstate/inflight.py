@@ -2,7 +2,7 @@
 
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING
 
 from dcs import Point
 
@@ -127,6 +127,15 @@ def on_game_tick(
             rollover = self.elapsed_time - self.total_time_to_next_waypoint
             new_state.on_game_tick(events, time, rollover)
 
+    def time_until_transition(self, time: datetime) -> Optional[timedelta]:
+        # The waypoint is only passed once the elapsed time *exceeds* the travel time,
+        # so the transition happens one (microsecond) tick after the travel time.
+        return (
+            self.total_time_to_next_waypoint
+            - self.elapsed_time
+            + timedelta(microseconds=1)
+        )
+
     @property
     def is_at_ip(self) -> bool:
         contact_types = {
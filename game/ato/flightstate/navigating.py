@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING
 
 from dcs import Point
 
@@ -28,9 +28,11 @@ def on_game_tick(
         if not self.current_waypoint_elapsed:
             events.update_flight_position(self.flight, self.estimate_position())
 
-    def progress(self) -> float:
+    def progress(self, elapsed_time: Optional[timedelta] = None) -> float:
+        if elapsed_time is None:
+            elapsed_time = self.elapsed_time
         return (
-            self.elapsed_time.total_seconds()
+            elapsed_time.total_seconds()
             / self.total_time_to_next_waypoint.total_seconds()
         )
 
@@ -39,6 +41,12 @@ def estimate_position(self) -> Point:
             self.next_waypoint.position, self.progress()
         )
 
+    def estimate_position_after(self, duration: timedelta) -> Point:
+        return self.current_waypoint.position.lerp(
+            self.next_waypoint.position,
+            min(1.0, self.progress(self.elapsed_time + duration)),
+        )
+
     def estimate_altitude(self) -> tuple[Distance, str]:
         return (
             meters(
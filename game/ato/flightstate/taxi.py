@@ -2,7 +2,7 @@
 
 import logging
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING
 
 from .atdeparture import AtDeparture
 from .takeoff import Takeoff
@@ -26,6 +26,9 @@ def on_game_tick(
             return
         self.flight.set_state(Takeoff(self.flight, self.settings, time))
 
+    def time_until_transition(self, time: datetime) -> Optional[timedelta]:
+        return self.completion_time - time
+
     @property
     def is_waiting_for_start(self) -> bool:
         return False
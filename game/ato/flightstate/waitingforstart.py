@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING
 
 from game.ato.starttype import StartType
 from .atdeparture import AtDeparture
@@ -48,6 +48,9 @@ def on_game_tick(
             new_state = Navigating(self.flight, self.settings, waypoint_index=0)
         self.flight.set_state(new_state)
 
+    def time_until_transition(self, time: datetime) -> Optional[timedelta]:
+        return self.start_time - time
+
     @property
     def is_waiting_for_start(self) -> bool:
         return True
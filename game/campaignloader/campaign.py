@@ -4,13 +4,14 @@
 import logging
 from collections.abc import Iterator
 from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
 from typing import Any, Dict, Tuple
 
-import yaml
 from packaging.version import Version
 
 from game.profiling import logged_duration
+from game.resourcecache import ResourceCache, parse_resource
 from game.theater import (
     CaucasusTheater,
     ConflictTheater,
@@ -24,7 +25,8 @@
 from game.theater.iadsnetwork.iadsnetwork import IadsNetwork
 from game.version import CAMPAIGN_FORMAT_VERSION
 from .campaignairwingconfig import CampaignAirWingConfig
-from .mizcampaignloader import MizCampaignLoader
+from .mizcampaigndata import MizCampaignCache
+from .mizcampaignloader import load_miz_campaign_data
 from .. import persistency
 
 PERF_FRIENDLY = 0
@@ -33,6 +35,10 @@
 PERF_NASA = 3
 DEFAULT_BUDGET = 2000
 
+CAMPAIGN_INDEX_FILE = "Liberation/campaigns.p"
+# Increment whenever the fields of Campaign change.
+CAMPAIGN_INDEX_VERSION = 1
+
 
 @dataclass(frozen=True)
 class Campaign:
@@ -57,14 +63,21 @@ class Campaign:
     recommended_enemy_income_multiplier: float
 
     performance: int
-    data: Dict[str, Any]
     path: Path
     advanced_iads: bool
 
+    @cached_property
+    def data(self) -> Dict[str, Any]:
+        """The full campaign definition.
+
+        Only the metadata of the campaign is kept in the campaign index, so the
+        campaign file is read again the first time this is used.
+        """
+        return parse_resource(self.path)
+
     @classmethod
     def from_file(cls, path: Path) -> Campaign:
-        with path.open() as campaign_file:
-            data = yaml.safe_load(campaign_file)
+        data = parse_resource(path)
 
         sanitized_theater = data["theater"].replace(" ", "")
         version_field = data.get("version", "0")
@@ -108,7 +121,6 @@ def from_file(cls, path: Path) -> Campaign:
             data.get("recommended_player_income_multiplier", 1.0),
             data.get("recommended_enemy_income_multiplier", 1.0),
             data.get("performance", 0),
-            data,
             path,
             data.get("advanced_iads", False),
         )
@@ -134,7 +146,12 @@ def load_theater(self, advanced_iads: bool) -> ConflictTheater:
             ) from ex
 
         with logged_duration("Importing miz data"):
-            MizCampaignLoader(self.path.parent / miz, t).populate_theater()
+            campaign_data = load_miz_campaign_data(
+                self.path.parent / miz,
+                t.terrain,
+                MizCampaignCache.default() if persistency.is_set_up() else None,
+            )
+            campaign_data.populate_theater(t)
 
         # Load IADS Config from campaign yaml
         iads_data = self.data.get("iads_config", [])
@@ -191,10 +208,22 @@ def iter_campaign_defs(cls) -> Iterator[Path]:
 
     @classmethod
     def load_each(cls) -> Iterator[Campaign]:
+        # The campaigns are listed from an index of their metadata, so only the
+        # campaign files that changed since the last time need to be read.
+        index = ResourceCache.open(
+            Path(persistency.base_path()) / CAMPAIGN_INDEX_FILE,
+            parse=Campaign.from_file,
+            version=CAMPAIGN_INDEX_VERSION,
+        )
         for path in cls.iter_campaign_defs():
             try:
                 logging.debug(f"Loading campaign from {path}...")
-                campaign = Campaign.from_file(path)
+                campaign = index.load(path)
                 yield campaign
             except RuntimeError:
                 logging.exception(f"Unable to load campaign from {path}")
+        logging.debug(
+            f"Loaded {index.hits + index.misses} campaigns, read {index.misses} "
+            "campaign files"
+        )
+        index.save()
@@ -0,0 +1,221 @@
+"""Theater data extracted from a campaign miz, and the cache of that data.
+
+Loading a campaign miz with pydcs is the slowest part of creating a new game. The
+data Liberation needs from it (control points, preset locations, supply routes and
+shipping lanes) is small, so it is cached in the user's Liberation directory, keyed
+by the hash of the miz. The cache is dropped when the version of Liberation changes.
+
+The cached data refers to the terrain of the miz through its positions. The terrain
+is not part of the cache: the data is unpickled against the terrain of the theater
+it is loaded into.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+import os
+import pickle
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, TYPE_CHECKING, Union, cast
+
+from dcs.mapping import Point
+from dcs.terrain import Airport
+from dcs.terrain.terrain import Terrain
+
+from game import persistency
+from game.scenery_group import SceneryGroup
+from game.theater.controlpoint import Airfield, ControlPoint
+from game.theater.presetlocation import PresetLocation
+from game.version import VERSION
+
+if TYPE_CHECKING:
+    from game.theater.conflicttheater import ConflictTheater
+
+MIZ_CACHE_DIR = "Liberation/CampaignCache"
+# Increment whenever the format of MizCampaignData changes.
+MIZ_CACHE_VERSION = 1
+
+# The persistent ID of the terrain in pickled MizCampaignData.
+_TERRAIN_ID = "terrain"
+
+#: The constructor of the control point types that are not airfields.
+ControlPointFactory = Callable[[str, Point, "ConflictTheater", bool], ControlPoint]
+
+
+@dataclass(frozen=True)
+class MizControlPoint:
+    """A control point defined by the campaign miz."""
+
+    cp_type: type[ControlPoint]
+    name: str
+    position: Point
+    starts_blue: bool
+    captured_invert: bool
+    #: The airport of an Airfield, None for all other control points.
+    airport: Optional[Airport] = None
+
+    def create(self, theater: ConflictTheater) -> ControlPoint:
+        control_point: ControlPoint
+        if self.airport is not None:
+            control_point = Airfield(self.airport, theater, self.starts_blue)
+        else:
+            # Every other control point type is created from a name and a position.
+            factory = cast(ControlPointFactory, self.cp_type)
+            control_point = factory(self.name, self.position, theater, self.starts_blue)
+        control_point.captured_invert = self.captured_invert
+        return control_point
+
+
+@dataclass(frozen=True)
+class MizPresetLocation:
+    """A location defined by the campaign miz for the closest control point."""
+
+    #: The name of the PresetLocations list the location is added to, or "helipads"
+    #: for the helipads of the control point.
+    kind: str
+    location: Union[PresetLocation, SceneryGroup]
+    allow_naval: bool = False
+
+    @property
+    def position(self) -> Point:
+        if isinstance(self.location, PresetLocation):
+            return self.location
+        return self.location.position
+
+    def add_to(self, theater: ConflictTheater) -> None:
+        closest = theater.closest_control_point(self.position, self.allow_naval)
+        if self.kind == "helipads":
+            locations: list[Any] = closest.helipads
+        else:
+            locations = getattr(closest.preset_locations, self.kind)
+        locations.append(self.location)
+
+
+@dataclass(frozen=True)
+class MizRoute:
+    """A supply route or shipping lane between the control points at its ends."""
+
+    name: str
+    waypoints: list[Point]
+
+    def endpoints(self, theater: ConflictTheater) -> tuple[ControlPoint, ControlPoint]:
+        # The unit will have its first waypoint at the source CP and the final
+        # waypoint at the destination CP. Each waypoint defines the path of the
+        # convoy or cargo ship.
+        origin = theater.closest_control_point(self.waypoints[0])
+        if origin is None:
+            raise RuntimeError(
+                f"No control point near the first waypoint of {self.name}"
+            )
+        destination = theater.closest_control_point(self.waypoints[-1])
+        if destination is None:
+            raise RuntimeError(
+                f"No control point near the final waypoint of {self.name}"
+            )
+        return origin, destination
+
+
+@dataclass(frozen=True)
+class MizCampaignData:
+    control_points: list[MizControlPoint]
+    preset_locations: list[MizPresetLocation]
+    supply_routes: list[MizRoute]
+    shipping_lanes: list[MizRoute]
+
+    def populate_theater(self, theater: ConflictTheater) -> None:
+        for control_point in self.control_points:
+            theater.add_controlpoint(control_point.create(theater))
+        for location in self.preset_locations:
+            location.add_to(theater)
+        for route in self.supply_routes:
+            origin, destination = route.endpoints(theater)
+            origin.create_convoy_route(destination, route.waypoints)
+            destination.create_convoy_route(origin, list(reversed(route.waypoints)))
+        for route in self.shipping_lanes:
+            origin, destination = route.endpoints(theater)
+            origin.create_shipping_lane(destination, route.waypoints)
+            destination.create_shipping_lane(origin, list(reversed(route.waypoints)))
+
+    def dumps(self) -> bytes:
+        """Pickles the data without the terrain it refers to."""
+        data = io.BytesIO()
+        _TerrainPickler(data, protocol=5).dump(self)
+        return data.getvalue()
+
+    @staticmethod
+    def loads(data: bytes, terrain: Terrain) -> MizCampaignData:
+        """Unpickles data pickled by dumps, in the given terrain."""
+        campaign_data = _TerrainUnpickler(io.BytesIO(data), terrain).load()
+        if not isinstance(campaign_data, MizCampaignData):
+            raise TypeError(f"Expected MizCampaignData, got {type(campaign_data)}")
+        return campaign_data
+
+
+class _TerrainPickler(pickle.Pickler):
+    def persistent_id(self, obj: Any) -> Optional[str]:
+        if isinstance(obj, Terrain):
+            return _TERRAIN_ID
+        return None
+
+
+class _TerrainUnpickler(pickle.Unpickler):
+    def __init__(self, file: io.BytesIO, terrain: Terrain) -> None:
+        super().__init__(file)
+        self.terrain = terrain
+
+    def persistent_load(self, pid: Any) -> Terrain:
+        if pid != _TERRAIN_ID:
+            raise pickle.UnpicklingError(f"Unknown persistent ID {pid}")
+        return self.terrain
+
+
+def miz_hash(miz: Path) -> str:
+    with miz.open("rb") as miz_file:
+        return hashlib.sha256(miz_file.read()).hexdigest()
+
+
+class MizCampaignCache:
+    """Cache of the pickled MizCampaignData of each campaign miz."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    @staticmethod
+    def default() -> MizCampaignCache:
+        return MizCampaignCache(Path(persistency.base_path()) / MIZ_CACHE_DIR)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.p"
+
+    def load(self, key: str) -> Optional[bytes]:
+        """Returns the cached data for the miz hash, or None if it isn't cached."""
+        path = self._path(key)
+        if not path.is_file():
+            return None
+        try:
+            with path.open("rb") as cache_file:
+                version, cached_key, data = pickle.load(cache_file)
+            if version == (MIZ_CACHE_VERSION, VERSION) and cached_key == key:
+                return data
+        except Exception:
+            # The data will be extracted from the miz again.
+            logging.exception(f"Ignoring unreadable campaign cache {path}")
+        return None
+
+    def save(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        temp_path = path.with_name(f"{path.name}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with temp_path.open("wb") as cache_file:
+                pickle.dump(
+                    ((MIZ_CACHE_VERSION, VERSION), key, data), cache_file, protocol=5
+                )
+            os.replace(temp_path, path)
+        except OSError as ex:
+            logging.warning(f"Could not save campaign cache {path}: {ex}")
+        finally:
+            temp_path.unlink(missing_ok=True)
@@ -1,10 +1,8 @@
 from __future__ import annotations
 
 import itertools
-from functools import cached_property
 from pathlib import Path
-from typing import Iterator, List, TYPE_CHECKING, Tuple
-from uuid import UUID
+from typing import Any, Iterator, List, Optional
 
 from dcs import Mission
 from dcs.countries import CombinedJointTaskForcesBlue, CombinedJointTaskForcesRed
@@ -12,12 +10,17 @@
 from dcs.planes import F_15C
 from dcs.ships import HandyWind, LHA_Tarawa, Stennis, USS_Arleigh_Burke_IIa
 from dcs.statics import Fortification, Warehouse
-from dcs.terrain import Airport
+from dcs.terrain.terrain import Terrain
 from dcs.triggers import TriggerZoneCircular
-from dcs.unitgroup import PlaneGroup, ShipGroup, StaticGroup, VehicleGroup
+from dcs.unitgroup import (
+    MovingGroup,
+    PlaneGroup,
+    ShipGroup,
+    StaticGroup,
+    VehicleGroup,
+)
 from dcs.vehicles import AirDefence, Armor, MissilesSS, Unarmed
 
-from game.positioned import Positioned
 from game.profiling import logged_duration
 from game.scenery_group import SceneryGroup
 from game.theater.controlpoint import (
@@ -28,11 +31,15 @@
     Lha,
     OffMapSpawn,
 )
-from game.theater.presetlocation import PresetLocation
-from game.utils import Distance, meters
-
-if TYPE_CHECKING:
-    from game.theater.conflicttheater import ConflictTheater
+from game.theater.presetlocation import GroupT, PresetLocation
+from .mizcampaigndata import (
+    MizCampaignCache,
+    MizCampaignData,
+    MizControlPoint,
+    MizPresetLocation,
+    MizRoute,
+    miz_hash,
+)
 
 
 class MizCampaignLoader:
@@ -95,8 +102,7 @@ class MizCampaignLoader:
 
     STRIKE_TARGET_UNIT_TYPE = Fortification.Tech_combine.id
 
-    def __init__(self, miz: Path, theater: ConflictTheater) -> None:
-        self.theater = theater
+    def __init__(self, miz: Path) -> None:
         self.mission = Mission()
         with logged_duration("Loading miz"):
             self.mission.load_file(str(miz))
@@ -108,15 +114,6 @@ def __init__(self, miz: Path, theater: ConflictTheater) -> None:
         if self.mission.country(self.RED_COUNTRY.name) is None:
             self.mission.coalition["red"].add_country(self.RED_COUNTRY)
 
-    def control_point_from_airport(self, airport: Airport) -> ControlPoint:
-        cp = Airfield(airport, self.theater, starts_blue=airport.is_blue())
-
-        # Use the unlimited aircraft option to determine if an airfield should
-        # be owned by the player when the campaign is "inverted".
-        cp.captured_invert = airport.unlimited_aircrafts
-
-        return cp
-
     def country(self, blue: bool) -> Country:
         country = self.mission.country(
             self.BLUE_COUNTRY.name if blue else self.RED_COUNTRY.name
@@ -245,39 +242,43 @@ def scenery(self) -> List[SceneryGroup]:
             if isinstance(z, TriggerZoneCircular)
         )
 
-    @cached_property
-    def control_points(self) -> dict[UUID, ControlPoint]:
-        control_points = {}
+    @property
+    def control_points(self) -> list[MizControlPoint]:
+        control_points = []
         for airport in self.mission.terrain.airport_list():
             if airport.is_blue() or airport.is_red():
-                control_point = self.control_point_from_airport(airport)
-                control_points[control_point.id] = control_point
+                control_points.append(
+                    MizControlPoint(
+                        Airfield,
+                        airport.name,
+                        airport.position,
+                        starts_blue=airport.is_blue(),
+                        # Use the unlimited aircraft option to determine if an
+                        # airfield should be owned by the player when the campaign is
+                        # "inverted".
+                        captured_invert=airport.unlimited_aircrafts,
+                        airport=airport,
+                    )
+                )
 
         for blue in (False, True):
-            for group in self.off_map_spawns(blue):
-                control_point = OffMapSpawn(
-                    str(group.name), group.position, self.theater, starts_blue=blue
-                )
-                control_point.captured_invert = group.late_activation
-                control_points[control_point.id] = control_point
-            for ship in self.carriers(blue):
-                control_point = Carrier(
-                    ship.name, ship.position, self.theater, starts_blue=blue
-                )
-                control_point.captured_invert = ship.late_activation
-                control_points[control_point.id] = control_point
-            for ship in self.lhas(blue):
-                control_point = Lha(
-                    ship.name, ship.position, self.theater, starts_blue=blue
-                )
-                control_point.captured_invert = ship.late_activation
-                control_points[control_point.id] = control_point
-            for fob in self.fobs(blue):
-                control_point = Fob(
-                    str(fob.name), fob.position, self.theater, starts_blue=blue
-                )
-                control_point.captured_invert = fob.late_activation
-                control_points[control_point.id] = control_point
+            groups: list[tuple[type[ControlPoint], Iterator[MovingGroup[Any]]]] = [
+                (OffMapSpawn, self.off_map_spawns(blue)),
+                (Carrier, self.carriers(blue)),
+                (Lha, self.lhas(blue)),
+                (Fob, self.fobs(blue)),
+            ]
+            for cp_type, cp_groups in groups:
+                for group in cp_groups:
+                    control_points.append(
+                        MizControlPoint(
+                            cp_type,
+                            str(group.name),
+                            group.position,
+                            starts_blue=blue,
+                            captured_invert=group.late_activation,
+                        )
+                    )
 
         return control_points
 
@@ -311,157 +312,81 @@ def iads_power_sources(self) -> Iterator[StaticGroup]:
             if group.units[0].type in self.POWER_SOURCE_UNIT_TYPE:
                 yield group
 
-    def add_supply_routes(self) -> None:
-        for group in self.front_line_path_groups:
-            # The unit will have its first waypoint at the source CP and the final
-            # waypoint at the destination CP. Each waypoint defines the path of the
-            # cargo ship.
-            waypoints = [p.position for p in group.points]
-            origin = self.theater.closest_control_point(waypoints[0])
-            if origin is None:
-                raise RuntimeError(
-                    f"No control point near the first waypoint of {group.name}"
-                )
-            destination = self.theater.closest_control_point(waypoints[-1])
-            if destination is None:
-                raise RuntimeError(
-                    f"No control point near the final waypoint of {group.name}"
-                )
-
-            self.control_points[origin.id].create_convoy_route(destination, waypoints)
-            self.control_points[destination.id].create_convoy_route(
-                origin, list(reversed(waypoints))
-            )
-
-    def add_shipping_lanes(self) -> None:
-        for group in self.shipping_lane_groups:
-            # The unit will have its first waypoint at the source CP and the final
-            # waypoint at the destination CP. Each waypoint defines the path of the
-            # cargo ship.
-            waypoints = [p.position for p in group.points]
-            origin = self.theater.closest_control_point(waypoints[0])
-            if origin is None:
-                raise RuntimeError(
-                    f"No control point near the first waypoint of {group.name}"
-                )
-            destination = self.theater.closest_control_point(waypoints[-1])
-            if destination is None:
-                raise RuntimeError(
-                    f"No control point near the final waypoint of {group.name}"
-                )
-
-            self.control_points[origin.id].create_shipping_lane(destination, waypoints)
-            self.control_points[destination.id].create_shipping_lane(
-                origin, list(reversed(waypoints))
-            )
-
-    def objective_info(
-        self, near: Positioned, allow_naval: bool = False
-    ) -> Tuple[ControlPoint, Distance]:
-        closest = self.theater.closest_control_point(near.position, allow_naval)
-        distance = meters(closest.position.distance_to_point(near.position))
-        return closest, distance
-
-    def add_preset_locations(self) -> None:
-        for static in self.offshore_strike_targets:
-            closest, distance = self.objective_info(static)
-            closest.preset_locations.offshore_strike_locations.append(
-                PresetLocation.from_group(static)
-            )
-
-        for ship in self.ships:
-            closest, distance = self.objective_info(ship, allow_naval=True)
-            closest.preset_locations.ships.append(PresetLocation.from_group(ship))
-
-        for group in self.missile_sites:
-            closest, distance = self.objective_info(group)
-            closest.preset_locations.missile_sites.append(
-                PresetLocation.from_group(group)
-            )
-
-        for group in self.coastal_defenses:
-            closest, distance = self.objective_info(group)
-            closest.preset_locations.coastal_defenses.append(
-                PresetLocation.from_group(group)
-            )
-
-        for group in self.long_range_sams:
-            closest, distance = self.objective_info(group)
-            closest.preset_locations.long_range_sams.append(
-                PresetLocation.from_group(group)
-            )
-
-        for group in self.medium_range_sams:
-            closest, distance = self.objective_info(group)
-            closest.preset_locations.medium_range_sams.append(
-                PresetLocation.from_group(group)
-            )
-
-        for group in self.short_range_sams:
-            closest, distance = self.objective_info(group)
-            closest.preset_locations.short_range_sams.append(
-                PresetLocation.from_group(group)
-            )
-
-        for group in self.aaa:
-            closest, distance = self.objective_info(group)
-            closest.preset_locations.aaa.append(PresetLocation.from_group(group))
-
-        for group in self.ewrs:
-            closest, distance = self.objective_info(group)
-            closest.preset_locations.ewrs.append(PresetLocation.from_group(group))
-
-        for group in self.armor_groups:
-            closest, distance = self.objective_info(group)
-            closest.preset_locations.armor_groups.append(
-                PresetLocation.from_group(group)
-            )
-
-        for static in self.helipads:
-            closest, distance = self.objective_info(static)
-            closest.helipads.append(PresetLocation.from_group(static))
-
-        for static in self.factories:
-            closest, distance = self.objective_info(static)
-            closest.preset_locations.factories.append(PresetLocation.from_group(static))
-
-        for static in self.ammunition_depots:
-            closest, distance = self.objective_info(static)
-            closest.preset_locations.ammunition_depots.append(
-                PresetLocation.from_group(static)
-            )
-
-        for static in self.strike_targets:
-            closest, distance = self.objective_info(static)
-            closest.preset_locations.strike_locations.append(
-                PresetLocation.from_group(static)
-            )
+    @property
+    def supply_routes(self) -> list[MizRoute]:
+        return [
+            MizRoute(str(group.name), [p.position for p in group.points])
+            for group in self.front_line_path_groups
+        ]
 
-        for iads_command_center in self.iads_command_centers:
-            closest, distance = self.objective_info(iads_command_center)
-            closest.preset_locations.iads_command_center.append(
-                PresetLocation.from_group(iads_command_center)
+    @property
+    def shipping_lanes(self) -> list[MizRoute]:
+        return [
+            MizRoute(str(group.name), [p.position for p in group.points])
+            for group in self.shipping_lane_groups
+        ]
+
+    @staticmethod
+    def _preset_locations(
+        kind: str, groups: Iterator[GroupT], allow_naval: bool = False
+    ) -> Iterator[MizPresetLocation]:
+        for group in groups:
+            yield MizPresetLocation(
+                kind, PresetLocation.from_group(group), allow_naval=allow_naval
             )
 
-        for iads_connection_node in self.iads_connection_nodes:
-            closest, distance = self.objective_info(iads_connection_node)
-            closest.preset_locations.iads_connection_node.append(
-                PresetLocation.from_group(iads_connection_node)
+    @property
+    def preset_locations(self) -> list[MizPresetLocation]:
+        locations = list(
+            itertools.chain(
+                self._preset_locations(
+                    "offshore_strike_locations", self.offshore_strike_targets
+                ),
+                self._preset_locations("ships", self.ships, allow_naval=True),
+                self._preset_locations("missile_sites", self.missile_sites),
+                self._preset_locations("coastal_defenses", self.coastal_defenses),
+                self._preset_locations("long_range_sams", self.long_range_sams),
+                self._preset_locations("medium_range_sams", self.medium_range_sams),
+                self._preset_locations("short_range_sams", self.short_range_sams),
+                self._preset_locations("aaa", self.aaa),
+                self._preset_locations("ewrs", self.ewrs),
+                self._preset_locations("armor_groups", self.armor_groups),
+                self._preset_locations("helipads", self.helipads),
+                self._preset_locations("factories", self.factories),
+                self._preset_locations("ammunition_depots", self.ammunition_depots),
+                self._preset_locations("strike_locations", self.strike_targets),
+                self._preset_locations(
+                    "iads_command_center", self.iads_command_centers
+                ),
+                self._preset_locations(
+                    "iads_connection_node", self.iads_connection_nodes
+                ),
+                self._preset_locations("iads_power_source", self.iads_power_sources),
             )
+        )
+        for scenery_group in self.scenery:
+            locations.append(MizPresetLocation("scenery", scenery_group))
+        return locations
+
+    def extract(self) -> MizCampaignData:
+        return MizCampaignData(
+            self.control_points,
+            self.preset_locations,
+            self.supply_routes,
+            self.shipping_lanes,
+        )
 
-        for iads_power_source in self.iads_power_sources:
-            closest, distance = self.objective_info(iads_power_source)
-            closest.preset_locations.iads_power_source.append(
-                PresetLocation.from_group(iads_power_source)
-            )
 
-        for scenery_group in self.scenery:
-            closest, distance = self.objective_info(scenery_group)
-            closest.preset_locations.scenery.append(scenery_group)
-
-    def populate_theater(self) -> None:
-        for control_point in self.control_points.values():
-            self.theater.add_controlpoint(control_point)
-        self.add_preset_locations()
-        self.add_supply_routes()
-        self.add_shipping_lanes()
+def load_miz_campaign_data(
+    miz: Path, terrain: Terrain, cache: Optional[MizCampaignCache]
+) -> MizCampaignData:
+    """Loads the theater data of the campaign miz, from the cache if possible."""
+    key = miz_hash(miz)
+    data = cache.load(key) if cache is not None else None
+    if data is None:
+        data = MizCampaignLoader(miz).extract().dumps()
+        if cache is not None:
+            cache.save(key, data)
+    # Freshly extracted data is unpickled too, so that it refers to the terrain of
+    # the theater rather than the terrain of the miz, exactly as cached data does.
+    return MizCampaignData.loads(data, terrain)
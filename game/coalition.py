@@ -123,10 +123,12 @@ def compute_threat_zones(self, events: GameUpdateEvents) -> None:
         self._threat_zone = ThreatZones.for_faction(self.game, self.player)
         events.update_threat_zones(self.player, self._threat_zone)
 
-    def compute_nav_meshes(self, events: GameUpdateEvents) -> None:
-        self._navmesh = NavMesh.from_threat_zones(
-            self.opponent.threat_zone, self.game.theater
-        )
+    def set_nav_mesh(self, navmesh: NavMesh, events: GameUpdateEvents) -> None:
+        """Sets the navmesh used to plan this coalition's flights.
+
+        The navmesh must have been built from the opponent's threat zones.
+        """
+        self._navmesh = navmesh
         events.update_navmesh(self.player, self._navmesh)
 
     def update_transit_network(self) -> None:
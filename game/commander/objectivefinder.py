@@ -2,7 +2,7 @@
 
 import math
 import operator
-from collections.abc import Iterable, Iterator
+from collections.abc import Iterable, Iterator, Sequence
 from typing import TYPE_CHECKING, TypeVar
 
 from game.theater import (
@@ -29,6 +29,45 @@
 MissionTargetType = TypeVar("MissionTargetType", bound=MissionTarget)
 
 
+class NearestFriendlyRanges:
+    """Distances from mission targets to the closest friendly control point.
+
+    The distances are computed in batches from the theater distance matrix and are
+    shared by every ObjectiveFinder for the coalition until the turn ends or the
+    coalition's control points change.
+    """
+
+    _by_coalition: dict[bool, NearestFriendlyRanges] = {}
+
+    def __init__(self, turn: int, control_points: tuple[ControlPoint, ...]) -> None:
+        self.turn = turn
+        self.control_points = control_points
+        self.ranges: dict[str, float] = {}
+
+    @classmethod
+    def for_coalition(cls, game: Game, player: bool) -> NearestFriendlyRanges:
+        control_points = tuple(game.theater.control_points_for(player))
+        ranges = cls._by_coalition.get(player)
+        if (
+            ranges is None
+            or ranges.turn != game.turn
+            or ranges.control_points != control_points
+        ):
+            ranges = NearestFriendlyRanges(game.turn, control_points)
+            cls._by_coalition[player] = ranges
+        return ranges
+
+    def ranges_for(self, targets: Sequence[MissionTarget]) -> list[float]:
+        missing = [t for t in targets if t.name not in self.ranges]
+        if missing:
+            nearest = ObjectiveDistanceCache.nearest_distances(
+                missing, self.control_points
+            )
+            for target, distance in zip(missing, nearest.tolist()):
+                self.ranges[target.name] = distance
+        return [self.ranges[t.name] for t in targets]
+
+
 class ObjectiveFinder:
     """Identifies potential objectives for the mission planner."""
 
@@ -72,14 +111,12 @@ def threatening_ships(self) -> Iterator[NavalGroundObject]:
     def _targets_by_range(
         self, targets: Iterable[MissionTargetType]
     ) -> Iterator[MissionTargetType]:
-        target_ranges: list[tuple[MissionTargetType, float]] = []
-        for target in targets:
-            ranges: list[float] = []
-            for cp in self.friendly_control_points():
-                ranges.append(target.distance_to(cp))
-            target_ranges.append((target, min(ranges)))
-
-        target_ranges = sorted(target_ranges, key=operator.itemgetter(1))
+        target_list = list(targets)
+        ranges = NearestFriendlyRanges.for_coalition(self.game, self.is_player)
+        target_ranges = sorted(
+            zip(target_list, ranges.ranges_for(target_list)),
+            key=operator.itemgetter(1),
+        )
         for target, _range in target_ranges:
             yield target
 
@@ -89,7 +126,7 @@ def strike_targets(self) -> Iterator[BuildingGroundObject]:
         Targets are sorted by their closest proximity to any friendly control
         point (airfield or fleet).
         """
-        targets: list[tuple[BuildingGroundObject, float]] = []
+        targets: list[BuildingGroundObject] = []
         # Building objectives are made of several individual TGOs (one per
         # building).
         found_targets: set[str] = set()
@@ -126,14 +163,9 @@ def strike_targets(self) -> Iterator[BuildingGroundObject]:
                     continue
                 if ground_object.name in found_targets:
                     continue
-                ranges: list[float] = []
-                for friendly_cp in self.friendly_control_points():
-                    ranges.append(ground_object.distance_to(friendly_cp))
-                targets.append((ground_object, min(ranges)))
+                targets.append(ground_object)
                 found_targets.add(ground_object.name)
-        targets = sorted(targets, key=operator.itemgetter(1))
-        for target, _range in targets:
-            yield target
+        yield from self._targets_by_range(targets)
 
     def front_lines(self) -> Iterator[FrontLine]:
         """Iterates over all active front lines in the theater."""
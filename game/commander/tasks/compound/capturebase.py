@@ -18,6 +18,10 @@
 class CaptureBase(CompoundTask[TheaterState]):
     front_line: FrontLine
 
+    @property
+    def trace_name(self) -> str:
+        return f"{type(self).__name__} {self.front_line.name}"
+
     def each_valid_method(self, state: TheaterState) -> Iterator[Method[TheaterState]]:
         yield [PlanAirAssault(self.enemy_cp(state))]
         yield [BreakthroughAttack(self.front_line, state.context.coalition.player)]
@@ -13,6 +13,10 @@
 class DestroyEnemyGroundUnits(CompoundTask[TheaterState]):
     front_line: FrontLine
 
+    @property
+    def trace_name(self) -> str:
+        return f"{type(self).__name__} {self.front_line.name}"
+
     def each_valid_method(self, state: TheaterState) -> Iterator[Method[TheaterState]]:
         yield [EliminationAttack(self.front_line, state.context.coalition.player)]
         yield [AggressiveAttack(self.front_line, state.context.coalition.player)]
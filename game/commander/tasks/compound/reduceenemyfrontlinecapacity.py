@@ -11,6 +11,10 @@
 class ReduceEnemyFrontLineCapacity(CompoundTask[TheaterState]):
     control_point: ControlPoint
 
+    @property
+    def trace_name(self) -> str:
+        return f"{type(self).__name__} {self.control_point.name}"
+
     def each_valid_method(self, state: TheaterState) -> Iterator[Method[TheaterState]]:
         for ammo_dump in state.ammo_dumps_at(self.control_point):
             yield [PlanStrike(ammo_dump)]
@@ -19,6 +19,10 @@ def __init__(self, front_line: FrontLine, player: bool) -> None:
         self.friendly_cp = self.front_line.control_point_friendly_to(player)
         self.enemy_cp = self.front_line.control_point_hostile_to(player)
 
+    @property
+    def trace_name(self) -> str:
+        return f"{type(self).__name__} {self.front_line.name}"
+
     @property
     @abstractmethod
     def stance(self) -> CombatStance:
@@ -71,7 +75,7 @@ def preconditions_met(self, state: TheaterState) -> bool:
         return self.have_sufficient_front_line_advantage
 
     def apply_effects(self, state: TheaterState) -> None:
-        state.front_line_stances[self.front_line] = self.stance
+        state.set_front_line_stance(self.front_line, self.stance)
 
     def execute(self, coalition: Coalition) -> None:
         self.friendly_cp.stances[self.enemy_cp.id] = self.stance
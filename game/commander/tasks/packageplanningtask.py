@@ -41,6 +41,10 @@ class PackagePlanningTask(TheaterCommanderTask, Generic[MissionTargetT]):
     def __post_init__(self) -> None:
         self.flights = []
 
+    @property
+    def trace_name(self) -> str:
+        return f"{type(self).__name__} {self.target.name}"
+
     def preconditions_met(self, state: TheaterState) -> bool:
         if (
             state.context.coalition.player
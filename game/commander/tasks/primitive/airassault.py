@@ -26,7 +26,7 @@ def capture_blocked(self, state: TheaterState) -> bool:
         return len(battle_positions.blocking_capture) > 0
 
     def apply_effects(self, state: TheaterState) -> None:
-        state.air_assault_targets.remove(self.target)
+        state.remove_air_assault_target(self.target)
 
     def propose_flights(self) -> None:
         self.propose_flight(FlightType.AIR_ASSAULT, 2)
@@ -18,7 +18,7 @@ def preconditions_met(self, state: TheaterState) -> bool:
         return super().preconditions_met(state)
 
     def apply_effects(self, state: TheaterState) -> None:
-        state.barcaps_needed[self.target] -= 1
+        state.remove_barcap_round(self.target)
 
     def propose_flights(self) -> None:
         self.propose_flight(FlightType.BARCAP, 2)
@@ -25,4 +25,4 @@ def preconditions_met(self, state: TheaterState) -> bool:
 
     def apply_effects(self, state: TheaterState) -> None:
         super().apply_effects(state)
-        state.active_front_lines.remove(self.front_line)
+        state.remove_active_front_line(self.front_line)
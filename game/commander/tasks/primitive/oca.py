@@ -20,7 +20,7 @@ def preconditions_met(self, state: TheaterState) -> bool:
         return super().preconditions_met(state)
 
     def apply_effects(self, state: TheaterState) -> None:
-        state.oca_targets.remove(self.target)
+        state.remove_oca_target(self.target)
 
     def propose_flights(self) -> None:
         self.propose_flight(FlightType.OCA_RUNWAY, 2)
@@ -16,7 +16,7 @@ def preconditions_met(self, state: TheaterState) -> bool:
         return self.target in state.refueling_targets
 
     def apply_effects(self, state: TheaterState) -> None:
-        state.refueling_targets.remove(self.target)
+        state.remove_refueling_target(self.target)
 
     def propose_flights(self) -> None:
         self.propose_flight(FlightType.REFUELING, 1)
@@ -19,7 +19,7 @@ def preconditions_met(self, state: TheaterState) -> bool:
         return super().preconditions_met(state)
 
     def apply_effects(self, state: TheaterState) -> None:
-        state.strike_targets.remove(self.target)
+        state.remove_strike_target(self.target)
 
     def propose_flights(self) -> None:
         self.propose_flight(FlightType.STRIKE, 2)
@@ -54,13 +54,17 @@
 """
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import itertools
+import logging
+import pickle
+from pathlib import Path
+from typing import Optional, TYPE_CHECKING
 
 from game.ato.starttype import StartType
 from game.commander.tasks.compound.nextaction import PlanNextAction
 from game.commander.tasks.theatercommandertask import TheaterCommanderTask
 from game.commander.theaterstate import TheaterState
-from game.htn import Planner
+from game.htn import Planner, PlanningResult, PlanningTrace
 from game.profiling import MultiEventTracer
 
 if TYPE_CHECKING:
@@ -68,6 +72,10 @@
 
 
 class TheaterCommander(Planner[TheaterState, TheaterCommanderTask]):
+    #: If set, each plan is traced and the trace is written to this directory along
+    #: with the state the plan started from.
+    trace_dir: Optional[Path] = None
+
     def __init__(self, game: Game, player: bool) -> None:
         super().__init__(
             PlanNextAction(
@@ -79,11 +87,45 @@ def __init__(self, game: Game, player: bool) -> None:
 
     def plan_missions(self, tracer: MultiEventTracer) -> None:
         state = TheaterState.from_game(self.game, self.player, tracer)
-        while True:
-            result = self.plan(state)
+        for plan_number in itertools.count():
+            if TheaterCommander.trace_dir is None:
+                result = self.plan(state)
+            else:
+                result = self.plan_traced(
+                    state, TheaterCommander.trace_dir, plan_number
+                )
             if result is None:
                 # Planned all viable tasks this turn.
                 return
             for task in result.tasks:
                 task.execute(self.game.coalition_for(self.player))
             state = result.end_state
+
+    def plan_traced(
+        self, state: TheaterState, trace_dir: Path, plan_number: int
+    ) -> Optional[PlanningResult[TheaterState, TheaterCommanderTask]]:
+        """Plans from the given state and saves the state and the trace of the plan.
+
+        The game and the state are pickled to a .state file before planning, since
+        planning modifies the state, and the trace is written to a .json file of the
+        same name. Both can be loaded by resources/tools/replay_planning_trace.py to
+        plan again from the same state.
+        """
+        color = "blue" if self.player else "red"
+        path = trace_dir / f"turn-{self.game.turn}-{color}-{plan_number}"
+        try:
+            trace_dir.mkdir(parents=True, exist_ok=True)
+            with path.with_suffix(".state").open("wb") as state_file:
+                # The game is pickled before the state so that, as when loading a
+                # save, the game is completely loaded before anything that uses it.
+                pickle.dump((self.game, state), state_file, protocol=5)
+        except OSError as ex:
+            logging.warning(f"Could not save planning state {path}: {ex}")
+
+        trace = PlanningTrace()
+        result = self.plan(state, trace)
+        try:
+            trace.write_json(path.with_suffix(".json"))
+        except OSError as ex:
+            logging.warning(f"Could not write planning trace {path}: {ex}")
+        return result
@@ -1,18 +1,18 @@
 from __future__ import annotations
 
-import dataclasses
-import itertools
+import copy
 import math
+import sys
 from collections.abc import Iterator
-from dataclasses import dataclass
-from typing import Optional, TYPE_CHECKING, Union
+from dataclasses import dataclass, field
+from typing import Any, Optional, TYPE_CHECKING, Union
 
 from game.commander.battlepositions import BattlePositions
 from game.commander.objectivefinder import ObjectiveFinder
 from game.db import GameDb
 from game.ground_forces.combat_stance import CombatStance
 from game.htn import WorldState
-from game.profiling import MultiEventTracer
+from game.profiling import MultiEventTracer, profile_count
 from game.settings import Settings
 from game.theater import ConflictTheater, ControlPoint, FrontLine, MissionTarget
 from game.theater.theatergroundobject import (
@@ -40,8 +40,34 @@ class PersistentContext:
     tracer: MultiEventTracer
 
 
+#: The fields of TheaterState that are shared between clones until modified.
+COPY_ON_WRITE_FIELDS = (
+    "barcaps_needed",
+    "active_front_lines",
+    "air_assault_targets",
+    "front_line_stances",
+    "vulnerable_front_lines",
+    "aewc_targets",
+    "refueling_targets",
+    "enemy_air_defenses",
+    "enemy_convoys",
+    "enemy_shipping",
+    "enemy_ships",
+    "enemy_battle_positions",
+    "oca_targets",
+    "strike_targets",
+)
+
+
 @dataclass
 class TheaterState(WorldState["TheaterState"]):
+    """The state of the theater as seen by the theater commander's planner.
+
+    Clones share their lists and dicts with the state they were cloned from. Each
+    is copied by the first state that modifies it, so the planner's many clones only
+    copy what the applied tasks change. Modify the state only with its methods.
+    """
+
     context: PersistentContext
     barcaps_needed: dict[ControlPoint, int]
     active_front_lines: list[FrontLine]
@@ -61,37 +87,89 @@ class TheaterState(WorldState["TheaterState"]):
     strike_targets: list[TheaterGroundObject]
     enemy_barcaps: list[ControlPoint]
     threat_zones: ThreatZones
-
-    def _rebuild_threat_zones(self) -> None:
-        """Recreates the theater's threat zones based on the current planned state."""
-        self.threat_zones = ThreatZones.for_threats(
-            self.context.theater,
-            self.context.coalition.opponent.doctrine,
-            barcap_locations=self.enemy_barcaps,
-            air_defenses=itertools.chain(self.enemy_air_defenses, self.enemy_ships),
-        )
+    #: The copy-on-write fields that are not shared with any clone.
+    _owned: set[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._owned = set(COPY_ON_WRITE_FIELDS)
+
+    def _writable(self, name: str) -> Any:
+        """Returns the field for modification, copying it first if it is shared."""
+        value = getattr(self, name)
+        if name in self._owned:
+            return value
+        if name == "enemy_battle_positions":
+            value = {
+                cp: BattlePositions(
+                    list(positions.blocking_capture),
+                    list(positions.defending_front_line),
+                )
+                for cp, positions in value.items()
+            }
+        else:
+            value = copy.copy(value)
+        setattr(self, name, value)
+        self._owned.add(name)
+        profile_count("theater state fields copied")
+        profile_count("theater state bytes copied", sys.getsizeof(value))
+        return value
 
     def eliminate_air_defense(self, target: IadsGroundObject) -> None:
         if target in self.threatening_air_defenses:
             self.threatening_air_defenses.remove(target)
         if target in self.detecting_air_defenses:
             self.detecting_air_defenses.remove(target)
-        self.enemy_air_defenses.remove(target)
-        self._rebuild_threat_zones()
+        self._writable("enemy_air_defenses").remove(target)
+        self.threat_zones = self.threat_zones.without_air_defense(target)
 
     def eliminate_ship(self, target: NavalGroundObject) -> None:
         if target in self.threatening_air_defenses:
             self.threatening_air_defenses.remove(target)
         if target in self.detecting_air_defenses:
             self.detecting_air_defenses.remove(target)
-        self.enemy_ships.remove(target)
-        self._rebuild_threat_zones()
+        self._writable("enemy_ships").remove(target)
+        self.threat_zones = self.threat_zones.without_air_defense(target)
 
     def has_battle_position(self, target: VehicleGroupGroundObject) -> bool:
         return target in self.enemy_battle_positions[target.control_point]
 
     def eliminate_battle_position(self, target: VehicleGroupGroundObject) -> None:
-        self.enemy_battle_positions[target.control_point].eliminate(target)
+        self._writable("enemy_battle_positions")[target.control_point].eliminate(target)
+
+    def remove_barcap_round(self, control_point: ControlPoint) -> None:
+        self._writable("barcaps_needed")[control_point] -= 1
+
+    def set_front_line_stance(
+        self, front_line: FrontLine, stance: Optional[CombatStance]
+    ) -> None:
+        self._writable("front_line_stances")[front_line] = stance
+
+    def remove_active_front_line(self, front_line: FrontLine) -> None:
+        self._writable("active_front_lines").remove(front_line)
+
+    def remove_vulnerable_front_line(self, front_line: FrontLine) -> None:
+        self._writable("vulnerable_front_lines").remove(front_line)
+
+    def remove_air_assault_target(self, target: ControlPoint) -> None:
+        self._writable("air_assault_targets").remove(target)
+
+    def remove_aewc_target(self, target: MissionTarget) -> None:
+        self._writable("aewc_targets").remove(target)
+
+    def remove_refueling_target(self, target: MissionTarget) -> None:
+        self._writable("refueling_targets").remove(target)
+
+    def remove_convoy(self, target: Convoy) -> None:
+        self._writable("enemy_convoys").remove(target)
+
+    def remove_cargo_ship(self, target: CargoShip) -> None:
+        self._writable("enemy_shipping").remove(target)
+
+    def remove_oca_target(self, target: ControlPoint) -> None:
+        self._writable("oca_targets").remove(target)
+
+    def remove_strike_target(self, target: TheaterGroundObject) -> None:
+        self._writable("strike_targets").remove(target)
 
     def ammo_dumps_at(
         self, control_point: ControlPoint
@@ -105,37 +183,23 @@ def ammo_dumps_at(
 
     def clone(self) -> TheaterState:
         # Do not use copy.deepcopy. Copying every TGO, control point, etc is absurdly
-        # expensive.
-        return TheaterState(
-            context=self.context,
-            barcaps_needed=dict(self.barcaps_needed),
-            active_front_lines=list(self.active_front_lines),
-            air_assault_targets=list(self.air_assault_targets),
-            front_line_stances=dict(self.front_line_stances),
-            vulnerable_front_lines=list(self.vulnerable_front_lines),
-            aewc_targets=list(self.aewc_targets),
-            refueling_targets=list(self.refueling_targets),
-            enemy_air_defenses=list(self.enemy_air_defenses),
-            enemy_convoys=list(self.enemy_convoys),
-            enemy_shipping=list(self.enemy_shipping),
-            enemy_ships=list(self.enemy_ships),
-            enemy_battle_positions={
-                cp: dataclasses.replace(g)
-                for cp, g in self.enemy_battle_positions.items()
-            },
-            oca_targets=list(self.oca_targets),
-            strike_targets=list(self.strike_targets),
-            enemy_barcaps=list(self.enemy_barcaps),
-            threat_zones=self.threat_zones,
-            # Persistent properties are not copied. These are a way for failed subtasks
-            # to communicate requirements to other tasks. For example, the task to
-            # attack enemy battle_positions might fail because the target area has IADS
-            # protection. In that case, the preconditions of PlanBai would fail, but
-            # would add the IADS that prevented it from being planned to the list of
-            # IADS threats so that DegradeIads will consider it a threat later.
-            threatening_air_defenses=self.threatening_air_defenses,
-            detecting_air_defenses=self.detecting_air_defenses,
-        )
+        # expensive. Nothing is copied here: the clone shares every field, and the
+        # copy-on-write fields are copied by whichever state modifies them first.
+        #
+        # ThreatZones are never modified in place (eliminating a threat replaces the
+        # zones with a derived copy), so clones can share them.
+        #
+        # Persistent properties are never copied. These are a way for failed subtasks
+        # to communicate requirements to other tasks. For example, the task to attack
+        # enemy battle_positions might fail because the target area has IADS
+        # protection. In that case, the preconditions of PlanBai would fail, but would
+        # add the IADS that prevented it from being planned to the list of IADS threats
+        # so that DegradeIads will consider it a threat later.
+        clone = copy.copy(self)
+        clone._owned = set()
+        self._owned = set()
+        profile_count("theater state clones")
+        return clone
 
     @classmethod
     def from_game(
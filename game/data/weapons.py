@@ -9,11 +9,11 @@
 from pathlib import Path
 from typing import Iterator, Optional, Any, ClassVar
 
-import yaml
 from dcs.unitgroup import FlyingGroup
 from dcs.weapons_data import weapon_ids
 
 from game.dcs.aircrafttype import AircraftType
+from game.resourcecache import load_resource
 
 PydcsWeapon = Any
 PydcsWeaponAssignment = tuple[int, PydcsWeapon]
@@ -161,8 +161,7 @@ def named(cls, name: str) -> WeaponGroup:
     @classmethod
     def _each_weapon_group(cls) -> Iterator[WeaponGroup]:
         for group_file_path in Path("resources/weapons").glob("**/*.yaml"):
-            with group_file_path.open(encoding="utf8") as group_file:
-                data = yaml.safe_load(group_file)
+            data = load_resource(group_file_path)
             name = data["name"]
             try:
                 weapon_type = WeaponType(data["type"])
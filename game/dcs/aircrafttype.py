@@ -6,7 +6,6 @@
 from pathlib import Path
 from typing import Any, Dict, Iterator, Optional, TYPE_CHECKING, Type
 
-import yaml
 from dcs.helicopters import helicopter_map
 from dcs.planes import plane_map
 from dcs.unittype import FlyingType
@@ -14,6 +13,7 @@
 from game.data.units import UnitClass
 from game.dcs.unitproperty import UnitProperty
 from game.dcs.unittype import UnitType
+from game.resourcecache import load_resource
 from game.radio.channels import (
     ApacheChannelNamer,
     ChannelNamer,
@@ -353,8 +353,7 @@ def _each_variant_of(cls, aircraft: Type[FlyingType]) -> Iterator[AircraftType]:
             logging.warning(f"No data for {aircraft.id}; it will not be available")
             return
 
-        with data_path.open(encoding="utf-8") as data_file:
-            data = yaml.safe_load(data_file)
+        data = load_resource(data_path)
 
         try:
             price = data["price"]
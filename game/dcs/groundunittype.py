@@ -5,12 +5,12 @@
 from pathlib import Path
 from typing import Any, Iterator, Optional, Type
 
-import yaml
 from dcs.unittype import VehicleType
 from dcs.vehicles import vehicle_map
 
 from game.data.units import UnitClass
 from game.dcs.unittype import UnitType
+from game.resourcecache import load_resource
 
 
 @dataclass
@@ -86,8 +86,7 @@ def _each_variant_of(cls, vehicle: Type[VehicleType]) -> Iterator[GroundUnitType
             logging.warning(f"No data for {vehicle.id}; it will not be available")
             return
 
-        with data_path.open(encoding="utf-8") as data_file:
-            data = yaml.safe_load(data_file)
+        data = load_resource(data_path)
 
         try:
             introduction = data["introduced"]
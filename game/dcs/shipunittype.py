@@ -5,12 +5,12 @@
 from pathlib import Path
 from typing import Iterator, Type
 
-import yaml
 from dcs.ships import ship_map
 from dcs.unittype import ShipType
 
 from game.data.units import UnitClass
 from game.dcs.unittype import UnitType
+from game.resourcecache import load_resource
 
 
 @dataclass(frozen=True)
@@ -42,8 +42,7 @@ def _each_variant_of(cls, ship: Type[ShipType]) -> Iterator[ShipUnitType]:
             logging.warning(f"No data for {ship.id}; it will not be available")
             return
 
-        with data_path.open(encoding="utf-8") as data_file:
-            data = yaml.safe_load(data_file)
+        data = load_resource(data_path)
 
         try:
             introduction = data["introduced"]
@@ -1,11 +1,11 @@
 from __future__ import annotations
-import json
 import logging
 from pathlib import Path
 from typing import Dict, Iterator, List, Optional, Type
 
 from game import persistency
 from game.factions.faction import Faction
+from game.resourcecache import load_resource
 
 FACTION_DIRECTORY = Path("./resources/factions/")
 
@@ -38,10 +38,9 @@ def load_factions(cls: Type[FactionLoader]) -> Dict[str, Faction]:
 
         for f in files:
             try:
-                with f.open("r", encoding="utf-8") as fdata:
-                    data = json.load(fdata)
-                    factions[data["name"]] = Faction.from_json(data)
-                    logging.info("Loaded faction : " + str(f))
+                data = load_resource(f)
+                factions[data["name"]] = Faction.from_json(data)
+                logging.info("Loaded faction : " + str(f))
             except Exception:
                 logging.exception(f"Unable to load faction : {f}")
 
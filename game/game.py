@@ -3,12 +3,13 @@
 import itertools
 import logging
 import math
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator, Sequence
 from datetime import date, datetime, time, timedelta
 from enum import Enum
 from typing import Any, List, TYPE_CHECKING, Type, Union, cast
 from uuid import UUID
 
+import numpy as np
 from dcs.countries import Switzerland, USAFAggressors, UnitedNationsPeacekeepers
 from dcs.country import Country
 from dcs.mapping import Point
@@ -27,6 +28,7 @@
 from .coalition import Coalition
 from .db.gamedb import GameDb
 from .infos.information import Information
+from .navmesh import NavMesh
 from .profiling import logged_duration
 from .settings import Settings
 from .theater import ConflictTheater
@@ -42,7 +44,6 @@
 if TYPE_CHECKING:
     from .ato.airtaaskingorder import AirTaskingOrder
     from .factions.faction import Faction
-    from .navmesh import NavMesh
     from .sim import GameUpdateEvents
     from .squadrons import AirWing
     from .threatzones import ThreatZones
@@ -112,6 +113,7 @@ def __init__(
         self.message("Game Start", "-" * 40)
         # Culling Zones are for areas around points of interest that contain things we may not wish to cull.
         self.__culling_zones: List[Point] = []
+        self.__culling_zone_positions = np.empty((0, 2))
         self.__destroyed_units: list[dict[str, Union[float, str]]] = []
         self.savepath = ""
         self.current_unit_id = 0
@@ -467,8 +469,17 @@ def compute_transit_network_for(self, player: bool) -> TransitNetwork:
     def compute_threat_zones(self, events: GameUpdateEvents) -> None:
         self.blue.compute_threat_zones(events)
         self.red.compute_threat_zones(events)
-        self.blue.compute_nav_meshes(events)
-        self.red.compute_nav_meshes(events)
+        self.compute_nav_meshes(events)
+
+    def compute_nav_meshes(self, events: GameUpdateEvents) -> None:
+        # The navmeshes for each side are independent, so build them together to
+        # allow them to be built in parallel.
+        with logged_duration("Navmesh generation"):
+            blue, red = NavMesh.from_each_threat_zones(
+                [self.red.threat_zone, self.blue.threat_zone], self.theater
+            )
+        self.blue.set_nav_mesh(blue, events)
+        self.red.set_nav_mesh(red, events)
 
     def threat_zone_for(self, player: bool) -> ThreatZones:
         return self.coalition_for(player).threat_zone
@@ -531,6 +542,9 @@ def compute_unculled_zones(self, events: GameUpdateEvents) -> None:
             zones.append(package.target.position)
 
         self.__culling_zones = zones
+        self.__culling_zone_positions = np.array(
+            [(zone.x, zone.y) for zone in zones], dtype=float
+        ).reshape(-1, 2)
         events.update_unculled_zones(zones)
 
     def add_destroyed_units(self, data: dict[str, Union[float, str]]) -> None:
@@ -543,6 +557,15 @@ def add_destroyed_units(self, data: dict[str, Union[float, str]]) -> None:
     def get_destroyed_units(self) -> list[dict[str, Union[float, str]]]:
         return self.__destroyed_units
 
+    def _distances_to_culling_zones(self, positions: Sequence[Point]) -> np.ndarray:
+        """Returns the distance from each position to the closest culling zone."""
+        zones = self.__culling_zone_positions
+        if not len(zones) or not positions:
+            return np.full(len(positions), math.inf)
+        points = np.array([(p.x, p.y) for p in positions], dtype=float)
+        delta = points[:, np.newaxis, :] - zones
+        return np.hypot(delta[..., 0], delta[..., 1]).min(axis=1)
+
     def position_culled(self, pos: Point) -> bool:
         """
         Check if unit can be generated at given position depending on culling performance settings
@@ -551,34 +574,45 @@ def position_culled(self, pos: Point) -> bool:
         """
         if not self.settings.perf_culling:
             return False
-        for z in self.__culling_zones:
-            if z.distance_to_point(pos) < self.settings.perf_culling_distance * 1000:
-                return False
-        return True
+        distance = self._distances_to_culling_zones([pos])[0]
+        return bool(distance >= self.settings.perf_culling_distance * 1000)
 
     def iads_considerate_culling(self, tgo: TheaterGroundObject) -> bool:
-        if not self.settings.perf_do_not_cull_threatening_iads:
-            return self.position_culled(tgo.position)
-        else:
-            if self.settings.perf_culling:
-                if isinstance(tgo, EwrGroundObject):
-                    max_detection_range = tgo.max_detection_range().meters
-                    for z in self.__culling_zones:
-                        seperation = z.distance_to_point(tgo.position)
-                        # Don't cull EWR if in detection range.
-                        if seperation < max_detection_range:
-                            return False
-                if isinstance(tgo, SamGroundObject):
-                    max_threat_range = tgo.max_threat_range().meters
-                    for z in self.__culling_zones:
-                        seperation = z.distance_to_point(tgo.position)
-                        # Create a 12nm buffer around nearby SAMs.
-                        respect_bubble = (
-                            max_threat_range + Distance.from_nautical_miles(12).meters
-                        )
-                        if seperation < respect_bubble:
-                            return False
-            return self.position_culled(tgo.position)
+        return tgo in self.culled_ground_objects([tgo])
+
+    def culled_ground_objects(
+        self, ground_objects: Iterable[TheaterGroundObject]
+    ) -> set[TheaterGroundObject]:
+        """Returns the ground objects that will be culled from the mission.
+
+        This is the batch form of iads_considerate_culling. The distances from every
+        ground object to the culling zones are computed at once.
+        """
+        if not self.settings.perf_culling:
+            return set()
+        tgos = list(ground_objects)
+        distances = self._distances_to_culling_zones([tgo.position for tgo in tgos])
+        culling_distance = self.settings.perf_culling_distance * 1000
+        keep_threatening_iads = self.settings.perf_do_not_cull_threatening_iads
+        culled = set()
+        for tgo, distance in zip(tgos, distances.tolist()):
+            if distance < culling_distance:
+                continue
+            if keep_threatening_iads:
+                # Don't cull EWR if in detection range.
+                if (
+                    isinstance(tgo, EwrGroundObject)
+                    and distance < tgo.max_detection_range().meters
+                ):
+                    continue
+                # Create a 12nm buffer around nearby SAMs.
+                if isinstance(tgo, SamGroundObject) and distance < (
+                    tgo.max_threat_range().meters
+                    + Distance.from_nautical_miles(12).meters
+                ):
+                    continue
+            culled.add(tgo)
+        return culled
 
     def get_culling_zones(self) -> list[Point]:
         """
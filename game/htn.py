@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import json
+import timeit
 from abc import ABC, abstractmethod
 from collections import deque
 from collections.abc import Iterator, Sequence
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
 from typing import Any, Generic, Optional, TypeVar
 
 WorldStateT = TypeVar("WorldStateT", bound="WorldState[Any]")
@@ -16,7 +19,10 @@ def clone(self) -> WorldStateT:
 
 
 class Task(Generic[WorldStateT]):
-    pass
+    @property
+    def trace_name(self) -> str:
+        """The name of the task in planning traces."""
+        return type(self).__name__
 
 
 Method = Sequence[Task[WorldStateT]]
@@ -66,12 +72,144 @@ def pop(self) -> PlanningState[WorldStateT, PrimitiveTaskT]:
         return self.states.pop()
 
 
+#: The primitive task's preconditions were met and its effects were applied.
+TRACE_APPLIED = "applied"
+#: The primitive task's preconditions were not met.
+TRACE_FAILED = "failed"
+#: The next method of the compound task was selected.
+TRACE_DECOMPOSED = "decomposed"
+#: The compound task has no more methods.
+TRACE_EXHAUSTED = "exhausted"
+#: Planning resumed from the compound task after a later task failed.
+TRACE_BACKTRACKED = "backtracked"
+
+
+@dataclass(frozen=True)
+class PlanningTraceEvent:
+    #: One of the TRACE_* actions.
+    action: str
+    #: The trace name of the task.
+    task: str
+    #: The index of the event that decomposed the parent of the task, or None for
+    #: the main task.
+    parent: Optional[int]
+    #: Seconds spent in preconditions_met and apply_effects of a primitive task, or
+    #: in each_valid_method of a compound task.
+    duration: float
+    #: For decompositions, the number of the selected method. When a compound task is
+    #: exhausted, the number of methods it yielded.
+    method: Optional[int] = None
+    #: The trace names of the subtasks of the selected method.
+    subtasks: list[str] = field(default_factory=list)
+
+
+class PlanningTrace:
+    """A record of each step of a plan, for finding slow or backtracking tasks.
+
+    The events form the task tree: the parent of each event is the decomposition that
+    added its task. Backtracking resumes from an earlier decomposition, so a task may
+    appear more than once.
+    """
+
+    def __init__(self) -> None:
+        self.events: list[PlanningTraceEvent] = []
+        self.succeeded = False
+        #: Seconds spent planning.
+        self.duration = 0.0
+        # The decomposition event that added each queued task, by task id.
+        self._parents: dict[int, int] = {}
+        # The number of methods yielded so far by each compound task's methods, by
+        # the id of the iterator.
+        self._methods_yielded: dict[int, int] = {}
+
+    def record(
+        self,
+        action: str,
+        task: Task[Any],
+        start: float,
+        method: Optional[int] = None,
+        subtasks: Sequence[Task[Any]] = (),
+    ) -> None:
+        index = len(self.events)
+        self.events.append(
+            PlanningTraceEvent(
+                action,
+                task.trace_name,
+                self._parents.get(id(task)),
+                timeit.default_timer() - start,
+                method,
+                [subtask.trace_name for subtask in subtasks],
+            )
+        )
+        for subtask in subtasks:
+            self._parents[id(subtask)] = index
+
+    def record_decomposition(
+        self,
+        task: Task[Any],
+        start: float,
+        methods: Iterator[Any],
+        method: Sequence[Task[Any]],
+    ) -> None:
+        yielded = self._methods_yielded.get(id(methods), 0) + 1
+        self._methods_yielded[id(methods)] = yielded
+        self.record(TRACE_DECOMPOSED, task, start, yielded, method)
+
+    def record_exhausted(
+        self, task: Task[Any], start: float, methods: Iterator[Any]
+    ) -> None:
+        yielded = self._methods_yielded.pop(id(methods), 0)
+        self.record(TRACE_EXHAUSTED, task, start, yielded)
+
+    def record_backtrack(self, task: Task[Any]) -> None:
+        self.record(TRACE_BACKTRACKED, task, timeit.default_timer())
+
+    def decisions(self) -> list[tuple[str, str, Optional[int]]]:
+        """Returns the steps of the plan without their timing, for comparison."""
+        return [(e.action, e.task, e.method) for e in self.events]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "succeeded": self.succeeded,
+            "duration": self.duration,
+            "events": [asdict(event) for event in self.events],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> PlanningTrace:
+        trace = cls()
+        trace.succeeded = data["succeeded"]
+        trace.duration = data["duration"]
+        trace.events = [PlanningTraceEvent(**event) for event in data["events"]]
+        return trace
+
+    def write_json(self, path: Path) -> None:
+        with path.open("w", encoding="utf-8") as trace_file:
+            json.dump(self.to_dict(), trace_file, indent=2)
+
+    @classmethod
+    def load_json(cls, path: Path) -> PlanningTrace:
+        with path.open(encoding="utf-8") as trace_file:
+            return cls.from_dict(json.load(trace_file))
+
+
 class Planner(Generic[WorldStateT, PrimitiveTaskT]):
     def __init__(self, main_task: Task[WorldStateT]) -> None:
         self.main_task = main_task
 
     def plan(
-        self, initial_state: WorldStateT
+        self, initial_state: WorldStateT, trace: Optional[PlanningTrace] = None
+    ) -> Optional[PlanningResult[WorldStateT, PrimitiveTaskT]]:
+        """Plans the main task, recording each step to the trace if one is given."""
+        start = timeit.default_timer()
+        result = self._plan(initial_state, trace)
+        if trace is not None:
+            trace.succeeded = result is not None
+            trace.duration = timeit.default_timer() - start
+        return result
+
+    def _plan(
+        self, initial_state: WorldStateT, trace: Optional[PlanningTrace]
     ) -> Optional[PlanningResult[WorldStateT, PrimitiveTaskT]]:
         planning_state: PlanningState[WorldStateT, PrimitiveTaskT] = PlanningState(
             initial_state, deque([self.main_task]), [], None
@@ -79,9 +217,12 @@ def plan(
         history: PlanningHistory[WorldStateT, PrimitiveTaskT] = PlanningHistory()
         while planning_state.tasks_to_process:
             task = planning_state.tasks_to_process.popleft()
+            start = timeit.default_timer()
             if isinstance(task, PrimitiveTask):
                 if task.preconditions_met(planning_state.state):
                     task.apply_effects(planning_state.state)
+                    if trace is not None:
+                        trace.record(TRACE_APPLIED, task, start)
                     # Ignore type erasure. We've already verified that this is a Planner
                     # with a WorldStateT and a PrimitiveTaskT, so we know that the task
                     # list is a list of CompoundTask[WorldStateT] and PrimitiveTaskT. We
@@ -90,7 +231,11 @@ def plan(
                     # isinstance.
                     planning_state.plan.append(task)  # type: ignore
                 else:
+                    if trace is not None:
+                        trace.record(TRACE_FAILED, task, start)
                     planning_state = history.pop()
+                    if trace is not None:
+                        trace.record_backtrack(planning_state.tasks_to_process[0])
             else:
                 assert isinstance(task, CompoundTask)
                 # If the methods field of our current state is not None that means we're
@@ -105,6 +250,8 @@ def plan(
                     methods = planning_state.methods
                 try:
                     method = next(methods)
+                    if trace is not None:
+                        trace.record_decomposition(task, start, methods, method)
                     # Push the current node back onto the stack so that we resume
                     # handling this task when we pop back to this state.
                     resume_tasks: deque[Task[WorldStateT]] = deque([task])
@@ -120,9 +267,13 @@ def plan(
                     planning_state.methods = None
                     planning_state.tasks_to_process.extendleft(reversed(method))
                 except StopIteration:
+                    if trace is not None:
+                        trace.record_exhausted(task, start, methods)
                     try:
                         planning_state = history.pop()
                     except IndexError:
                         # No valid plan was found.
                         return None
+                    if trace is not None:
+                        trace.record_backtrack(planning_state.tasks_to_process[0])
         return PlanningResult(planning_state.plan, planning_state.state)
@@ -1,12 +1,16 @@
 from __future__ import annotations
 from collections import defaultdict
 
+import hashlib
+import importlib.metadata
 import itertools
 import logging
+import os
 import pickle
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterator
+from typing import Iterator, Optional
 
 import dcs
 import yaml
@@ -28,10 +32,11 @@
 )
 from game.layout.layoutmapping import LayoutMapping
 from game.profiling import logged_duration
-from game.version import VERSION
 
 LAYOUT_DIR = "resources/layouts/"
 LAYOUT_DUMP = "Liberation/layouts.p"
+# Increment whenever the layout classes change in a way that breaks cached layouts.
+LAYOUT_CACHE_VERSION = 2
 
 LAYOUT_TYPES = {
     GroupRole.AIR_DEFENSE: AntiAirLayout,
@@ -42,6 +47,13 @@
 }
 
 
+@dataclass(frozen=True)
+class _CachedLayout:
+    key: str
+    #: None if the layout miz has no groups for the mapping.
+    layout: Optional[TgoLayout]
+
+
 class LayoutLoader:
     # Map of all available layouts indexed by name
     _layouts: dict[str, TgoLayout] = {}
@@ -60,137 +72,231 @@ def layouts(self) -> Iterator[TgoLayout]:
         yield from self._layouts.values()
 
     def load_templates(self) -> None:
-        """This will load all pre-loaded layouts from a pickle file.
-        If pickle can not be loaded it will import and dump the layouts"""
+        """Loads all layouts, importing only those that changed since the last run.
+
+        Imported layouts are cached in a pickle file keyed by the content of their
+        mapping yaml and layout miz, so only layouts with modified (or new) files are
+        imported again. The cache is dropped when LAYOUT_CACHE_VERSION or the version
+        of pydcs, whose objects are pickled with the layouts, changes.
+        """
         # We use a pickle for performance reasons. Importing takes many seconds
-        file = Path(persistency.base_path()) / LAYOUT_DUMP
-        if file.is_file():
-            # Load from pickle if existing
-            with file.open("rb") as f:
-                try:
-                    version, self._layouts = pickle.load(f)
-                    # Check if the game version of the dump is identical to the current
-                    if version == VERSION:
-                        return
-                except Exception as e:
-                    logging.exception(f"Error {e} reading layouts dump. Recreating.")
-        # If no dump is available or game version is different create a new dump
-        self.import_templates()
+        self._import(self._load_cache())
 
     def import_templates(self) -> None:
         """This will import all layouts from the template folder
         and dumps them to a pickle"""
-        self._layouts = {}
+        self._import({})
+
+    def _import(self, cache: dict[str, _CachedLayout]) -> None:
         mappings: dict[str, list[LayoutMapping]] = defaultdict(list)
+        mapping_keys: dict[str, str] = {}
         with logged_duration("Parsing mapping yamls"):
             for file in Path(LAYOUT_DIR).rglob("*.yaml"):
                 if not file.is_file():
                     raise RuntimeError(f"{file.name} is not a file")
-                with file.open("r", encoding="utf-8") as f:
-                    mapping_dict = yaml.safe_load(f)
+                with file.open("rb") as f:
+                    mapping_data = f.read()
+                mapping_dict = yaml.safe_load(mapping_data)
 
-                template_map = LayoutMapping.from_dict(mapping_dict, f.name)
+                template_map = LayoutMapping.from_dict(mapping_dict, str(file))
                 mappings[template_map.layout_file].append(template_map)
+                mapping_keys[template_map.name] = hashlib.sha256(
+                    mapping_data
+                ).hexdigest()
+
+        # A layout is keyed by the content of both its mapping and its miz, so
+        # changing either re-imports it.
+        layout_keys: dict[str, str] = {}
+        for miz, miz_mappings in mappings.items():
+            miz_key = _file_hash(Path(miz))
+            for mapping in miz_mappings:
+                layout_keys[mapping.name] = f"{mapping_keys[mapping.name]}-{miz_key}"
+
+        layouts: dict[str, _CachedLayout] = {}
+        misses: dict[str, list[LayoutMapping]] = {}
+        for miz, miz_mappings in mappings.items():
+            for mapping in miz_mappings:
+                cached = cache.get(mapping.name)
+                if cached is not None and cached.key == layout_keys[mapping.name]:
+                    layouts[mapping.name] = cached
+                else:
+                    misses.setdefault(miz, []).append(mapping)
 
-        with logged_duration(f"Parsing all layout miz multithreaded"):
-            with ThreadPoolExecutor() as exe:
-                exe.map(self._load_from_miz, mappings.keys(), mappings.values())
+        if misses:
+            with logged_duration(f"Parsing {len(misses)} layout miz"):
+                for miz, imported in _import_all(misses).items():
+                    for mapping in misses[miz]:
+                        # Mappings without groups are cached too, so that their miz
+                        # is not parsed again on every launch.
+                        layouts[mapping.name] = _CachedLayout(
+                            layout_keys[mapping.name], imported.get(mapping.name)
+                        )
+        if misses or layouts.keys() != cache.keys():
+            self._dump_templates(layouts)
 
-        # Sort al the LayoutGroups with the correct index
-        for layout in self._layouts.values():
-            layout.groups.sort(key=lambda g: g.group_index)
-            for group in layout.groups:
-                group.unit_groups.sort(key=lambda ug: ug.unit_index)
+        self._layouts = {}
+        for miz, miz_mappings in mappings.items():
+            for mapping in miz_mappings:
+                layout = layouts[mapping.name].layout
+                if layout is None:
+                    logging.error(f"No groups found for layout {mapping.name} in {miz}")
+                else:
+                    self._layouts[mapping.name] = layout
+        logging.info(
+            f"Loaded {len(self._layouts)} layouts, imported layouts from "
+            f"{len(misses)} miz files"
+        )
 
-        logging.info(f"Imported {len(self._layouts)} layouts")
-        self._dump_templates()
+    def _load_cache(self) -> dict[str, _CachedLayout]:
+        file = Path(persistency.base_path()) / LAYOUT_DUMP
+        if not file.is_file():
+            return {}
+        with file.open("rb") as f:
+            try:
+                version, layouts = pickle.load(f)
+                if version == _cache_version():
+                    return layouts
+            except Exception as e:
+                logging.exception(f"Error {e} reading layouts dump. Recreating.")
+        return {}
 
-    def _dump_templates(self) -> None:
+    def _dump_templates(self, layouts: dict[str, _CachedLayout]) -> None:
         file = Path(persistency.base_path()) / LAYOUT_DUMP
-        dump = (VERSION, self._layouts)
+        dump = (_cache_version(), layouts)
         with file.open("wb") as fdata:
             pickle.dump(dump, fdata)
 
-    def _load_from_miz(self, miz: str, mappings: list[LayoutMapping]) -> None:
-        template_position: dict[str, Point] = {}
-        temp_mis = dcs.Mission()
-        with logged_duration(f"Parsing {miz}"):
-            # The load_file takes a lot of time to compute. That's why the layouts
-            # are written to a pickle and can be reloaded from the ui
-            # Example the whole routine: 0:00:00.934417,
-            # the .load_file() method: 0:00:00.920409
-            temp_mis.load_file(miz)
-
-        for mapping in mappings:
-            # Find the group from the mapping in any coalition
-            for country in itertools.chain(
-                temp_mis.coalition["red"].countries.values(),
-                temp_mis.coalition["blue"].countries.values(),
+    def by_name(self, name: str) -> TgoLayout:
+        self.initialize()
+        return self._layouts[name]
+
+
+def _cache_version() -> tuple[int, str]:
+    # Layouts are keyed by the content of their files, so they are not invalidated by
+    # new versions of Liberation. They hold pydcs objects though.
+    try:
+        pydcs_version = importlib.metadata.version("pydcs")
+    except importlib.metadata.PackageNotFoundError:
+        pydcs_version = ""
+    return LAYOUT_CACHE_VERSION, pydcs_version
+
+
+def _file_hash(path: Path) -> str:
+    with path.open("rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _import_all(
+    mappings: dict[str, list[LayoutMapping]]
+) -> dict[str, dict[str, TgoLayout]]:
+    """Imports the layouts for the given mappings, grouped by layout miz.
+
+    Each miz is parsed in a separate process, since parsing is CPU bound and holds
+    the GIL. Raises if any miz fails to import.
+    """
+    if len(mappings) == 1:
+        ((miz, miz_mappings),) = mappings.items()
+        return {miz: _import_from_miz(miz, miz_mappings)}
+
+    workers = min(len(mappings), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            miz: executor.submit(_import_from_miz, miz, miz_mappings)
+            for miz, miz_mappings in mappings.items()
+        }
+        results = {}
+        for miz, future in futures.items():
+            try:
+                results[miz] = future.result()
+            except Exception as ex:
+                raise RuntimeError(f"Could not import layouts from {miz}") from ex
+        return results
+
+
+def _import_from_miz(miz: str, mappings: list[LayoutMapping]) -> dict[str, TgoLayout]:
+    layouts: dict[str, TgoLayout] = {}
+    template_position: dict[str, Point] = {}
+    temp_mis = dcs.Mission()
+    with logged_duration(f"Parsing {miz}"):
+        # The load_file takes a lot of time to compute. That's why the layouts
+        # are written to a pickle and can be reloaded from the ui
+        # Example the whole routine: 0:00:00.934417,
+        # the .load_file() method: 0:00:00.920409
+        temp_mis.load_file(miz)
+
+    for mapping in mappings:
+        # Find the group from the mapping in any coalition
+        for country in itertools.chain(
+            temp_mis.coalition["red"].countries.values(),
+            temp_mis.coalition["blue"].countries.values(),
+        ):
+            for dcs_group in itertools.chain(
+                temp_mis.country(country.name).vehicle_group,
+                temp_mis.country(country.name).ship_group,
+                temp_mis.country(country.name).static_group,
             ):
-                for dcs_group in itertools.chain(
-                    temp_mis.country(country.name).vehicle_group,
-                    temp_mis.country(country.name).ship_group,
-                    temp_mis.country(country.name).static_group,
-                ):
-
-                    try:
-                        g_id, u_id, group_name, group_mapping = mapping.group_for_name(
-                            dcs_group.name
-                        )
-                    except KeyError:
-                        continue
-
-                    if not isinstance(dcs_group, StaticGroup) and max(
-                        group_mapping.unit_count
-                    ) > len(dcs_group.units):
-                        logging.error(
-                            f"Incorrect unit_count found in Layout {mapping.name}-{group_mapping.name}"
-                        )
 
-                    layout = self._layouts.get(mapping.name, None)
-                    if layout is None:
-                        # Create a new template
-                        layout = LAYOUT_TYPES[mapping.primary_role](
-                            mapping.name, mapping.description
-                        )
-                        layout.generic = mapping.generic
-                        layout.tasks = mapping.tasks
-                        self._layouts[layout.name] = layout
-                    for i, unit in enumerate(dcs_group.units):
-                        unit_group = None
-                        for _unit_group in layout.all_unit_groups:
-                            if _unit_group.name == group_mapping.name:
-                                # We already have a layoutgroup for this dcs_group
-                                unit_group = _unit_group
-                        if not unit_group:
-                            unit_group = TgoLayoutUnitGroup(
-                                group_mapping.name,
-                                [],
-                                group_mapping.unit_count,
-                                group_mapping.unit_types,
-                                group_mapping.unit_classes,
-                                group_mapping.fallback_classes,
-                                u_id,
-                            )
-                            unit_group.optional = group_mapping.optional
-                            unit_group.fill = group_mapping.fill
-                            unit_group.sub_task = group_mapping.sub_task
-                            tgo_group = None
-                            for _tgo_group in layout.groups:
-                                if _tgo_group.group_name == group_name:
-                                    tgo_group = _tgo_group
-                            if tgo_group is None:
-                                tgo_group = TgoLayoutGroup(group_name, g_id)
-                                layout.groups.append(tgo_group)
-                            tgo_group.unit_groups.append(unit_group)
-                        layout_unit = LayoutUnit.from_unit(unit)
-                        if i == 0 and layout.name not in template_position:
-                            template_position[layout.name] = unit.position
-                        layout_unit.position = (
-                            layout_unit.position - template_position[layout.name]
+                try:
+                    g_id, u_id, group_name, group_mapping = mapping.group_for_name(
+                        dcs_group.name
+                    )
+                except KeyError:
+                    continue
+
+                if not isinstance(dcs_group, StaticGroup) and max(
+                    group_mapping.unit_count
+                ) > len(dcs_group.units):
+                    logging.error(
+                        f"Incorrect unit_count found in Layout {mapping.name}-{group_mapping.name}"
+                    )
+
+                layout = layouts.get(mapping.name, None)
+                if layout is None:
+                    # Create a new template
+                    layout = LAYOUT_TYPES[mapping.primary_role](
+                        mapping.name, mapping.description
+                    )
+                    layout.generic = mapping.generic
+                    layout.tasks = mapping.tasks
+                    layouts[layout.name] = layout
+                for i, unit in enumerate(dcs_group.units):
+                    unit_group = None
+                    for _unit_group in layout.all_unit_groups:
+                        if _unit_group.name == group_mapping.name:
+                            # We already have a layoutgroup for this dcs_group
+                            unit_group = _unit_group
+                    if not unit_group:
+                        unit_group = TgoLayoutUnitGroup(
+                            group_mapping.name,
+                            [],
+                            group_mapping.unit_count,
+                            group_mapping.unit_types,
+                            group_mapping.unit_classes,
+                            group_mapping.fallback_classes,
+                            u_id,
                         )
-                        unit_group.layout_units.append(layout_unit)
+                        unit_group.optional = group_mapping.optional
+                        unit_group.fill = group_mapping.fill
+                        unit_group.sub_task = group_mapping.sub_task
+                        tgo_group = None
+                        for _tgo_group in layout.groups:
+                            if _tgo_group.group_name == group_name:
+                                tgo_group = _tgo_group
+                        if tgo_group is None:
+                            tgo_group = TgoLayoutGroup(group_name, g_id)
+                            layout.groups.append(tgo_group)
+                        tgo_group.unit_groups.append(unit_group)
+                    layout_unit = LayoutUnit.from_unit(unit)
+                    if i == 0 and layout.name not in template_position:
+                        template_position[layout.name] = unit.position
+                    layout_unit.position = (
+                        layout_unit.position - template_position[layout.name]
+                    )
+                    unit_group.layout_units.append(layout_unit)
 
-    def by_name(self, name: str) -> TgoLayout:
-        self.initialize()
-        return self._layouts[name]
+    # Sort al the LayoutGroups with the correct index
+    for layout in layouts.values():
+        layout.groups.sort(key=lambda g: g.group_index)
+        for group in layout.groups:
+            group.unit_groups.sort(key=lambda ug: ug.unit_index)
+    return layouts
@@ -23,10 +23,15 @@
 aircraft will be able to see the enemy's kneeboard for the same airframe.
 """
 import datetime
+import hashlib
 import math
+import os
+import shutil
 import textwrap
+import threading
 from collections import defaultdict
-from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import astuple, dataclass
 from pathlib import Path
 from typing import Dict, Iterator, List, Optional, TYPE_CHECKING, Tuple
 
@@ -43,6 +48,7 @@
 from game.runways import RunwayData
 from game.theater import TheaterGroundObject, TheaterUnit
 from game.theater.bullseye import Bullseye
+from game.profiling import profile_count, profile_span
 from game.utils import Distance, UnitSystem, meters, mps, pounds
 from game.weather import Weather
 from .aircraft.flightdata import FlightData
@@ -53,8 +59,104 @@
     from game import Game
 
 
+# Kneeboard pages only use a handful of fonts, so they're loaded once per thread
+# rather than once per page. FreeType faces must not be shared between threads.
+_fonts = threading.local()
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def kneeboard_font(path: str, size: int) -> ImageFont.FreeTypeFont:
+    cache: Dict[Tuple[str, int], ImageFont.FreeTypeFont] = _fonts.__dict__.setdefault(
+        "cache", {}
+    )
+    font = cache.get((path, size))
+    if font is None:
+        font = ImageFont.truetype(path, size, layout_engine=ImageFont.LAYOUT_BASIC)
+        cache[(path, size)] = font
+    return font
+
+
+@dataclass(frozen=True)
+class KneeboardFont:
+    """A font used on kneeboard pages.
+
+    Layouts refer to fonts by path and size rather than by FreeType face, so that
+    they can be hashed and rendered on any thread.
+    """
+
+    path: str
+    size: int
+
+    def load(self) -> ImageFont.FreeTypeFont:
+        return kneeboard_font(self.path, self.size)
+
+
+def _kneeboard_executor() -> ThreadPoolExecutor:
+    # Drawing text and encoding PNGs is done in native code that releases the GIL
+    # for much of its work, so threads avoid the cost of starting worker processes
+    # that would need to import the game.
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="kneeboard"
+        )
+    return _executor
+
+
+def _measuring_draw() -> ImageDraw.ImageDraw:
+    draw = getattr(_fonts, "draw", None)
+    if draw is None:
+        draw = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+        _fonts.draw = draw
+    return draw
+
+
+@dataclass(frozen=True)
+class TextOperation:
+    position: Tuple[int, int]
+    text: str
+    font: KneeboardFont
+    fill: Tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class KneeboardPageLayout:
+    """The laid out contents of a kneeboard page, ready to be rasterized.
+
+    Layouts hold only plain data, so identical pages have identical layouts and can
+    be rendered once.
+    """
+
+    image_size: Tuple[int, int]
+    background_fill: Tuple[int, int, int]
+    operations: Tuple[TextOperation, ...]
+
+    def content_hash(self) -> str:
+        return hashlib.sha256(repr(astuple(self)).encode("utf-8")).hexdigest()
+
+    def render(self) -> Image.Image:
+        image = Image.new("RGB", self.image_size, self.background_fill)
+        draw = ImageDraw.Draw(image)
+        for operation in self.operations:
+            draw.text(
+                operation.position,
+                operation.text,
+                font=operation.font.load(),
+                fill=operation.fill,
+            )
+        return image
+
+    def save(self, path: Path) -> None:
+        self.render().save(path)
+
+
 class KneeboardPageWriter:
-    """Creates kneeboard images."""
+    """Lays out kneeboard pages.
+
+    Text is measured as it is written so that each line can be placed below the
+    last, but nothing is drawn until the layout is rendered.
+    """
 
     def __init__(
         self, page_margin: int = 24, line_spacing: int = 12, dark_theme: bool = False
@@ -66,25 +168,16 @@ def __init__(
             self.foreground_fill = (15, 15, 15)
             self.background_fill = (255, 252, 252)
         self.image_size = (768, 1024)
-        self.image = Image.new("RGB", self.image_size, self.background_fill)
         # These font sizes create a relatively full page for current sorties. If
         # we start generating more complicated flight plans, or start including
         # more information in the comm ladder (the latter of which we should
         # probably do), we'll need to split some of this information off into a
         # second page.
-        self.title_font = ImageFont.truetype(
-            "arial.ttf", 32, layout_engine=ImageFont.LAYOUT_BASIC
-        )
-        self.heading_font = ImageFont.truetype(
-            "arial.ttf", 24, layout_engine=ImageFont.LAYOUT_BASIC
-        )
-        self.content_font = ImageFont.truetype(
-            "arial.ttf", 16, layout_engine=ImageFont.LAYOUT_BASIC
-        )
-        self.table_font = ImageFont.truetype(
-            "resources/fonts/Inconsolata.otf", 20, layout_engine=ImageFont.LAYOUT_BASIC
-        )
-        self.draw = ImageDraw.Draw(self.image)
+        self.title_font = KneeboardFont("arial.ttf", 32)
+        self.heading_font = KneeboardFont("arial.ttf", 24)
+        self.content_font = KneeboardFont("arial.ttf", 16)
+        self.table_font = KneeboardFont("resources/fonts/Inconsolata.otf", 20)
+        self.operations: List[TextOperation] = []
         self.page_margin = page_margin
         self.x = page_margin
         self.y = page_margin
@@ -97,7 +190,7 @@ def position(self) -> Tuple[int, int]:
     def text(
         self,
         text: str,
-        font: Optional[ImageFont.FreeTypeFont] = None,
+        font: Optional[KneeboardFont] = None,
         fill: Optional[Tuple[int, int, int]] = None,
         wrap: bool = False,
     ) -> None:
@@ -109,13 +202,13 @@ def text(
         if wrap:
             text = "\n".join(
                 self.wrap_line_with_font(
-                    line, self.image_size[0] - self.page_margin - self.x, font
+                    line, self.image_size[0] - self.page_margin - self.x, font.load()
                 )
                 for line in text.splitlines()
             )
 
-        self.draw.text(self.position, text, font=font, fill=fill)
-        width, height = self.draw.textsize(text, font=font)
+        self.operations.append(TextOperation(self.position, text, font, fill))
+        width, height = _measuring_draw().textsize(text, font=font.load())
         self.y += height + self.line_spacing
 
     def title(self, title: str) -> None:
@@ -128,7 +221,7 @@ def table(
         self,
         cells: List[List[str]],
         headers: Optional[List[str]] = None,
-        font: Optional[ImageFont.FreeTypeFont] = None,
+        font: Optional[KneeboardFont] = None,
     ) -> None:
         if headers is None:
             headers = []
@@ -137,8 +230,14 @@ def table(
         table = tabulate(cells, headers=headers, numalign="right")
         self.text(table, font, fill=self.foreground_fill)
 
+    @property
+    def layout(self) -> KneeboardPageLayout:
+        return KneeboardPageLayout(
+            self.image_size, self.background_fill, tuple(self.operations)
+        )
+
     def write(self, path: Path) -> None:
-        self.image.save(path)
+        self.layout.save(path)
 
     @staticmethod
     def wrap_line(inputstr: str, max_length: int) -> str:
@@ -179,9 +278,13 @@ def wrap_line_with_font(
 class KneeboardPage:
     """Base class for all kneeboard pages."""
 
+    def layout(self) -> KneeboardPageLayout:
+        """Lays out the kneeboard page."""
+        raise NotImplementedError
+
     def write(self, path: Path) -> None:
         """Writes the kneeboard page to the given path."""
-        raise NotImplementedError
+        self.layout().save(path)
 
 
 @dataclass(frozen=True)
@@ -328,13 +431,9 @@ def __init__(
         self.weather = weather
         self.start_time = start_time
         self.dark_kneeboard = dark_kneeboard
-        self.flight_plan_font = ImageFont.truetype(
-            "resources/fonts/Inconsolata.otf",
-            16,
-            layout_engine=ImageFont.LAYOUT_BASIC,
-        )
+        self.flight_plan_font = KneeboardFont("resources/fonts/Inconsolata.otf", 16)
 
-    def write(self, path: Path) -> None:
+    def layout(self) -> KneeboardPageLayout:
         writer = KneeboardPageWriter(dark_theme=self.dark_kneeboard)
         if self.flight.custom_name is not None:
             custom_name_title = ' ("{}")'.format(self.flight.custom_name)
@@ -420,7 +519,7 @@ def write(self, path: Path) -> None:
                 codes.append([str(idx), "" if code is None else str(code)])
             writer.table(codes, ["#", "Laser Code"])
 
-        writer.write(path)
+        return writer.layout
 
     def airfield_info_row(
         self, row_title: str, runway: Optional[RunwayData]
@@ -495,7 +594,7 @@ def __init__(
         self.dark_kneeboard = dark_kneeboard
         self.comms.append(CommInfo("Flight", self.flight.intra_flight_channel))
 
-    def write(self, path: Path) -> None:
+    def layout(self) -> KneeboardPageLayout:
         writer = KneeboardPageWriter(dark_theme=self.dark_kneeboard)
         if self.flight.custom_name is not None:
             custom_name_title = ' ("{}")'.format(self.flight.custom_name)
@@ -568,7 +667,7 @@ def write(self, path: Path) -> None:
             )
         writer.table(jtacs, headers=["Callsign", "Region", "Laser Code", "FREQ"])
 
-        writer.write(path)
+        return writer.layout
 
     def format_frequency(self, frequency: RadioFrequency) -> str:
         channel = self.flight.channel_for(frequency)
@@ -606,7 +705,7 @@ def alic_for(unit: TheaterUnit) -> str:
         except KeyError:
             return ""
 
-    def write(self, path: Path) -> None:
+    def layout(self) -> KneeboardPageLayout:
         writer = KneeboardPageWriter(dark_theme=self.dark_kneeboard)
         if self.flight.custom_name is not None:
             custom_name_title = ' ("{}")'.format(self.flight.custom_name)
@@ -620,7 +719,7 @@ def write(self, path: Path) -> None:
             headers=["Description", "ALIC", "Location"],
         )
 
-        writer.write(path)
+        return writer.layout
 
     def target_info_row(self, unit: TheaterUnit) -> List[str]:
         ll = unit.position.latlng()
@@ -646,7 +745,7 @@ def targets(self) -> Iterator[NumberedWaypoint]:
             if waypoint.waypoint_type == FlightWaypointType.TARGET_POINT:
                 yield NumberedWaypoint(idx, waypoint)
 
-    def write(self, path: Path) -> None:
+    def layout(self) -> KneeboardPageLayout:
         writer = KneeboardPageWriter(dark_theme=self.dark_kneeboard)
         if self.flight.custom_name is not None:
             custom_name_title = ' ("{}")'.format(self.flight.custom_name)
@@ -659,7 +758,7 @@ def write(self, path: Path) -> None:
             headers=["Steerpoint", "Description", "Location"],
         )
 
-        writer.write(path)
+        return writer.layout
 
     @staticmethod
     def target_info_row(target: NumberedWaypoint) -> list[str]:
@@ -681,11 +780,11 @@ def __init__(
         self.notes = notes
         self.dark_kneeboard = dark_kneeboard
 
-    def write(self, path: Path) -> None:
+    def layout(self) -> KneeboardPageLayout:
         writer = KneeboardPageWriter(dark_theme=self.dark_kneeboard)
         writer.title(f"Notes")
         writer.text(self.notes, wrap=True)
-        writer.write(path)
+        return writer.layout
 
 
 class KneeboardGenerator(MissionInfoGenerator):
@@ -698,16 +797,42 @@ def __init__(self, mission: Mission, game: "Game") -> None:
         )
 
     def generate(self) -> None:
-        """Generates a kneeboard per client flight."""
+        """Generates a kneeboard per client flight.
+
+        Pages are laid out in order and then rasterized in parallel. Pages with
+        identical contents (support pages shared by flights of the same coalition,
+        for example) are only rasterized once and copied to their other paths.
+        """
         temp_dir = Path("kneeboards")
         temp_dir.mkdir(exist_ok=True)
-        for aircraft, pages in self.pages_by_airframe().items():
-            aircraft_dir = temp_dir / aircraft.dcs_unit_type.id
-            aircraft_dir.mkdir(exist_ok=True)
-            for idx, page in enumerate(pages):
-                page_path = aircraft_dir / f"page{idx:02}.png"
-                page.write(page_path)
-                self.mission.add_aircraft_kneeboard(aircraft.dcs_unit_type, page_path)
+        pages: List[Tuple[AircraftType, Path, str]] = []
+        renders: Dict[str, Tuple[Path, Future[None]]] = {}
+        with profile_span("Kneeboard layout"):
+            for aircraft, aircraft_pages in self.pages_by_airframe().items():
+                aircraft_dir = temp_dir / aircraft.dcs_unit_type.id
+                aircraft_dir.mkdir(exist_ok=True)
+                for idx, page in enumerate(aircraft_pages):
+                    page_path = aircraft_dir / f"page{idx:02}.png"
+                    layout = page.layout()
+                    content_hash = layout.content_hash()
+                    if content_hash not in renders:
+                        renders[content_hash] = (
+                            page_path,
+                            _kneeboard_executor().submit(layout.save, page_path),
+                        )
+                    pages.append((aircraft, page_path, content_hash))
+
+        profile_count("kneeboard pages", len(pages))
+        profile_count("unique kneeboard pages", len(renders))
+        with profile_span("Kneeboard rendering"):
+            for _, future in renders.values():
+                future.result()
+
+        for aircraft, page_path, content_hash in pages:
+            rendered_path, _ = renders[content_hash]
+            if rendered_path != page_path:
+                shutil.copyfile(rendered_path, page_path)
+            self.mission.add_aircraft_kneeboard(aircraft.dcs_unit_type, page_path)
 
     def pages_by_airframe(self) -> Dict[AircraftType, List[KneeboardPage]]:
         """Returns a list of kneeboard pages per airframe in the mission.
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import itertools
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING, cast
+from typing import Optional, TYPE_CHECKING, cast
 
 import dcs.lua
 from dcs import Mission, Point
@@ -16,6 +17,12 @@
     AircraftGenerator,
 )
 from game.naming import namegen
+from game.profiling import (
+    HierarchicalProfiler,
+    ProfileSpan,
+    profile_count,
+    profile_span,
+)
 from game.radio.radios import RadioFrequency, RadioRegistry
 from game.radio.tacan import TacanRegistry
 from game.theater import Airfield, FrontLine
@@ -55,6 +62,11 @@ def country_id_from_name(name: str) -> int:
 
 
 class MissionGenerator:
+    #: Names of the generation stages to capture with cProfile.
+    cprofile_stages: set[str] = set()
+    #: The profile of the most recently generated mission.
+    last_profile: Optional[ProfileSpan] = None
+
     def __init__(self, game: Game, time: datetime) -> None:
         self.game = game
         self.time = time
@@ -80,47 +92,99 @@ def generate_miz(self, output: Path) -> UnitMap:
             )
         self.generation_started = True
 
-        self.setup_mission_coalitions()
-        self.add_airfields_to_unit_map()
-        self.initialize_registries()
+        profiler = HierarchicalProfiler(
+            "Mission generation", MissionGenerator.cprofile_stages
+        )
+        with profiler:
+            self.generate_stages(profiler, output)
+        MissionGenerator.last_profile = profiler.root
+        self.log_channel_pressure()
 
-        EnvironmentGenerator(self.mission, self.game.conditions, self.time).generate()
+        profile_path = output.with_suffix(".profile.json")
+        try:
+            profiler.write_json(profile_path)
+        except OSError as ex:
+            logging.warning(f"Could not write mission profile {profile_path}: {ex}")
 
-        tgo_generator = TgoGenerator(
-            self.mission,
-            self.game,
-            self.radio_registry,
-            self.tacan_registry,
-            self.unit_map,
-            self.mission_data,
-        )
-        tgo_generator.generate()
+        return self.unit_map
+
+    def generate_stages(self, profiler: HierarchicalProfiler, output: Path) -> None:
+        with profiler.span("Coalitions"):
+            self.setup_mission_coalitions()
+            self.add_airfields_to_unit_map()
+        with profiler.span("Registries"):
+            self.initialize_registries()
+
+        with profiler.span("Environment"):
+            EnvironmentGenerator(
+                self.mission, self.game.conditions, self.time
+            ).generate()
 
-        ConvoyGenerator(self.mission, self.game, self.unit_map).generate()
-        CargoShipGenerator(self.mission, self.game, self.unit_map).generate()
+        with profiler.span("Ground objects"):
+            tgo_generator = TgoGenerator(
+                self.mission,
+                self.game,
+                self.radio_registry,
+                self.tacan_registry,
+                self.unit_map,
+                self.mission_data,
+            )
+            tgo_generator.generate()
 
-        self.generate_destroyed_units()
+        with profiler.span("Convoys"):
+            ConvoyGenerator(self.mission, self.game, self.unit_map).generate()
+        with profiler.span("Cargo ships"):
+            CargoShipGenerator(self.mission, self.game, self.unit_map).generate()
+
+        with profiler.span("Destroyed units"):
+            self.generate_destroyed_units()
 
         # Generate ground conflicts first so the JTACs get the first laser code (1688)
         # rather than the first player flight with a TGP.
-        self.generate_ground_conflicts()
-        self.generate_air_units(tgo_generator)
-
-        TriggerGenerator(self.mission, self.game).generate()
-        ForcedOptionsGenerator(self.mission, self.game).generate()
-        VisualsGenerator(self.mission, self.game).generate()
-        LuaGenerator(self.game, self.mission, self.mission_data).generate()
-        DrawingsGenerator(self.mission, self.game).generate()
+        with profiler.span("Ground conflicts"):
+            self.generate_ground_conflicts()
+        with profiler.span("Air units"):
+            self.generate_air_units(tgo_generator)
+
+        with profiler.span("Triggers"):
+            TriggerGenerator(self.mission, self.game).generate()
+        with profiler.span("Forced options"):
+            ForcedOptionsGenerator(self.mission, self.game).generate()
+        with profiler.span("Visuals"):
+            VisualsGenerator(self.mission, self.game).generate()
+        with profiler.span("Lua"):
+            LuaGenerator(self.game, self.mission, self.mission_data).generate()
+        with profiler.span("Drawings"):
+            DrawingsGenerator(self.mission, self.game).generate()
 
         self.setup_combined_arms()
 
-        self.notify_info_generators()
+        with profiler.span("Info generators"):
+            self.notify_info_generators()
 
         # TODO: Shouldn't this be first?
         namegen.reset_numbers()
-        self.mission.save(output)
+        with profiler.span("Save"):
+            self.mission.save(output)
+
+        for coalition in self.mission.coalition.values():
+            for country in coalition.countries.values():
+                profiler.count(
+                    "groups",
+                    len(country.vehicle_group)
+                    + len(country.ship_group)
+                    + len(country.plane_group)
+                    + len(country.helicopter_group)
+                    + len(country.static_group),
+                )
+        profiler.count("flights", len(self.mission_data.flights))
 
-        return self.unit_map
+    def log_channel_pressure(self) -> None:
+        for pressure in itertools.chain(
+            self.radio_registry.channel_pressure(),
+            self.tacan_registry.channel_pressure(),
+        ):
+            logging.debug(f"Channel pressure for {pressure}")
 
     def setup_mission_coalitions(self) -> None:
         self.mission.coalition["blue"] = Coalition(
@@ -193,6 +257,7 @@ def initialize_radio_registry(
     def generate_ground_conflicts(self) -> None:
         """Generate FLOTs and JTACs for each active front line."""
         for front_line in self.game.theater.conflicts():
+            profile_count("front lines")
             player_cp = front_line.blue_cp
             enemy_cp = front_line.red_cp
             conflict = FrontLineConflictDescription.frontline_cas_conflict(
@@ -235,7 +300,8 @@ def generate_air_units(self, tgo_generator: TgoGenerator) -> None:
             self.tacan_registry,
             self.mission_data,
         )
-        air_support_generator.generate()
+        with profile_span("Air support"):
+            air_support_generator.generate()
 
         # Generate Aircraft Activity on the map
         aircraft_generator = AircraftGenerator(
@@ -253,20 +319,23 @@ def generate_air_units(self, tgo_generator: TgoGenerator) -> None:
 
         aircraft_generator.clear_parking_slots()
 
-        aircraft_generator.generate_flights(
-            self.mission.country(self.game.blue.country_name),
-            self.game.blue.ato,
-            tgo_generator.runways,
-        )
-        aircraft_generator.generate_flights(
-            self.mission.country(self.game.red.country_name),
-            self.game.red.ato,
-            tgo_generator.runways,
-        )
-        aircraft_generator.spawn_unused_aircraft(
-            self.mission.country(self.game.blue.country_name),
-            self.mission.country(self.game.red.country_name),
-        )
+        with profile_span("Blue flights"):
+            aircraft_generator.generate_flights(
+                self.mission.country(self.game.blue.country_name),
+                self.game.blue.ato,
+                tgo_generator.runways,
+            )
+        with profile_span("Red flights"):
+            aircraft_generator.generate_flights(
+                self.mission.country(self.game.red.country_name),
+                self.game.red.ato,
+                tgo_generator.runways,
+            )
+        with profile_span("Unused aircraft"):
+            aircraft_generator.spawn_unused_aircraft(
+                self.mission.country(self.game.blue.country_name),
+                self.mission.country(self.game.red.country_name),
+            )
 
         for flight in aircraft_generator.flights:
             if not flight.client_units:
@@ -349,7 +418,8 @@ def notify_info_generators(
 
             for flight in mission_data.flights:
                 gen.add_flight(flight)
-            gen.generate()
+            with profile_span(type(gen).__name__):
+                gen.generate()
 
     def setup_combined_arms(self) -> None:
         self.mission.groundControl.pilot_can_control_vehicles = COMBINED_ARMS_SLOTS > 0
@@ -54,6 +54,7 @@
     MissileSiteGroundObject,
 )
 from game.theater.theatergroup import SceneryUnit, TheaterGroup, IadsGroundGroup
+from game.profiling import logged_duration
 from game.unitmap import UnitMap
 from game.utils import Heading, feet, knots, mps
 
@@ -74,15 +75,20 @@ def __init__(
         game: Game,
         mission: Mission,
         unit_map: UnitMap,
+        culled: Optional[bool] = None,
     ) -> None:
         self.ground_object = ground_object
         self.country = country
         self.game = game
         self.m = mission
         self.unit_map = unit_map
+        # Precomputed by TgoGenerator for all ground objects at once when available.
+        self._culled = culled
 
     @property
     def culled(self) -> bool:
+        if self._culled is not None:
+            return self._culled
         return self.game.iads_considerate_culling(self.ground_object)
 
     def generate(self) -> None:
@@ -630,6 +636,11 @@ def __init__(
         self.mission_data = mission_data
 
     def generate(self) -> None:
+        ground_objects = list(self.game.theater.ground_objects)
+        with logged_duration(f"Culling {len(ground_objects)} ground objects"):
+            culled = self.game.culled_ground_objects(ground_objects)
+        logging.info(f"Culled {len(culled)} of {len(ground_objects)} ground objects")
+
         for cp in self.game.theater.controlpoints:
             country = self.m.country(self.game.coalition_for(cp.captured).country_name)
 
@@ -677,7 +688,12 @@ def generate(self) -> None:
                     )
                 else:
                     generator = GroundObjectGenerator(
-                        ground_object, country, self.game, self.m, self.unit_map
+                        ground_object,
+                        country,
+                        self.game,
+                        self.m,
+                        self.unit_map,
+                        culled=ground_object in culled,
                     )
                 generator.generate()
         self.mission_data.runways = list(self.runways.values())
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import hashlib
 import heapq
+import logging
 import math
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set, Tuple, Union
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 
+import numpy as np
 from dcs.mapping import Point
 from shapely.geometry import (
     LineString,
@@ -14,7 +19,10 @@
     Polygon,
     box,
 )
-from shapely.ops import nearest_points, triangulate
+from shapely.geometry.base import BaseGeometry
+from shapely.ops import triangulate, unary_union
+from shapely.prepared import prep
+from shapely.strtree import STRtree
 
 from game.theater import ConflictTheater
 from game.threatzones import ThreatZones
@@ -30,7 +38,6 @@ def __init__(self, ident: int, poly: Polygon, threatened: bool) -> None:
         self.ident = ident
         self.poly = poly
         self.threatened = threatened
-        self.neighbors: Dict[NavMeshPoly, Union[LineString, ShapelyPoint]] = {}
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, NavMeshPoly):
@@ -41,13 +48,68 @@ def __hash__(self) -> int:
         return self.ident
 
 
+@dataclass(frozen=True)
+class NavMeshData:
+    """Compact, picklable representation of a navmesh.
+
+    Used to return navmeshes from the worker processes that build them and to cache
+    them between turns. The neighbors of each poly are stored in CSR form: the
+    neighbors of poly i are neighbors[neighbor_offsets[i]:neighbor_offsets[i + 1]],
+    in the order they were discovered, and portals holds the endpoints of the
+    boundary shared with each of those neighbors. Polys that touch at a single point
+    have both endpoints equal.
+    """
+
+    triangles: np.ndarray  # (polys, 3, 2) float64
+    threatened: np.ndarray  # (polys,) bool
+    neighbor_offsets: np.ndarray  # (polys + 1,) int32
+    neighbors: np.ndarray  # (edges,) int32
+    portals: np.ndarray  # (edges, 2, 2) float64
+
+    @staticmethod
+    def from_polys(
+        polys: List[NavMeshPoly], neighbors: List[Dict[int, BaseGeometry]]
+    ) -> NavMeshData:
+        triangles = np.array(
+            [p.poly.exterior.coords[:3] for p in polys], dtype=np.float64
+        ).reshape((len(polys), 3, 2))
+        offsets = [0]
+        neighbor_idents = []
+        portals = []
+        for poly_neighbors in neighbors:
+            for neighbor, boundary in poly_neighbors.items():
+                neighbor_idents.append(neighbor)
+                coords = boundary.coords
+                portals.append((coords[0], coords[-1]))
+            offsets.append(len(neighbor_idents))
+        return NavMeshData(
+            triangles,
+            np.array([p.threatened for p in polys], dtype=np.bool_),
+            np.array(offsets, dtype=np.int32),
+            np.array(neighbor_idents, dtype=np.int32),
+            np.array(portals, dtype=np.float64).reshape((len(neighbor_idents), 2, 2)),
+        )
+
+    def to_polys(self) -> List[NavMeshPoly]:
+        return [
+            NavMeshPoly(i, Polygon(triangle), bool(threatened))
+            for i, (triangle, threatened) in enumerate(
+                zip(self.triangles.tolist(), self.threatened.tolist())
+            )
+        ]
+
+
 @dataclass(frozen=True)
 class NavPoint:
-    point: ShapelyPoint
+    x: float
+    y: float
     poly: NavMeshPoly
 
     def world_point(self, theater: ConflictTheater) -> Point:
-        return Point(self.point.x, self.point.y, theater.terrain)
+        return Point(self.x, self.y, theater.terrain)
+
+    def distance(self, other: NavPoint) -> float:
+        return math.hypot(self.x - other.x, self.y - other.y)
 
     def __hash__(self) -> int:
         return hash(self.poly.ident)
@@ -59,13 +121,14 @@ def __eq__(self, other: object) -> bool:
         if not isinstance(other, NavPoint):
             return False
 
-        if not self.point.almost_equals(other.point):
+        # Same tolerance as shapely's almost_equals.
+        if self.distance(other) > 0.5e-6:
             return False
 
         return self.poly == other.poly
 
     def __str__(self) -> str:
-        return f"{self.point} in {self.poly.ident}"
+        return f"({self.x}, {self.y}) in {self.poly.ident}"
 
 
 @dataclass(frozen=True, order=True)
@@ -88,21 +151,32 @@ def pop(self) -> Optional[NavPoint]:
             return None
 
 
+PathCacheKey = Tuple[int, int, int, int, int, int]
+
+
 class NavMesh:
-    def __init__(self, polys: List[NavMeshPoly], theater: ConflictTheater) -> None:
-        self.polys = polys
+    # Paths between points that round to the same grid cell (and are in the same nav
+    # polys) are treated as the same path. The precise origin and destination are
+    # still used as the endpoints of the returned path, only the intermediate points
+    # are shared. Nav points are perturbed by up to a mile after pathing anyway.
+    PATH_CACHE_RESOLUTION = 100  # meters
+    PATH_CACHE_SIZE = 1024
+
+    def __init__(self, data: NavMeshData, theater: ConflictTheater) -> None:
+        self.data = data
+        self.polys = data.to_polys()
         self.theater = theater
+        self._index = STRtree([p.poly for p in self.polys]) if self.polys else None
+        self._path_cache: OrderedDict[PathCacheKey, List[Point]] = OrderedDict()
 
     def localize(self, point: Point) -> Optional[NavMeshPoly]:
-        # This is a naive implementation but it's O(n). Runs at about 10k
-        # lookups a second on a 5950X. Flights usually have 5-10 waypoints, so
-        # that's 1k-2k flights before we lose a full second to localization as a
-        # part of flight plan creation.
-        #
-        # Can improve the algorithm later if needed, but that seems unnecessary
-        # currently.
+        if self._index is None:
+            return None
         p = ShapelyPoint(point.x, point.y)
-        for navpoly in self.polys:
+        # Points on the border between polys intersect each of them. Check the
+        # candidates in order so the result is the same as a linear scan.
+        for idx in sorted(self._index.query_items(p)):
+            navpoly = self.polys[idx]
             if navpoly.poly.intersects(p):
                 return navpoly
         return None
@@ -112,7 +186,7 @@ def travel_cost(a: NavPoint, b: NavPoint) -> float:
         modifier = 1.0
         if a.poly.threatened:
             modifier = 3.0
-        return a.point.distance(b.point) * modifier
+        return a.distance(b) * modifier
 
     def travel_heuristic(self, a: NavPoint, b: NavPoint) -> float:
         return self.travel_cost(a, b)
@@ -137,10 +211,6 @@ def reconstruct_path(
         path.reverse()
         return path
 
-    @staticmethod
-    def dcs_to_shapely_point(point: Point) -> ShapelyPoint:
-        return ShapelyPoint(point.x, point.y)
-
     def shortest_path(self, origin: Point, destination: Point) -> List[Point]:
         origin_poly = self.localize(origin)
         if origin_poly is None:
@@ -151,11 +221,76 @@ def shortest_path(self, origin: Point, destination: Point) -> List[Point]:
                 f"Destination point {destination} is outside the navmesh"
             )
 
-        return self._shortest_path(
-            NavPoint(self.dcs_to_shapely_point(origin), origin_poly),
-            NavPoint(self.dcs_to_shapely_point(destination), destination_poly),
+        origin_nav = NavPoint(origin.x, origin.y, origin_poly)
+        destination_nav = NavPoint(destination.x, destination.y, destination_poly)
+        if origin_poly == destination_poly:
+            # Trivial, and not worth caching.
+            return self._shortest_path(origin_nav, destination_nav)
+
+        key = self._path_cache_key(origin, origin_poly, destination, destination_poly)
+        cached = self._path_cache.get(key)
+        if cached is None:
+            cached = self._shortest_path(origin_nav, destination_nav)
+            self._path_cache[key] = cached
+            if len(self._path_cache) > self.PATH_CACHE_SIZE:
+                self._path_cache.popitem(last=False)
+        else:
+            self._path_cache.move_to_end(key)
+
+        # Replace the endpoints of the cached path with the requested ones, and
+        # don't let callers modify the cached list.
+        path = [Point(origin.x, origin.y, self.theater.terrain)]
+        path.extend(cached[1:-1])
+        path.append(Point(destination.x, destination.y, self.theater.terrain))
+        return path
+
+    def _path_cache_key(
+        self,
+        origin: Point,
+        origin_poly: NavMeshPoly,
+        destination: Point,
+        destination_poly: NavMeshPoly,
+    ) -> PathCacheKey:
+        resolution = self.PATH_CACHE_RESOLUTION
+        return (
+            origin_poly.ident,
+            round(origin.x / resolution),
+            round(origin.y / resolution),
+            destination_poly.ident,
+            round(destination.x / resolution),
+            round(destination.y / resolution),
         )
 
+    def portal_entry_points(
+        self, point: NavPoint
+    ) -> tuple[list[int], list[list[float]]]:
+        """Finds the closest point on each of the nav poly's portals.
+
+        Returns the idents of the poly's neighbors and, for each, the point on the
+        boundary shared with that neighbor that is closest to the given point.
+        """
+        start = self.data.neighbor_offsets[point.poly.ident]
+        end = self.data.neighbor_offsets[point.poly.ident + 1]
+        portals = self.data.portals[start:end]
+        a = portals[:, 0]
+        ab = portals[:, 1] - a
+        length_squared = np.einsum("ij,ij->i", ab, ab)
+        # Project the point onto each portal segment, clamped to the segment. Portals
+        # where the polys touch at only a single point have zero length.
+        projection = np.einsum("ij,ij->i", np.array([point.x, point.y]) - a, ab)
+        t = np.divide(
+            projection,
+            length_squared,
+            out=np.zeros_like(projection),
+            where=length_squared > 0,
+        )
+        # Use the segment endpoints exactly when the projection falls outside the
+        # segment rather than computing them from the (rounded) direction vector.
+        entry_points = a + t[:, np.newaxis] * ab
+        entry_points[t <= 0] = a[t <= 0]
+        entry_points[t >= 1] = portals[t >= 1, 1]
+        return self.data.neighbors[start:end].tolist(), entry_points.tolist()
+
     def _shortest_path(self, origin: NavPoint, destination: NavPoint) -> List[Point]:
         # Adapted from
         # https://www.redblobgames.com/pathfinding/a-star/implementation.py.
@@ -180,15 +315,16 @@ def _shortest_path(self, origin: NavPoint, destination: NavPoint) -> List[Point]
                     frontier.push(destination, estimated)
                     came_from[destination] = current
 
-            for neighbor, boundary in current.poly.neighbors.items():
-                previous = came_from[current]
+            previous = came_from[current]
+            if previous is None and current != origin:
+                raise RuntimeError
+            neighbors, entry_points = self.portal_entry_points(current)
+            for neighbor_ident, (x, y) in zip(neighbors, entry_points):
+                neighbor = self.polys[neighbor_ident]
                 if previous is not None and previous.poly == neighbor:
                     # Don't backtrack.
                     continue
-                if previous is None and current != origin:
-                    raise RuntimeError
-                _, neighbor_point = nearest_points(current.point, boundary)
-                neighbor_nav = NavPoint(neighbor_point, neighbor)
+                neighbor_nav = NavPoint(x, y, neighbor)
                 cost = best_known[current] + self.travel_cost(current, neighbor_nav)
                 if cost < best_known[neighbor_nav]:
                     best_known[neighbor_nav] = cost
@@ -214,20 +350,27 @@ def map_bounds(theater: ConflictTheater) -> Polygon:
 
     @staticmethod
     def create_navpolys(
-        polys: List[Polygon], threat_zones: ThreatZones
+        polys: List[Polygon], threat_poly: BaseGeometry
     ) -> List[NavMeshPoly]:
-        return [
-            NavMeshPoly(i, p, threat_zones.threatened(p)) for i, p in enumerate(polys)
-        ]
+        threats = prep(threat_poly)
+        return [NavMeshPoly(i, p, threats.intersects(p)) for i, p in enumerate(polys)]
 
     @staticmethod
-    def associate_neighbors(polys: List[NavMeshPoly]) -> None:
+    def associate_neighbors(
+        polys: List[NavMeshPoly],
+    ) -> List[Dict[int, BaseGeometry]]:
+        """Finds the neighbors of each poly and the boundary shared with each.
+
+        Returns a list with an entry for each poly mapping the ident of each of its
+        neighbors to the boundary they share.
+        """
         # Maps (rounded) points to polygons that have a vertex at that point.
         # The points are rounded to the nearest int so we can use them as dict
         # keys. This allows us to perform approximate neighbor lookups more
         # efficiently than comparing each poly to every other poly by finding
         # approximate neighbors before checking if the polys actually touch.
         points_map: Dict[Tuple[int, int], Set[NavMeshPoly]] = defaultdict(set)
+        neighbors: List[Dict[int, BaseGeometry]] = [{} for _ in polys]
 
         for navpoly in polys:
             # The coordinates of the polygon's boundary are a sequence of
@@ -235,24 +378,32 @@ def associate_neighbors(polys: List[NavMeshPoly]) -> None:
             # at the end, so skip the last vertex.
             for x, y in navpoly.poly.boundary.coords[:-1]:
                 point = (int(x), int(y))
-                neighbors = {}
                 for potential_neighbor in points_map[point]:
                     intersection = navpoly.poly.intersection(potential_neighbor.poly)
                     if not intersection.is_empty:
-                        potential_neighbor.neighbors[navpoly] = intersection
-                        neighbors[potential_neighbor] = intersection
-                navpoly.neighbors.update(neighbors)
+                        neighbors[potential_neighbor.ident][
+                            navpoly.ident
+                        ] = intersection
+                        neighbors[navpoly.ident][
+                            potential_neighbor.ident
+                        ] = intersection
                 points_map[point].add(navpoly)
+        return neighbors
 
     @classmethod
-    def from_threat_zones(
-        cls, threat_zones: ThreatZones, theater: ConflictTheater
-    ) -> NavMesh:
+    def build_data(cls, threats: Sequence[Polygon], bounds: Polygon) -> NavMeshData:
+        """Builds the navmesh that avoids the given threats within the given bounds.
+
+        This is pure shapely work that does not depend on any game state, so it can
+        be run in a worker process.
+        """
+        threat_zone = unary_union(threats)
+
         # Simplify the threat poly to reduce the number of nav zones. Increase
         # the size of the zone and then simplify it with the buffer size as the
         # error margin. This will create a simpler poly around the threat zone.
         buffer = nautical_miles(10).meters
-        threat_poly = threat_zones.all.buffer(buffer).simplify(buffer)
+        threat_poly = threat_zone.buffer(buffer).simplify(buffer)
 
         # Threat zones can be disconnected. Create a list of threat zones.
         if isinstance(threat_poly, MultiPolygon):
@@ -263,11 +414,101 @@ def from_threat_zones(
         # Subtract the threat zones from the whole-map poly to build a navmesh
         # for the *safe* areas. Navigation within threatened regions is always
         # a straight line to the target or out of the threatened region.
-        bounds = cls.map_bounds(theater)
         for poly in polys:
             bounds = bounds.difference(poly)
 
         # Triangulate the safe-region to build the navmesh.
-        navpolys = cls.create_navpolys(triangulate(bounds), threat_zones)
-        cls.associate_neighbors(navpolys)
-        return NavMesh(navpolys, theater)
+        navpolys = cls.create_navpolys(triangulate(bounds), threat_zone)
+        return NavMeshData.from_polys(navpolys, cls.associate_neighbors(navpolys))
+
+    @classmethod
+    def from_threat_zones(
+        cls, threat_zones: ThreatZones, theater: ConflictTheater
+    ) -> NavMesh:
+        return cls.from_each_threat_zones([threat_zones], theater)[0]
+
+    @classmethod
+    def from_each_threat_zones(
+        cls, threat_zones: Sequence[ThreatZones], theater: ConflictTheater
+    ) -> List[NavMesh]:
+        """Builds one navmesh for each of the given threat zones.
+
+        Navmeshes for threats that have not changed since they were last built are
+        reused from the cache. If more than one navmesh needs to be built they are
+        built in parallel in worker processes.
+        """
+        bounds = cls.map_bounds(theater)
+        data: List[Optional[NavMeshData]] = []
+        keys = []
+        threats = []
+        for zones in threat_zones:
+            zone_threats = zones.airbase_zones.zones + zones.air_defense_zones.zones
+            key = _navmesh_cache_key(zone_threats, bounds)
+            data.append(_navmesh_cache.get(key))
+            keys.append(key)
+            threats.append(zone_threats)
+
+        misses = [i for i, d in enumerate(data) if d is None]
+        if len(misses) > 1:
+            try:
+                futures: Dict[int, Future[NavMeshData]] = {
+                    i: _navmesh_executor().submit(cls.build_data, threats[i], bounds)
+                    for i in misses
+                }
+                for i, future in futures.items():
+                    data[i] = future.result()
+            except (BrokenProcessPool, OSError):
+                logging.exception(
+                    "Could not build navmeshes in worker processes. Falling back to "
+                    "building them serially."
+                )
+                _shutdown_navmesh_executor()
+        for i in misses:
+            navmesh_data = data[i]
+            if navmesh_data is None:
+                navmesh_data = cls.build_data(threats[i], bounds)
+                data[i] = navmesh_data
+            _cache_navmesh_data(keys[i], navmesh_data)
+
+        navmeshes = []
+        for navmesh_data in data:
+            assert navmesh_data is not None
+            navmeshes.append(NavMesh(navmesh_data, theater))
+        return navmeshes
+
+
+# Two coalitions with the threats from this turn and the previous one.
+NAVMESH_CACHE_SIZE = 4
+
+_navmesh_cache: OrderedDict[str, NavMeshData] = OrderedDict()
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _navmesh_cache_key(threats: Sequence[Polygon], bounds: Polygon) -> str:
+    digest = hashlib.sha256(bounds.wkb)
+    for threat in threats:
+        digest.update(threat.wkb)
+    return digest.hexdigest()
+
+
+def _cache_navmesh_data(key: str, data: NavMeshData) -> None:
+    _navmesh_cache[key] = data
+    _navmesh_cache.move_to_end(key)
+    while len(_navmesh_cache) > NAVMESH_CACHE_SIZE:
+        _navmesh_cache.popitem(last=False)
+
+
+def _navmesh_executor() -> ProcessPoolExecutor:
+    # The pool is kept alive for the life of the application to avoid paying the
+    # worker start up cost every turn.
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=2)
+    return _executor
+
+
+def _shutdown_navmesh_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
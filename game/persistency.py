@@ -1,16 +1,122 @@
 from __future__ import annotations
 
+import io
+import json
 import logging
+import lzma
+import os
 import pickle
-import shutil
+import struct
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, TYPE_CHECKING
+from typing import Any, BinaryIO, Optional, TYPE_CHECKING, Union, cast
 
 from game.profiling import logged_duration
+from game.version import VERSION
 
 if TYPE_CHECKING:
     from game import Game
 
+
+@dataclass(frozen=True)
+class SaveHeader:
+    """Metadata stored uncompressed at the start of each save game.
+
+    The same metadata is recorded in the save index of the save's directory.
+    """
+
+    format_version: int
+    version: str
+    turn: int
+    date: datetime
+    theater: str
+    player_faction: str
+    enemy_faction: str
+    # The following were added after the first version of the format, so may be
+    # missing from older saves.
+    player_budget: Optional[float] = None
+    enemy_budget: Optional[float] = None
+    player_bases: Optional[int] = None
+    enemy_bases: Optional[int] = None
+
+    @classmethod
+    def for_game(cls, game: Game) -> SaveHeader:
+        return SaveHeader(
+            format_version=SAVE_FORMAT_VERSION,
+            version=VERSION,
+            turn=game.turn,
+            date=game.conditions.start_time,
+            theater=game.theater.terrain.name,
+            player_faction=game.blue.faction.name,
+            enemy_faction=game.red.faction.name,
+            player_budget=game.blue.budget,
+            enemy_budget=game.red.budget,
+            player_bases=len(game.theater.player_points()),
+            enemy_bases=len(game.theater.enemy_points()),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["date"] = self.date.isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> SaveHeader:
+        known = {f.name for f in fields(cls)}
+        values = {k: v for k, v in data.items() if k in known}
+        values["date"] = datetime.fromisoformat(values["date"])
+        return SaveHeader(**values)
+
+    def to_bytes(self) -> bytes:
+        return json.dumps(self.to_dict()).encode("utf-8")
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> SaveHeader:
+        return cls.from_dict(json.loads(data.decode("utf-8")))
+
+
+@dataclass(frozen=True)
+class SaveInfo:
+    """A save game listed by list_saves."""
+
+    path: Path
+    modified: datetime
+    size: int
+    #: None if the save predates the container format.
+    header: Optional[SaveHeader]
+
+
+# Save file layout. All integers are little endian.
+#
+# magic
+# u32 header length, followed by the header as JSON
+# u64 pickle frame length, followed by the LZMA compressed pickle (protocol 5)
+# u32 buffer count, followed by each out-of-band pickle buffer as a u64 length and
+#     an LZMA compressed frame
+SAVE_MAGIC = b"DCSLIB\x00\x01"
+SAVE_FORMAT_VERSION = 1
+_PICKLE_PROTOCOL = 5
+# Saves are written every turn, so favor speed over size. Higher presets are several
+# times slower for only a few percent smaller files.
+_LZMA_PRESET = 1
+_CHUNK_SIZE = 1024 * 1024
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+
+# Each save directory has an index of the headers of the saves within it, so that
+# saves can be listed without opening each one. Entries are validated against the
+# modification time and size of the save, so saves that were copied in or modified
+# by an older version are re-read.
+SAVE_INDEX_FILE = "save_index.json"
+SAVE_INDEX_VERSION = 1
+
+_autosave_pool: Optional[ThreadPoolExecutor] = None
+# Saves and autosaves may update the same index concurrently.
+_index_lock = threading.Lock()
 _dcs_saved_game_folder: Optional[str] = None
 
 
@@ -21,6 +127,10 @@ def setup(user_folder: str) -> None:
         save_dir().mkdir(parents=True)
 
 
+def is_set_up() -> bool:
+    return _dcs_saved_game_folder is not None
+
+
 def base_path() -> str:
     global _dcs_saved_game_folder
     assert _dcs_saved_game_folder
@@ -31,10 +141,6 @@ def save_dir() -> Path:
     return Path(base_path()) / "Liberation" / "Saves"
 
 
-def _temporary_save_file() -> str:
-    return str(save_dir() / "tmpsave.liberation")
-
-
 def _autosave_path() -> str:
     return str(save_dir() / "autosave.liberation")
 
@@ -46,7 +152,13 @@ def mission_path_for(name: str) -> Path:
 def load_game(path: str) -> Optional[Game]:
     with open(path, "rb") as f:
         try:
-            save = pickle.load(f)
+            if (header := _read_header(f)) is None:
+                # Saves from before the container format are plain pickles.
+                f.seek(0)
+                save = pickle.load(f)
+            else:
+                logging.debug(f"Loading turn {header.turn} save from {header.version}")
+                save = _read_game(f)
             save.savepath = path
             return save
         except Exception:
@@ -54,28 +166,282 @@ def load_game(path: str) -> Optional[Game]:
             return None
 
 
+def read_save_header(path: str) -> Optional[SaveHeader]:
+    """Reads the metadata of a save game without loading the game.
+
+    Returns None if the file is not a save game or predates the container format.
+    """
+    try:
+        with open(path, "rb") as f:
+            return _read_header(f)
+    except Exception:
+        logging.exception(f"Could not read save header from {path}")
+        return None
+
+
+def list_saves(directory: Optional[Path] = None) -> list[SaveInfo]:
+    """Lists the save games in a directory, most recently modified first.
+
+    Saves are described by the directory's save index, so this does not need to
+    load any of the games.
+    """
+    if directory is None:
+        directory = save_dir()
+    saves = []
+    with _index_lock:
+        index = _load_index(directory)
+        changed = False
+        for path in directory.glob("*.liberation"):
+            stat = path.stat()
+            entry = index.get(path.name)
+            if (
+                entry is None
+                or entry["mtime_ns"] != stat.st_mtime_ns
+                or entry["size"] != stat.st_size
+            ):
+                header = read_save_header(str(path))
+                entry = _index_entry(path, header)
+                index[path.name] = entry
+                changed = True
+            header_data = entry["header"]
+            saves.append(
+                SaveInfo(
+                    path,
+                    datetime.fromtimestamp(stat.st_mtime),
+                    stat.st_size,
+                    None if header_data is None else SaveHeader.from_dict(header_data),
+                )
+            )
+        names = {s.path.name for s in saves}
+        for name in set(index) - names:
+            del index[name]
+            changed = True
+        if changed:
+            _write_index(directory, index)
+    return sorted(saves, key=lambda s: s.modified, reverse=True)
+
+
 def save_game(game: Game) -> bool:
     with logged_duration("Saving game"):
         try:
-            with open(_temporary_save_file(), "wb") as f:
-                pickle.dump(game, f)
-            shutil.copy(_temporary_save_file(), game.savepath)
+            header = SaveHeader.for_game(game)
+            path = Path(game.savepath)
+            _write_atomic(path, lambda f: _write_save(f, header, game=game))
+            _update_index(path, header)
             return True
         except Exception:
             logging.exception("Could not save game")
             return False
 
 
-def autosave(game: Game) -> bool:
+def autosave(game: Game) -> Future[bool]:
     """
     Autosave to the autosave location
+
+    The game is snapshotted (pickled) on the calling thread so that it can continue
+    to be modified while the snapshot is compressed and written in the background.
     :param game: Game to save
-    :return: True if saved succesfully
+    :return: A future that resolves to True if saved succesfully
     """
     try:
-        with open(_autosave_path(), "wb") as f:
-            pickle.dump(game, f)
-        return True
+        with logged_duration("Autosave snapshot"):
+            header = SaveHeader.for_game(game)
+            buffers: list[pickle.PickleBuffer] = []
+            payload = pickle.dumps(
+                game, protocol=_PICKLE_PROTOCOL, buffer_callback=buffers.append
+            )
+            # The out-of-band buffers reference the game's memory, which may change
+            # before the background write.
+            snapshot = _Snapshot(payload, [bytes(b.raw()) for b in buffers])
     except Exception:
         logging.exception("Could not save game")
-        return False
+        failed: Future[bool] = Future()
+        failed.set_result(False)
+        return failed
+    return _autosave_executor().submit(_write_autosave, header, snapshot)
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    payload: bytes
+    buffers: list[bytes]
+
+
+class _FrameReader(io.RawIOBase):
+    """Reader limited to a single frame of a save file."""
+
+    def __init__(self, f: BinaryIO, length: int) -> None:
+        super().__init__()
+        self.f = f
+        self.remaining = length
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        view = memoryview(buffer).cast("B")
+        data = self.f.read(min(len(view), self.remaining))
+        view[: len(data)] = data
+        self.remaining -= len(data)
+        return len(data)
+
+
+def _read_header(f: BinaryIO) -> Optional[SaveHeader]:
+    if f.read(len(SAVE_MAGIC)) != SAVE_MAGIC:
+        return None
+    (length,) = _U32.unpack(f.read(_U32.size))
+    header = SaveHeader.from_bytes(f.read(length))
+    if header.format_version > SAVE_FORMAT_VERSION:
+        raise RuntimeError(
+            f"Save format version {header.format_version} is newer than the "
+            f"supported version ({SAVE_FORMAT_VERSION})"
+        )
+    return header
+
+
+def _read_game(f: BinaryIO) -> Game:
+    # The buffers follow the pickle, but are needed to unpickle it.
+    (pickle_length,) = _U64.unpack(f.read(_U64.size))
+    pickle_offset = f.tell()
+    f.seek(pickle_length, os.SEEK_CUR)
+    (buffer_count,) = _U32.unpack(f.read(_U32.size))
+    buffers = []
+    for _ in range(buffer_count):
+        (length,) = _U64.unpack(f.read(_U64.size))
+        buffers.append(lzma.decompress(f.read(length)))
+    f.seek(pickle_offset)
+    with lzma.LZMAFile(cast(BinaryIO, _FrameReader(f, pickle_length))) as frame:
+        return pickle.load(frame, buffers=buffers)
+
+
+def _write_frame(f: BinaryIO, write: Callable[[BinaryIO], None]) -> None:
+    length_offset = f.tell()
+    f.write(_U64.pack(0))
+    with lzma.LZMAFile(f, "wb", preset=_LZMA_PRESET) as frame:
+        write(cast(BinaryIO, frame))
+    end = f.tell()
+    f.seek(length_offset)
+    f.write(_U64.pack(end - length_offset - _U64.size))
+    f.seek(end)
+
+
+def _write_save(
+    f: BinaryIO,
+    header: SaveHeader,
+    game: Optional[Game] = None,
+    snapshot: Optional[_Snapshot] = None,
+) -> None:
+    header_data = header.to_bytes()
+    f.write(SAVE_MAGIC)
+    f.write(_U32.pack(len(header_data)))
+    f.write(header_data)
+
+    buffers: list[Union[bytes, pickle.PickleBuffer]] = []
+    if game is not None:
+        _write_frame(
+            f,
+            lambda frame: pickle.dump(
+                game, frame, protocol=_PICKLE_PROTOCOL, buffer_callback=buffers.append
+            ),
+        )
+    else:
+        assert snapshot is not None
+        payload = memoryview(snapshot.payload)
+
+        def write_payload(frame: BinaryIO) -> None:
+            for start in range(0, len(payload), _CHUNK_SIZE):
+                frame.write(payload[start : start + _CHUNK_SIZE])
+
+        _write_frame(f, write_payload)
+        buffers.extend(snapshot.buffers)
+
+    f.write(_U32.pack(len(buffers)))
+    for buffer in buffers:
+        data = lzma.compress(memoryview(buffer), preset=_LZMA_PRESET)
+        f.write(_U64.pack(len(data)))
+        f.write(data)
+
+
+def _write_atomic(path: Path, write: Callable[[BinaryIO], None]) -> None:
+    """Writes a file such that readers see either the old or the new file.
+
+    The file is written to a temporary file in the same directory and then renamed
+    over the destination, so an interrupted save can't corrupt an existing save.
+    """
+    temp_path = path.with_name(f"{path.name}.tmp")
+    try:
+        with temp_path.open("wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def _write_autosave(header: SaveHeader, snapshot: _Snapshot) -> bool:
+    with logged_duration("Autosave"):
+        try:
+            path = Path(_autosave_path())
+            _write_atomic(path, lambda f: _write_save(f, header, snapshot=snapshot))
+            _update_index(path, header)
+            return True
+        except Exception:
+            logging.exception("Could not save game")
+            return False
+
+
+def _autosave_executor() -> ThreadPoolExecutor:
+    # A single worker so that autosaves are written in order. The executor's thread
+    # is joined at exit, so a pending autosave is not lost when the game is closed.
+    global _autosave_pool
+    if _autosave_pool is None:
+        _autosave_pool = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="autosave"
+        )
+    return _autosave_pool
+
+
+def _index_entry(path: Path, header: Optional[SaveHeader]) -> dict[str, Any]:
+    stat = path.stat()
+    return {
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "header": None if header is None else header.to_dict(),
+    }
+
+
+def _load_index(directory: Path) -> dict[str, dict[str, Any]]:
+    path = directory / SAVE_INDEX_FILE
+    if not path.exists():
+        return {}
+    try:
+        with path.open(encoding="utf-8") as index_file:
+            data = json.load(index_file)
+        if data.get("version") != SAVE_INDEX_VERSION:
+            return {}
+        return data["saves"]
+    except Exception:
+        # The index is only a cache. It will be rebuilt from the saves.
+        logging.exception(f"Ignoring unreadable save index {path}")
+        return {}
+
+
+def _write_index(directory: Path, index: dict[str, dict[str, Any]]) -> None:
+    data = json.dumps({"version": SAVE_INDEX_VERSION, "saves": index}, indent=2)
+
+    def write_data(f: BinaryIO) -> None:
+        f.write(data.encode("utf-8"))
+
+    _write_atomic(directory / SAVE_INDEX_FILE, write_data)
+
+
+def _update_index(path: Path, header: SaveHeader) -> None:
+    try:
+        with _index_lock:
+            index = _load_index(path.parent)
+            index[path.name] = _index_entry(path, header)
+            _write_index(path.parent, index)
+    except Exception:
+        # The save itself succeeded. The index will be rebuilt when it is listed.
+        logging.exception(f"Could not update save index for {path}")
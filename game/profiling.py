@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+import cProfile
+import io
+import json
 import logging
+import pstats
 import timeit
 from collections import defaultdict
+from collections.abc import Collection
 from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import timedelta
+from pathlib import Path
 from types import TracebackType
-from typing import Iterator, Optional, Type
+from typing import Any, Iterator, Optional, Type
 
 
 @contextmanager
@@ -39,3 +46,147 @@ def trace(self, event: str) -> Iterator[None]:
         yield
         end = timeit.default_timer()
         self.events[event] += timedelta(seconds=end - start)
+
+
+@dataclass
+class ProfileSpan:
+    """A named, timed region of a profile and the spans nested within it.
+
+    A span that is entered more than once under the same parent accumulates its
+    duration and counts the number of times it was entered.
+    """
+
+    name: str
+    duration: timedelta = field(default_factory=timedelta)
+    calls: int = 0
+    counters: dict[str, int] = field(default_factory=dict)
+    children: dict[str, ProfileSpan] = field(default_factory=dict)
+    #: The slowest functions of the span, if it was captured with cProfile.
+    cprofile: Optional[str] = None
+
+    def child(self, name: str) -> ProfileSpan:
+        span = self.children.get(name)
+        if span is None:
+            span = ProfileSpan(name)
+            self.children[name] = span
+        return span
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "duration_ms": self.duration.total_seconds() * 1000,
+            "calls": self.calls,
+            "counters": dict(self.counters),
+            "cprofile": self.cprofile,
+            "children": [child.to_dict() for child in self.children.values()],
+        }
+
+    def log(self, depth: int = 0) -> None:
+        counters = ", ".join(f"{k}: {v}" for k, v in self.counters.items())
+        logging.debug(
+            "%s%s took %s%s",
+            "  " * depth,
+            self.name,
+            self.duration,
+            f" ({counters})" if counters else "",
+        )
+        for child in self.children.values():
+            child.log(depth + 1)
+
+
+class HierarchicalProfiler:
+    """Records nested spans of a long running operation.
+
+    While a profiler is active, profile_span and profile_count record into it from
+    anywhere in the code, so code called by the profiled operation can add detail
+    without being passed the profiler. Spans named in cprofile_spans are also
+    captured with cProfile.
+    """
+
+    _active: Optional[HierarchicalProfiler] = None
+
+    def __init__(self, name: str, cprofile_spans: Collection[str] = ()) -> None:
+        self.root = ProfileSpan(name)
+        self.cprofile_spans = set(cprofile_spans)
+        self._stack = [self.root]
+        self._profiling = False
+        self._start = 0.0
+        self._previous: Optional[HierarchicalProfiler] = None
+
+    @classmethod
+    def active(cls) -> Optional[HierarchicalProfiler]:
+        return cls._active
+
+    def __enter__(self) -> HierarchicalProfiler:
+        self._previous = HierarchicalProfiler._active
+        HierarchicalProfiler._active = self
+        self._start = timeit.default_timer()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.root.duration += timedelta(seconds=timeit.default_timer() - self._start)
+        self.root.calls += 1
+        HierarchicalProfiler._active = self._previous
+        self.root.log()
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[ProfileSpan]:
+        span = self._stack[-1].child(name)
+        self._stack.append(span)
+        # Only one cProfile profiler can run at a time, so a span nested in a
+        # captured span is not captured separately.
+        profile: Optional[cProfile.Profile] = None
+        if name in self.cprofile_spans and not self._profiling:
+            profile = cProfile.Profile()
+            self._profiling = True
+            profile.enable()
+        start = timeit.default_timer()
+        try:
+            yield span
+        finally:
+            span.duration += timedelta(seconds=timeit.default_timer() - start)
+            span.calls += 1
+            if profile is not None:
+                profile.disable()
+                self._profiling = False
+                span.cprofile = _format_cprofile(profile)
+            self._stack.pop()
+
+    def count(self, counter: str, value: int = 1) -> None:
+        """Adds to a counter of the innermost open span."""
+        counters = self._stack[-1].counters
+        counters[counter] = counters.get(counter, 0) + value
+
+    def write_json(self, path: Path) -> None:
+        with path.open("w", encoding="utf-8") as report:
+            json.dump(self.root.to_dict(), report, indent=2)
+
+
+def _format_cprofile(profile: cProfile.Profile, limit: int = 40) -> str:
+    output = io.StringIO()
+    pstats.Stats(profile, stream=output).sort_stats("cumulative").print_stats(limit)
+    return output.getvalue()
+
+
+@contextmanager
+def profile_span(name: str) -> Iterator[None]:
+    """Records a span in the active profiler, or logs its duration if there is none."""
+    profiler = HierarchicalProfiler.active()
+    if profiler is None:
+        with logged_duration(name):
+            yield
+    else:
+        with profiler.span(name):
+            yield
+
+
+def profile_count(counter: str, value: int = 1) -> None:
+    """Adds to a counter of the active profiler's innermost span, if any."""
+    profiler = HierarchicalProfiler.active()
+    if profiler is not None:
+        profiler.count(counter, value)
@@ -5,7 +5,7 @@
 import logging
 import re
 from dataclasses import dataclass
-from typing import Dict, FrozenSet, Iterator, List, Set, Tuple
+from typing import Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
 from dcs.task import Modulation
 
 
@@ -267,9 +267,122 @@ def get_radio(name: str) -> Radio:
     raise KeyError(f"Unknown radio: {name}")
 
 
+@dataclass(frozen=True)
+class ChannelPressure:
+    """How much of a band's channels are in use."""
+
+    #: Description of the band.
+    band: str
+
+    #: The number of allocatable channels in the band.
+    capacity: int
+
+    #: The number of those channels that are in use.
+    in_use: int
+
+    #: The number of allocations that had to share an in use channel.
+    reused: int = 0
+
+    @property
+    def utilization(self) -> float:
+        if not self.capacity:
+            return 1.0
+        return self.in_use / self.capacity
+
+    def __str__(self) -> str:
+        text = (
+            f"{self.band}: {self.in_use}/{self.capacity} channels in use "
+            f"({self.utilization:.0%})"
+        )
+        if self.reused:
+            text += f", {self.reused} reused"
+        return text
+
+
+class RangeChannels:
+    """Tracks which channels of a radio range are in use.
+
+    Channels are stored in a bytearray indexed by their step from the minimum of the
+    range, so the next free channel can be found with a single native scan. Channels
+    are never freed, so the scan resumes from the lowest channel that may be free.
+    """
+
+    def __init__(self, radio_range: RadioRange) -> None:
+        self.radio_range = radio_range
+        self.minimum = radio_range.minimum.hertz
+        self.maximum = radio_range.maximum.hertz
+        self.step = radio_range.step.hertz
+        self.in_use = bytearray(len(range(self.minimum, self.maximum, self.step)))
+        excluded = 0
+        for frequency in radio_range.excludes:
+            index = self.index_of(frequency)
+            if index is not None and not self.in_use[index]:
+                self.in_use[index] = 1
+                excluded += 1
+        self.capacity = len(self.in_use) - excluded
+        self.first_free = 0
+        self.reused = 0
+        #: Ranges of the same modulation that share frequencies with this one,
+        #: including this range.
+        self.overlapping: List[RangeChannels] = [self]
+
+    @property
+    def name(self) -> str:
+        return (
+            f"{self.minimum / 1000000:g}-{self.maximum / 1000000:g} MHz "
+            f"{self.radio_range.modulation.name} "
+            f"({self.step / 1000:g} kHz steps)"
+        )
+
+    def overlaps(self, other: RangeChannels) -> bool:
+        return (
+            self.radio_range.modulation == other.radio_range.modulation
+            and self.minimum < other.maximum
+            and other.minimum < self.maximum
+        )
+
+    def index_of(self, frequency: RadioFrequency) -> Optional[int]:
+        """Returns the index of the frequency in this range, or None if not in it."""
+        if frequency.modulation != self.radio_range.modulation:
+            return None
+        if not self.minimum <= frequency.hertz < self.maximum:
+            return None
+        index, remainder = divmod(frequency.hertz - self.minimum, self.step)
+        if remainder:
+            return None
+        return index
+
+    def frequency_at(self, index: int) -> RadioFrequency:
+        return RadioFrequency(
+            self.minimum + index * self.step, self.radio_range.modulation
+        )
+
+    def mark_in_use(self, frequency: RadioFrequency) -> None:
+        index = self.index_of(frequency)
+        if index is not None:
+            self.in_use[index] = 1
+
+    def next_free(self) -> Optional[RadioFrequency]:
+        index = self.in_use.find(0, self.first_free)
+        if index < 0:
+            self.first_free = len(self.in_use)
+            return None
+        self.first_free = index
+        return self.frequency_at(index)
+
+    def pressure(self) -> ChannelPressure:
+        in_use = self.in_use.count(1) - (len(self.in_use) - self.capacity)
+        return ChannelPressure(self.name, self.capacity, in_use, self.reused)
+
+
 class RadioRegistry:
     """Manages allocation of radio channels.
 
+    Each distinct radio range is tracked once by a RangeChannels, no matter how many
+    radios share it. Allocating or reserving a frequency marks it in use in every
+    range that contains it, so radios with overlapping ranges never allocate the same
+    channel.
+
     There's some room for improvement here. We could prefer to allocate
     frequencies that are available to the fewest number of radios first, so
     radios with wide bands like the AN/ARC-210 don't exhaust all the channels
@@ -293,50 +406,76 @@ class RadioRegistry:
 
     def __init__(self) -> None:
         self.allocated_channels: Set[RadioFrequency] = set()
-        self.radio_allocators: Dict[Radio, Iterator[RadioFrequency]] = {}
+        self.ranges: Dict[RadioRange, RangeChannels] = {}
+        self.ranges_by_modulation: Dict[Modulation, List[RangeChannels]] = {
+            modulation: [] for modulation in Modulation
+        }
+        self.radio_channels: Dict[Radio, List[RangeChannels]] = {}
+        self.reuse_iterators: Dict[Radio, Iterator[RadioFrequency]] = {}
 
         radios = itertools.chain(RADIOS, [self.BLUFOR_UHF])
         for radio in radios:
-            self.radio_allocators[radio] = radio.range()
+            self.channels_for_radio(radio)
+
+    def channels_for_range(self, radio_range: RadioRange) -> RangeChannels:
+        channels = self.ranges.get(radio_range)
+        if channels is None:
+            channels = RangeChannels(radio_range)
+            for frequency in self.allocated_channels:
+                channels.mark_in_use(frequency)
+            self.ranges[radio_range] = channels
+            for other in self.ranges_by_modulation[radio_range.modulation]:
+                if channels.overlaps(other):
+                    channels.overlapping.append(other)
+                    other.overlapping.append(channels)
+            self.ranges_by_modulation[radio_range.modulation].append(channels)
+        return channels
+
+    def channels_for_radio(self, radio: Radio) -> List[RangeChannels]:
+        channels = self.radio_channels.get(radio)
+        if channels is None:
+            channels = [self.channels_for_range(r) for r in radio.ranges]
+            self.radio_channels[radio] = channels
+        return channels
 
     def alloc_for_radio(self, radio: Radio) -> RadioFrequency:
         """Allocates a radio channel tunable by the given radio.
 
+        Channels are allocated from the radio's ranges in order, lowest frequency
+        first.
+
         Args:
             radio: The radio to allocate a channel for.
 
         Returns:
             A radio channel compatible with the given radio.
-
-        Raises:
-            OutOfChannelsError: All channels compatible with the given radio are
-                already allocated.
         """
-        allocator = self.radio_allocators[radio]
-        try:
-            while (channel := next(allocator)) in self.allocated_channels:
-                pass
-            self.reserve(channel)
-            return channel
-        except StopIteration:
-            # In the event of too many channel users, fail gracefully by reusing
-            # the last channel.
-            # https://github.com/dcs-liberation/dcs_liberation/issues/598
-            channel = radio.last_channel
-            logging.warning(
-                f"No more free channels for {radio.name}. Reusing {channel}."
-            )
-            return channel
+        for channels in self.channels_for_radio(radio):
+            channel = channels.next_free()
+            if channel is not None:
+                self.allocated_channels.add(channel)
+                self.mark_in_use(channel, channels.overlapping)
+                return channel
+
+        # In the event of too many channel users, fail gracefully by reusing the
+        # radio's channels in turn, so that no one channel collects every extra user.
+        # https://github.com/dcs-liberation/dcs_liberation/issues/598
+        reuse = self.reuse_iterators.get(radio)
+        if reuse is None:
+            reuse = itertools.cycle(radio.range())
+            self.reuse_iterators[radio] = reuse
+        channel = next(reuse)
+        for channels in self.ranges.values():
+            if channels.index_of(channel) is not None:
+                channels.reused += 1
+        logging.warning(f"No more free channels for {radio.name}. Reusing {channel}.")
+        return channel
 
     def alloc_uhf(self) -> RadioFrequency:
         """Allocates a UHF radio channel suitable for inter-flight comms.
 
         Returns:
             A UHF radio channel suitable for inter-flight comms.
-
-        Raises:
-            OutOfChannelsError: All channels compatible with the given radio are
-                already allocated.
         """
         return self.alloc_for_radio(self.BLUFOR_UHF)
 
@@ -354,3 +493,16 @@ def reserve(self, frequency: RadioFrequency) -> None:
         if frequency in self.allocated_channels:
             raise ChannelInUseError(frequency)
         self.allocated_channels.add(frequency)
+        self.mark_in_use(frequency, self.ranges_by_modulation[frequency.modulation])
+
+    @staticmethod
+    def mark_in_use(frequency: RadioFrequency, ranges: List[RangeChannels]) -> None:
+        hertz = frequency.hertz
+        for channels in ranges:
+            if channels.minimum <= hertz < channels.maximum:
+                channels.mark_in_use(frequency)
+
+    def channel_pressure(self) -> List[ChannelPressure]:
+        """Returns the channel use of each radio range with channels in use."""
+        pressures = [channels.pressure() for channels in self.ranges.values()]
+        return [p for p in pressures if p.in_use or p.reused]
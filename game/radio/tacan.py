@@ -4,7 +4,12 @@
 import re
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, Iterator, Set
+from typing import Dict, Iterator, List, Set
+
+from game.radio.radios import ChannelPressure
+
+
+MAX_TACAN_CHANNEL = 126
 
 
 class TacanUsage(Enum):
@@ -18,7 +23,7 @@ class TacanBand(Enum):
 
     def range(self) -> Iterator["TacanChannel"]:
         """Returns an iterator over the channels in this band."""
-        return (TacanChannel(x, self) for x in range(1, 126 + 1))
+        return (TacanChannel(x, self) for x in range(1, MAX_TACAN_CHANNEL + 1))
 
     def valid_channels(self, usage: TacanUsage) -> Iterator["TacanChannel"]:
         for x in self.range():
@@ -74,16 +79,31 @@ def __init__(self, channel: TacanChannel) -> None:
 
 
 class TacanRegistry:
-    """Manages allocation of TACAN channels."""
+    """Manages allocation of TACAN channels.
+
+    Each band and usage has a bytearray of blocked channels, indexed by channel
+    number. A channel is blocked if it is unsuitable for the usage or already
+    allocated. Allocating a channel blocks it for every usage of its band, so
+    channels allocated for air-to-air use are not reused for transmit/receive beacons
+    and vice versa.
+    """
 
     def __init__(self) -> None:
         self.allocated_channels: Set[TacanChannel] = set()
-        self.allocators: Dict[TacanBand, Dict[TacanUsage, Iterator[TacanChannel]]] = {}
+        self.blocked: Dict[TacanBand, Dict[TacanUsage, bytearray]] = {}
+        self.first_free: Dict[TacanBand, Dict[TacanUsage, int]] = {}
 
         for band in TacanBand:
-            self.allocators[band] = {}
+            self.blocked[band] = {}
+            self.first_free[band] = {}
             for usage in TacanUsage:
-                self.allocators[band][usage] = band.valid_channels(usage)
+                # Channel 0 does not exist.
+                blocked = bytearray(MAX_TACAN_CHANNEL + 1)
+                blocked[0] = 1
+                for number in UNAVAILABLE[usage][band]:
+                    blocked[number] = 1
+                self.blocked[band][usage] = blocked
+                self.first_free[band][usage] = 0
 
     def alloc_for_band(
         self, band: TacanBand, intended_usage: TacanUsage
@@ -101,13 +121,14 @@ def alloc_for_band(
             OutOfTacanChannelsError: All channels compatible with the given radio are
                 already allocated.
         """
-        allocator = self.allocators[band][intended_usage]
-        try:
-            while (channel := next(allocator)) in self.allocated_channels:
-                pass
-            return channel
-        except StopIteration:
+        blocked = self.blocked[band][intended_usage]
+        number = blocked.find(0, self.first_free[band][intended_usage])
+        if number < 0:
             raise OutOfTacanChannelsError(band)
+        self.first_free[band][intended_usage] = number
+        channel = TacanChannel(number, band)
+        self.mark_unavailable(channel)
+        return channel
 
     def mark_unavailable(self, channel: TacanChannel) -> None:
         """Reserves the given channel.
@@ -123,3 +144,22 @@ def mark_unavailable(self, channel: TacanChannel) -> None:
         if channel in self.allocated_channels:
             raise TacanChannelInUseError(channel)
         self.allocated_channels.add(channel)
+        if 0 < channel.number <= MAX_TACAN_CHANNEL:
+            for blocked in self.blocked[channel.band].values():
+                blocked[channel.number] = 1
+
+    def channel_pressure(self) -> List[ChannelPressure]:
+        """Returns the channel use of each band and usage."""
+        pressures = []
+        for band in TacanBand:
+            for usage in TacanUsage:
+                valid = [c.number for c in band.valid_channels(usage)]
+                in_use = sum(
+                    1 for n in valid if TacanChannel(n, band) in self.allocated_channels
+                )
+                pressures.append(
+                    ChannelPressure(
+                        f"TACAN {band.value} {usage.value}", len(valid), in_use
+                    )
+                )
+        return pressures
@@ -0,0 +1,167 @@
+"""Cache of parsed YAML and JSON resource files.
+
+Unit, weapon, airfield, squadron and faction data is spread across about a thousand
+small files. Parsed files are cached in a single pickle in the user's Liberation
+directory so that later runs don't need to parse them again. Each entry is keyed
+by the absolute path of the file and validated against its modification time and
+size, so only the files that changed are parsed again. The whole cache is dropped
+when the version of Liberation changes.
+
+Entries are stored as pickled bytes and unpickled for each load, so callers get
+their own copy of the data and may modify it.
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import pickle
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import yaml
+
+from game import persistency
+from game.version import VERSION
+
+RESOURCE_CACHE_FILE = "Liberation/resources.p"
+# Increment whenever the cache format changes.
+RESOURCE_CACHE_VERSION = 1
+
+# The C loader is several times faster than the pure Python loader, but is only
+# available if PyYAML was built with libyaml.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def parse_resource(path: Path) -> Any:
+    """Parses a YAML or JSON resource file without using the cache."""
+    with path.open(encoding="utf-8") as resource_file:
+        if path.suffix == ".json":
+            return json.load(resource_file)
+        return yaml.load(resource_file, Loader=_YAML_LOADER)
+
+
+def load_resource(path: Path) -> Any:
+    """Loads a YAML or JSON resource file, using the cache if it is current."""
+    return ResourceCache.get().load(path)
+
+
+@dataclass(frozen=True)
+class _CachedResource:
+    mtime_ns: int
+    size: int
+    #: The pickled data of the file.
+    data: bytes
+
+
+class ResourceCache:
+    _instance: Optional[ResourceCache] = None
+
+    def __init__(
+        self,
+        path: Optional[Path],
+        entries: dict[str, _CachedResource],
+        parse: Callable[[Path], Any] = parse_resource,
+        version: int = RESOURCE_CACHE_VERSION,
+    ) -> None:
+        #: The file the cache is saved to, or None if it is only kept in memory.
+        self.path = path
+        self.entries = entries
+        #: Creates the cached data from a file. Caches of data other than the parsed
+        #: resource files use their own parse function and version.
+        self.parse = parse
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get(cls) -> ResourceCache:
+        # Resources may be loaded before the user's directory is known. Those are
+        # cached in memory until it is.
+        path = cls.default_path()
+        if cls._instance is None or cls._instance.path != path:
+            cls._instance = cls.open(path)
+        return cls._instance
+
+    @staticmethod
+    def default_path() -> Optional[Path]:
+        if not persistency.is_set_up():
+            return None
+        return Path(persistency.base_path()) / RESOURCE_CACHE_FILE
+
+    @classmethod
+    def open(
+        cls,
+        path: Optional[Path],
+        parse: Callable[[Path], Any] = parse_resource,
+        version: int = RESOURCE_CACHE_VERSION,
+    ) -> ResourceCache:
+        """Opens the cache saved at the given path, or an empty cache."""
+        if path is None or not path.is_file():
+            return ResourceCache(path, {}, parse, version)
+        try:
+            with path.open("rb") as cache_file:
+                saved_version, entries = pickle.load(cache_file)
+            if saved_version == (version, VERSION):
+                return ResourceCache(path, entries, parse, version)
+        except Exception:
+            # The cache will be rebuilt from the resource files.
+            logging.exception(f"Ignoring unreadable resource cache {path}")
+        return ResourceCache(path, {}, parse, version)
+
+    def load(self, path: Path) -> Any:
+        key = os.path.abspath(path)
+        stat = path.stat()
+        entry = self.entries.get(key)
+        if (
+            entry is not None
+            and entry.mtime_ns == stat.st_mtime_ns
+            and entry.size == stat.st_size
+        ):
+            self.hits += 1
+            return pickle.loads(entry.data)
+
+        self.misses += 1
+        data = self.parse(path)
+        with self._lock:
+            self.entries[key] = _CachedResource(
+                stat.st_mtime_ns, stat.st_size, pickle.dumps(data, protocol=5)
+            )
+            self._dirty = True
+        return data
+
+    def save(self) -> None:
+        """Saves the cache if it has changed since it was opened."""
+        if self.path is None or not self._dirty:
+            return
+        with self._lock:
+            # Drop the entries of files that have been deleted.
+            entries = {
+                key: entry for key, entry in self.entries.items() if os.path.exists(key)
+            }
+            temp_path = self.path.with_name(f"{self.path.name}.tmp")
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with temp_path.open("wb") as cache_file:
+                    pickle.dump(
+                        ((self.version, VERSION), entries),
+                        cache_file,
+                        protocol=5,
+                    )
+                os.replace(temp_path, self.path)
+                self._dirty = False
+            except OSError as ex:
+                logging.warning(f"Could not save resource cache {self.path}: {ex}")
+            finally:
+                temp_path.unlink(missing_ok=True)
+
+
+@atexit.register
+def _save_resource_cache() -> None:
+    if ResourceCache._instance is not None:
+        ResourceCache._instance.save()
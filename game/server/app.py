@@ -4,6 +4,7 @@
 from . import (
     controlpoints,
     debuggeometries,
+    debugprofiles,
     eventstream,
     flights,
     frontlines,
@@ -11,6 +12,7 @@
     mapzones,
     navmesh,
     qt,
+    saves,
     supplyroutes,
     tgos,
     waypoints,
@@ -21,6 +23,7 @@
 app = FastAPI()
 app.include_router(controlpoints.router)
 app.include_router(debuggeometries.router)
+app.include_router(debugprofiles.router)
 app.include_router(eventstream.router)
 app.include_router(flights.router)
 app.include_router(frontlines.router)
@@ -28,6 +31,7 @@
 app.include_router(mapzones.router)
 app.include_router(navmesh.router)
 app.include_router(qt.router)
+app.include_router(saves.router)
 app.include_router(supplyroutes.router)
 app.include_router(tgos.router)
 app.include_router(waypoints.router)
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from game.profiling import ProfileSpan
+
+
+class ProfileSpanJs(BaseModel):
+    name: str
+    duration_ms: float = Field(alias="durationMs")
+    calls: int
+    counters: dict[str, int]
+    cprofile: Optional[str]
+    children: list[ProfileSpanJs]
+
+    class Config:
+        title = "ProfileSpan"
+
+    @staticmethod
+    def from_span(span: ProfileSpan) -> ProfileSpanJs:
+        return ProfileSpanJs(
+            name=span.name,
+            durationMs=span.duration.total_seconds() * 1000,
+            calls=span.calls,
+            counters=span.counters,
+            cprofile=span.cprofile,
+            children=[ProfileSpanJs.from_span(c) for c in span.children.values()],
+        )
+
+
+ProfileSpanJs.update_forward_refs()
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, HTTPException, status
+
+from game.missiongenerator import MissionGenerator
+from .models import ProfileSpanJs
+
+router: APIRouter = APIRouter(prefix="/debug/profiles")
+
+
+@router.get(
+    "/mission-generation",
+    operation_id="get_debug_mission_generation_profile",
+    response_model=ProfileSpanJs,
+)
+def mission_generation() -> ProfileSpanJs:
+    if MissionGenerator.last_profile is None:
+        raise HTTPException(
+            status.HTTP_404_NOT_FOUND, detail="No mission has been generated"
+        )
+    return ProfileSpanJs.from_span(MissionGenerator.last_profile)
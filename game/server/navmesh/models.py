@@ -2,6 +2,7 @@
 
 from typing import TYPE_CHECKING
 
+from dcs import Point
 from pydantic import BaseModel
 
 from game.server.leaflet import LeafletPoly, ShapelyUtil
@@ -27,13 +28,22 @@ class Config:
 
     @staticmethod
     def from_navmesh(navmesh: NavMesh, game: Game) -> NavMeshJs:
+        # Built directly from the navmesh arrays rather than the shapely polys. The
+        # closing vertex of each triangle is omitted since leaflet closes polygons
+        # implicitly.
+        terrain = game.theater.terrain
         return NavMeshJs(
             polys=[
                 NavMeshPolyJs(
-                    poly=ShapelyUtil.poly_to_leaflet(p.poly, game.theater),
-                    threatened=p.threatened,
+                    poly=[
+                        ShapelyUtil.latlng_to_leaflet(Point(x, y, terrain).latlng())
+                        for x, y in triangle
+                    ],
+                    threatened=threatened,
+                )
+                for triangle, threatened in zip(
+                    navmesh.data.triangles.tolist(), navmesh.data.threatened.tolist()
                 )
-                for p in navmesh.polys
             ]
         )
 
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from game.persistency import SaveInfo
+
+
+class SaveJs(BaseModel):
+    path: str
+    name: str
+    modified: datetime
+    size: int
+    turn: int | None
+    date: datetime | None
+    theater: str | None
+    player_faction: str | None
+    enemy_faction: str | None
+    player_budget: float | None
+    enemy_budget: float | None
+    player_bases: int | None
+    enemy_bases: int | None
+
+    class Config:
+        title = "Save"
+
+    @staticmethod
+    def from_save_info(info: SaveInfo) -> SaveJs:
+        header = info.header
+        return SaveJs(
+            path=str(info.path),
+            name=info.path.stem,
+            modified=info.modified,
+            size=info.size,
+            turn=None if header is None else header.turn,
+            date=None if header is None else header.date,
+            theater=None if header is None else header.theater,
+            player_faction=None if header is None else header.player_faction,
+            enemy_faction=None if header is None else header.enemy_faction,
+            player_budget=None if header is None else header.player_budget,
+            enemy_budget=None if header is None else header.enemy_budget,
+            player_bases=None if header is None else header.player_bases,
+            enemy_bases=None if header is None else header.enemy_bases,
+        )
@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from game import persistency
+from .models import SaveJs
+
+router: APIRouter = APIRouter(prefix="/saves")
+
+
+@router.get("/", operation_id="list_saves", response_model=list[SaveJs])
+def list_saves() -> list[SaveJs]:
+    return [SaveJs.from_save_info(s) for s in persistency.list_saves()]
@@ -16,7 +16,7 @@
     WaitingForStart,
 )
 from game.ato.starttype import StartType
-from .combat import CombatInitiator, FrozenCombat
+from .combat import CombatInitiator, EngagementZoneCache, FrozenCombat
 from .simulationresults import SimulationResults
 
 if TYPE_CHECKING:
@@ -30,6 +30,7 @@ def __init__(self, game: Game) -> None:
         self.game = game
         self.combats: list[FrozenCombat] = []
         self.results = SimulationResults()
+        self.engagement_zones = EngagementZoneCache(game)
 
     def begin_simulation(self) -> None:
         self.reset()
@@ -59,7 +60,9 @@ def on_game_tick(
 
         # Finish updating all flights before checking for combat so that the new
         # positions are used.
-        CombatInitiator(self.game, self.combats, events).update_active_combats()
+        CombatInitiator(
+            self.game, self.combats, events, self.engagement_zones
+        ).update_active_combats()
 
         # After updating all combat states, check for halts.
         for flight in self.iter_flights():
@@ -70,6 +73,35 @@ def on_game_tick(
         if not self.game.settings.auto_resolve_combat and self.combats:
             events.complete_simulation()
 
+    def time_until_next_event(
+        self, events: GameUpdateEvents, time: datetime, tick: timedelta
+    ) -> timedelta:
+        """Returns how far the simulation can safely advance in a single step.
+
+        The result is a multiple of tick. Advancing by the result produces the same
+        state as advancing by tick the same number of times: no flight changes state
+        before the end of the step, and no combat could have begun at any of the
+        skipped ticks.
+        """
+        remaining = [
+            r
+            for flight in self.iter_flights()
+            if (r := flight.state.time_until_transition(time)) is not None
+        ]
+        if not remaining:
+            return tick
+        # Ceiling division, in integer microseconds to avoid rounding errors.
+        ticks = max(1, -(-min(remaining) // tick))
+
+        # The last tick of the step is a normal tick, so only the skipped ticks need
+        # to be checked for contact. Halve the step until no contact is possible.
+        initiator = CombatInitiator(
+            self.game, self.combats, events, self.engagement_zones
+        )
+        while ticks > 1 and initiator.contact_possible_within((ticks - 1) * tick):
+            ticks //= 2
+        return ticks * tick
+
     def set_initial_flight_states(self) -> None:
         now = self.game.conditions.start_time
         for flight in self.iter_flights():
@@ -94,6 +126,7 @@ def set_active_flight_state(self, flight: Flight, now: datetime) -> None:
             raise ValueError(f"Unknown start type {flight.start_type} for {flight}")
 
     def reset(self) -> None:
+        self.engagement_zones.clear()
         for flight in self.iter_flights():
             flight.set_state(Uninitialized(flight, self.game.settings))
 
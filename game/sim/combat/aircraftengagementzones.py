@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from collections.abc import Iterator
-from typing import Optional, TYPE_CHECKING
+from collections.abc import Hashable, Iterator
+from typing import Optional, TYPE_CHECKING, cast
 
 from dcs import Point
-from shapely.ops import unary_union
+from shapely.geometry.base import BaseGeometry
 
+from game.threatzones import IndexedThreatZone
 from game.utils import dcs_to_shapely_point
 
 if TYPE_CHECKING:
@@ -16,44 +17,90 @@
 
 
 class AircraftEngagementZones:
+    """The air-to-air commit regions of a coalition's flights.
+
+    The zones are indexed so that flights can be removed without rebuilding the
+    index. Removals only last until the next call to reset, since they are only
+    used to prevent flights that entered combat during a tick from being involved in
+    another combat in the same tick.
+    """
+
     def __init__(self, individual_zones: dict[Flight, ThreatPoly]) -> None:
         self.individual_zones = individual_zones
-        self.threat_zones = self._make_combined_zone()
+        self._index = IndexedThreatZone(
+            {flight: [zone] for flight, zone in individual_zones.items()}
+        )
+        self._removed: set[Flight] = set()
+        # Hits for the positions checked this tick and the previous tick. Flights
+        # that haven't moved since the previous tick reuse their old result rather
+        # than querying the index again.
+        self._hits: dict[tuple[float, float], list[Hashable]] = {}
+        self._previous_hits: dict[tuple[float, float], list[Hashable]] = {}
 
     def update_for_combat(self, combat: FrozenCombat) -> None:
         for flight in combat.iter_flights():
-            try:
-                del self.individual_zones[flight]
-            except KeyError:
-                pass
-        self.threat_zones = self._make_combined_zone()
+            self.remove_flight(flight)
 
     def remove_flight(self, flight: Flight) -> None:
-        try:
-            del self.individual_zones[flight]
-        except KeyError:
-            pass
-        self.threat_zones = self._make_combined_zone()
+        self._removed.add(flight)
+
+    def reset(self) -> None:
+        """Prepares the zones for reuse in a new tick.
 
-    def _make_combined_zone(self) -> ThreatPoly:
-        return unary_union(self.individual_zones.values())
+        Restores any flights removed since the last reset.
+        """
+        self._removed.clear()
+        self._previous_hits = self._hits
+        self._hits = {}
 
     def covers(self, position: Point) -> bool:
-        return self.threat_zones.intersects(dcs_to_shapely_point(position))
+        return next(self.iter_intercepting_flights(position), None) is not None
+
+    def threatens(self, geometry: BaseGeometry) -> bool:
+        """Returns True if any commit region intersects the given geometry.
+
+        Unlike covers, this ignores whether flights have been removed.
+        """
+        return self._index.intersects(geometry)
 
     def iter_intercepting_flights(self, position: Point) -> Iterator[Flight]:
-        for flight, zone in self.individual_zones.items():
-            if zone.intersects(dcs_to_shapely_point(position)):
-                yield flight
+        for flight in self._intersecting(position):
+            if flight not in self._removed:
+                yield cast(Flight, flight)
+
+    def _intersecting(self, position: Point) -> list[Hashable]:
+        key = (position.x, position.y)
+        if (hits := self._hits.get(key)) is None:
+            if (hits := self._previous_hits.get(key)) is None:
+                hits = self._index.sources_intersecting(dcs_to_shapely_point(position))
+            self._hits[key] = hits
+        return hits
+
+    def matches(self, individual_zones: dict[Flight, ThreatPoly]) -> bool:
+        """Returns True if these zones were built from the given commit regions."""
+        if len(individual_zones) != len(self.individual_zones):
+            return False
+        for (flight, zone), (current_flight, current_zone) in zip(
+            individual_zones.items(), self.individual_zones.items()
+        ):
+            # Commit regions are created once for each flight state, so an identity
+            # check is enough to tell whether they've changed.
+            if flight is not current_flight or zone is not current_zone:
+                return False
+        return True
 
     @classmethod
     def from_ato(cls, ato: AirTaskingOrder) -> AircraftEngagementZones:
+        return AircraftEngagementZones(cls.commit_regions(ato))
+
+    @classmethod
+    def commit_regions(cls, ato: AirTaskingOrder) -> dict[Flight, ThreatPoly]:
         zones = {}
         for package in ato.packages:
             for flight in package.flights:
                 if (region := cls.commit_region(flight)) is not None:
                     zones[flight] = region
-        return AircraftEngagementZones(zones)
+        return zones
 
     @classmethod
     def commit_region(cls, flight: Flight) -> Optional[ThreatPoly]:
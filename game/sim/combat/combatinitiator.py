@@ -6,33 +6,47 @@
 from datetime import timedelta
 from typing import Optional, TYPE_CHECKING
 
+from shapely.geometry import LineString
+
+from game.utils import dcs_to_shapely_point, meters
 from .aircombat import AirCombat
-from .aircraftengagementzones import AircraftEngagementZones
 from .atip import AtIp
 from .defendingsam import DefendingSam
 from .joinablecombat import JoinableCombat
-from .samengagementzones import SamEngagementZones
 from ..gameupdateevents import GameUpdateEvents
 
 if TYPE_CHECKING:
     from game import Game
     from game.ato import Flight
+    from .aircraftengagementzones import AircraftEngagementZones
+    from .engagementzonecache import EngagementZoneCache
     from .frozencombat import FrozenCombat
+    from .samengagementzones import SamEngagementZones
 
 
 class CombatInitiator:
+    # Margin added around the track of each flight when predicting contact, so that
+    # rounding in the position estimate can't hide a contact.
+    CONTACT_TOLERANCE = meters(1)
+
     def __init__(
-        self, game: Game, combats: list[FrozenCombat], events: GameUpdateEvents
+        self,
+        game: Game,
+        combats: list[FrozenCombat],
+        events: GameUpdateEvents,
+        zones: EngagementZoneCache,
     ) -> None:
         self.game = game
         self.combats = combats
         self.events = events
+        self.zones = zones
 
     def update_active_combats(self) -> None:
-        blue_a2a = AircraftEngagementZones.from_ato(self.game.blue.ato)
-        red_a2a = AircraftEngagementZones.from_ato(self.game.red.ato)
-        blue_sam = SamEngagementZones.from_theater(self.game.theater, player=True)
-        red_sam = SamEngagementZones.from_theater(self.game.theater, player=False)
+        self.zones.update()
+        blue_a2a = self.zones.a2a_for(player=True)
+        red_a2a = self.zones.a2a_for(player=False)
+        blue_sam = self.zones.sam_for(player=True)
+        red_sam = self.zones.sam_for(player=False)
 
         # Check each vulnerable flight to see if it has initiated combat. If any flight
         # initiates combat, a single FrozenCombat will be created for all involved
@@ -112,6 +126,41 @@ def check_flight_for_new_combat(
 
         return None
 
+    def contact_possible_within(self, duration: timedelta) -> bool:
+        """Returns True if any flight might initiate combat within the given duration.
+
+        Assumes that no flight changes state within the duration, so each flight is
+        either stationary or travels in a straight line. A False result guarantees
+        that checking every tick within the duration would not have found any new
+        combat. A True result only means that combat cannot be ruled out.
+        """
+        if self.combats:
+            # Flights may join existing combats at any time.
+            return True
+
+        self.zones.update()
+        for flight in self.iter_flights():
+            state = flight.state
+            if not state.in_flight:
+                continue
+            if state.is_at_ip and not state.avoid_further_combat:
+                return True
+
+            enemy = not flight.squadron.player
+            track = LineString(
+                [
+                    dcs_to_shapely_point(state.estimate_position()),
+                    dcs_to_shapely_point(state.estimate_position_after(duration)),
+                ]
+            ).buffer(self.CONTACT_TOLERANCE.meters)
+            if state.vulnerable_to_intercept and self.zones.a2a_for(enemy).threatens(
+                track
+            ):
+                return True
+            if state.vulnerable_to_sam and self.zones.sam_for(enemy).threatens(track):
+                return True
+        return False
+
     def iter_flights(self) -> Iterator[Flight]:
         packages = itertools.chain(
             self.game.blue.ato.packages, self.game.red.ato.packages
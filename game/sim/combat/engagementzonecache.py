@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import Optional, TYPE_CHECKING
+
+from .aircraftengagementzones import AircraftEngagementZones
+from .samengagementzones import SamEngagementZones
+
+if TYPE_CHECKING:
+    from game import Game
+
+
+class EngagementZoneCache:
+    """Engagement zones that persist between simulation ticks.
+
+    Commit regions and SAM threat regions rarely change from one tick to the next, so
+    rebuilding their indexes every tick is wasted work. The zones are rebuilt only
+    when a flight gains or loses a commit region or a TGO's threat changes.
+    """
+
+    def __init__(self, game: Game) -> None:
+        self.game = game
+        self._blue_a2a: Optional[AircraftEngagementZones] = None
+        self._red_a2a: Optional[AircraftEngagementZones] = None
+        self._blue_sam: Optional[SamEngagementZones] = None
+        self._red_sam: Optional[SamEngagementZones] = None
+
+    def a2a_for(self, player: bool) -> AircraftEngagementZones:
+        zones = self._blue_a2a if player else self._red_a2a
+        assert zones is not None
+        return zones
+
+    def sam_for(self, player: bool) -> SamEngagementZones:
+        zones = self._blue_sam if player else self._red_sam
+        assert zones is not None
+        return zones
+
+    def update(self) -> None:
+        """Revalidates the cached zones against the current state of the game."""
+        self._blue_a2a = self._updated_a2a(self._blue_a2a, player=True)
+        self._red_a2a = self._updated_a2a(self._red_a2a, player=False)
+        self._blue_sam = self._updated_sam(self._blue_sam, player=True)
+        self._red_sam = self._updated_sam(self._red_sam, player=False)
+
+    def clear(self) -> None:
+        self._blue_a2a = None
+        self._red_a2a = None
+        self._blue_sam = None
+        self._red_sam = None
+
+    def _updated_a2a(
+        self, zones: Optional[AircraftEngagementZones], player: bool
+    ) -> AircraftEngagementZones:
+        regions = AircraftEngagementZones.commit_regions(
+            self.game.coalition_for(player).ato
+        )
+        if zones is None or not zones.matches(regions):
+            return AircraftEngagementZones(regions)
+        zones.reset()
+        return zones
+
+    def _updated_sam(
+        self, zones: Optional[SamEngagementZones], player: bool
+    ) -> SamEngagementZones:
+        regions = SamEngagementZones.threat_regions(self.game.theater, player)
+        if zones is None or not zones.matches(regions):
+            return SamEngagementZones(regions)
+        zones.reset()
+        return zones
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from collections.abc import Iterator
-from typing import TYPE_CHECKING
+from collections.abc import Hashable, Iterator
+from typing import TYPE_CHECKING, cast
 
 from dcs import Point
-from shapely.ops import unary_union
+from shapely.geometry.base import BaseGeometry
 
+from game.threatzones import IndexedThreatZone
 from game.utils import dcs_to_shapely_point
 
 if TYPE_CHECKING:
@@ -15,28 +16,63 @@
 
 class SamEngagementZones:
     def __init__(
-        self,
-        threat_zones: ThreatPoly,
-        individual_zones: list[tuple[TheaterGroundObject, ThreatPoly]],
+        self, individual_zones: list[tuple[TheaterGroundObject, ThreatPoly]]
     ) -> None:
-        self.threat_zones = threat_zones
         self.individual_zones = individual_zones
+        self._index = IndexedThreatZone({tgo: [zone] for tgo, zone in individual_zones})
+        # See AircraftEngagementZones.
+        self._hits: dict[tuple[float, float], list[Hashable]] = {}
+        self._previous_hits: dict[tuple[float, float], list[Hashable]] = {}
+
+    def reset(self) -> None:
+        """Prepares the zones for reuse in a new tick."""
+        self._previous_hits = self._hits
+        self._hits = {}
 
     def covers(self, position: Point) -> bool:
-        return self.threat_zones.intersects(dcs_to_shapely_point(position))
+        return bool(self._intersecting(position))
+
+    def threatens(self, geometry: BaseGeometry) -> bool:
+        return self._index.intersects(geometry)
 
     def iter_threatening_sams(self, position: Point) -> Iterator[TheaterGroundObject]:
-        for tgo, zone in self.individual_zones:
-            if zone.intersects(dcs_to_shapely_point(position)):
-                yield tgo
+        for tgo in self._intersecting(position):
+            yield cast(TheaterGroundObject, tgo)
+
+    def _intersecting(self, position: Point) -> list[Hashable]:
+        key = (position.x, position.y)
+        if (hits := self._hits.get(key)) is None:
+            if (hits := self._previous_hits.get(key)) is None:
+                hits = self._index.sources_intersecting(dcs_to_shapely_point(position))
+            self._hits[key] = hits
+        return hits
+
+    def matches(
+        self, individual_zones: list[tuple[TheaterGroundObject, ThreatPoly]]
+    ) -> bool:
+        """Returns True if these zones were built from the given threat regions."""
+        if len(individual_zones) != len(self.individual_zones):
+            return False
+        for (tgo, zone), (current_tgo, current_zone) in zip(
+            individual_zones, self.individual_zones
+        ):
+            # TGOs cache their threat poly until their units change, so an identity
+            # check is enough to tell whether they've changed.
+            if tgo is not current_tgo or zone is not current_zone:
+                return False
+        return True
 
     @classmethod
     def from_theater(cls, theater: ConflictTheater, player: bool) -> SamEngagementZones:
-        commit_regions = []
+        return SamEngagementZones(cls.threat_regions(theater, player))
+
+    @classmethod
+    def threat_regions(
+        cls, theater: ConflictTheater, player: bool
+    ) -> list[tuple[TheaterGroundObject, ThreatPoly]]:
         individual_zones = []
         for cp in theater.control_points_for(player):
             for tgo in cp.connected_objectives:
                 if (region := tgo.threat_poly()) is not None:
-                    commit_regions.append(region)
                     individual_zones.append((tgo, region))
-        return SamEngagementZones(unary_union(commit_regions), individual_zones)
+        return individual_zones
@@ -52,13 +52,18 @@ def set_simulation_speed(self, simulation_speed: SimSpeedSetting) -> None:
             self.start()
         self.timer.set_speed(simulation_speed)
 
-    def run_to_first_contact(self) -> None:
+    def run_to_first_contact(self, fast_forward: bool = True) -> None:
+        """Runs the simulation until it halts.
+
+        With fast_forward, ticks at which nothing can happen are skipped. The result
+        is the same either way.
+        """
         self.pause()
         if not self.started:
             self.start()
         logging.info("Running sim to first contact")
         while not self.completed:
-            self.tick(suppress_events=True)
+            self.tick(suppress_events=True, fast_forward=fast_forward)
 
     def pause_and_generate_miz(self, output: Path) -> None:
         self.pause()
@@ -89,11 +94,14 @@ def send_update(self, rate_limit: bool) -> None:
             self.events = GameUpdateEvents()
             self.last_update_time = now
 
-    def tick(self, suppress_events: bool = False) -> None:
+    def tick(self, suppress_events: bool = False, fast_forward: bool = False) -> None:
         if not self.started:
             raise RuntimeError("Attempted to tick game loop before initialization")
         try:
-            self.sim.tick(self.events)
+            if fast_forward:
+                self.sim.fast_forward(self.events)
+            else:
+                self.sim.tick(self.events)
             self.completed = self.events.simulation_complete
             if not suppress_events:
                 self.send_update(rate_limit=True)
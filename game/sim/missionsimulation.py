@@ -45,6 +45,22 @@ def tick(self, events: GameUpdateEvents) -> GameUpdateEvents:
         self.completed = events.simulation_complete
         return events
 
+    def fast_forward(self, events: GameUpdateEvents) -> GameUpdateEvents:
+        """Advances the simulation to the next tick at which anything can happen.
+
+        The result is the same as calling tick repeatedly, but ticks at which nothing
+        could change state are skipped.
+        """
+        if self.completed:
+            raise SimulationAlreadyCompletedError
+        duration = self.aircraft_simulation.time_until_next_event(
+            events, self.time, TICK
+        )
+        self.time += duration
+        self.aircraft_simulation.on_game_tick(events, self.time, duration)
+        self.completed = events.simulation_complete
+        return events
+
     def generate_miz(self, output: Path) -> None:
         with logged_duration("Mission generation"):
             self.unit_map = MissionGenerator(self.game, self.time).generate_miz(output)
@@ -6,9 +6,8 @@
 from pathlib import Path
 from typing import Optional, TYPE_CHECKING
 
-import yaml
-
 from game.dcs.aircrafttype import AircraftType
+from game.resourcecache import load_resource
 from game.squadrons.operatingbases import OperatingBases
 from game.squadrons.pilot import Pilot
 
@@ -65,8 +64,7 @@ def from_yaml(cls, path: Path) -> SquadronDef:
         from game.ato.ai_flight_planner_db import tasks_for_aircraft
         from game.ato import FlightType
 
-        with path.open(encoding="utf8") as squadron_file:
-            data = yaml.safe_load(squadron_file)
+        data = load_resource(path)
 
         name = data["aircraft"]
         try:
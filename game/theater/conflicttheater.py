@@ -23,7 +23,7 @@
 from .daytimemap import DaytimeMap
 from .frontline import FrontLine
 from .iadsnetwork.iadsnetwork import IadsNetwork
-from .landmap import Landmap, load_landmap, poly_contains
+from .landmap import Landmap, PointClass, load_landmap
 from .seasonalconditions import SeasonalConditions
 from ..utils import Heading
 
@@ -71,36 +71,12 @@ def find_ground_objects_by_obj_name(
     def is_in_sea(self, point: Point) -> bool:
         if not self.landmap:
             return False
-
-        if self.is_on_land(point):
-            return False
-
-        for exclusion_zone in self.landmap.exclusion_zones.geoms:
-            if poly_contains(point.x, point.y, exclusion_zone):
-                return False
-
-        for sea in self.landmap.sea_zones.geoms:
-            if poly_contains(point.x, point.y, sea):
-                return True
-
-        return False
+        return self.landmap.classify_point(point.x, point.y) is PointClass.SEA
 
     def is_on_land(self, point: Point) -> bool:
         if not self.landmap:
             return True
-
-        is_point_included = False
-        if poly_contains(point.x, point.y, self.landmap.inclusion_zones):
-            is_point_included = True
-
-        if not is_point_included:
-            return False
-
-        for exclusion_zone in self.landmap.exclusion_zones.geoms:
-            if poly_contains(point.x, point.y, exclusion_zone):
-                return False
-
-        return True
+        return self.landmap.classify_point(point.x, point.y) is PointClass.LAND
 
     def nearest_land_pos(self, near: Point, extend_dist: int = 50) -> Point:
         """Returns the nearest point inside a land exclusion zone from point
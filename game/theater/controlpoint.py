@@ -917,6 +917,8 @@ def process_turn(self, game: Game) -> None:
                             u.position.x = u.position.x + delta.x
                             u.position.y = u.position.y + delta.y
 
+            ObjectiveDistanceCache.control_point_moved(self)
+
     def allocated_aircraft(self) -> AircraftAllocations:
         present: dict[AircraftType, int] = defaultdict(int)
         on_order: dict[AircraftType, int] = defaultdict(int)
@@ -3,9 +3,13 @@
 from dataclasses import dataclass, field
 
 import logging
-from typing import TYPE_CHECKING, Iterator, Optional
+from typing import Any, TYPE_CHECKING, Iterator, Optional
 from uuid import UUID
 import uuid
+
+from shapely.geometry import Point as ShapelyPoint, box
+from shapely.strtree import STRtree
+
 from game.theater.iadsnetwork.iadsrole import IadsRole
 from game.dcs.groundunittype import GroundUnitType
 from game.theater.theatergroundobject import (
@@ -112,11 +116,63 @@ def __init__(
             else:
                 raise RuntimeError("Invalid iads_config in campaign")
 
+        self._build_indexes()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        # The indexes are derived from the nodes and rebuilt on load.
+        for key in (
+            "_nodes_by_group",
+            "_nodes_by_tgo",
+            "_dependents",
+            "_connection_tree",
+        ):
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._build_indexes()
+
+    def _build_indexes(self) -> None:
+        #: The node of each primary group, by group ID. Groups are dataclasses, so they
+        #: are not hashable.
+        self._nodes_by_group: dict[int, IadsNetworkNode] = {}
+        #: The node of each participating TGO.
+        self._nodes_by_tgo: dict[TheaterGroundObject, IadsNetworkNode] = {}
+        #: The nodes with connections to each TGO, other than the TGO's own node.
+        self._dependents: dict[TheaterGroundObject, set[IadsNetworkNode]] = defaultdict(
+            set
+        )
+        #: Power sources and connection nodes for range based networks, built on first
+        #: use.
+        self._connection_tree: Optional[
+            tuple[Optional[STRtree], list[TheaterGroundObject]]
+        ] = None
+        for node in self.nodes:
+            self._index_node(node)
+            tgo = node.group.ground_object
+            for group in node.connections.values():
+                if group.ground_object is not tgo:
+                    self._dependents[group.ground_object].add(node)
+
+    def _index_node(self, node: IadsNetworkNode) -> None:
+        self._nodes_by_group[node.group.id] = node
+        self._nodes_by_tgo.setdefault(node.group.ground_object, node)
+
     def skynet_nodes(self, game: Game) -> list[SkynetNode]:
         """Get all skynet nodes from the IADS Network"""
         skynet_nodes: list[SkynetNode] = []
+        culled = game.culled_ground_objects(
+            {node.group.ground_object for node in self.nodes}
+            | {
+                connection.ground_object
+                for node in self.nodes
+                for connection in node.connections.values()
+            }
+        )
         for node in self.nodes:
-            if game.iads_considerate_culling(node.group.ground_object):
+            if node.group.ground_object in culled:
                 # Skip culled ground objects
                 continue
 
@@ -132,9 +188,10 @@ def skynet_nodes(self, game: Game) -> list[SkynetNode]:
             # but if it does, we want to know because it's supposed to be impossible afaict
             skynet_node = SkynetNode.from_group(node.group)
             for connection in node.connections.values():
-                if connection.ground_object.is_friendly(
-                    skynet_node.player
-                ) and not game.iads_considerate_culling(connection.ground_object):
+                if (
+                    connection.ground_object.is_friendly(skynet_node.player)
+                    and connection.ground_object not in culled
+                ):
                     skynet_node.connections[connection.iads_role.value].append(
                         SkynetNode.dcs_name_for_group(connection)
                     )
@@ -142,36 +199,74 @@ def skynet_nodes(self, game: Game) -> list[SkynetNode]:
         return skynet_nodes
 
     def update_tgo(self, tgo: TheaterGroundObject, events: GameUpdateEvents) -> None:
-        """Update the IADS Network for the given TGO"""
-        # Remove existing nodes for the given tgo
-        for cn in self.nodes:
-            if cn.group.ground_object == tgo:
-                self.nodes.remove(cn)
-                for cID in cn.connections:
+        """Update the IADS Network for the given TGO
+
+        Only the node of the TGO and the nodes connected to it are rebuilt, and only
+        those are reported in the events.
+        """
+        # Remove the existing node for the given tgo
+        old_node = self._nodes_by_tgo.pop(tgo, None)
+        if old_node is not None:
+            self.nodes.remove(old_node)
+            del self._nodes_by_group[old_node.group.id]
+            for cID, group in old_node.connections.items():
+                events.delete_iads_connection(cID)
+                if group.ground_object is not tgo:
+                    self._dependents[group.ground_object].discard(old_node)
+
+        # Nodes connected to the TGO may reference groups that it no longer has.
+        for dependent in self._dependents.get(tgo, set()):
+            for cID, group in list(dependent.connections.items()):
+                if group.ground_object is tgo:
+                    del dependent.connections[cID]
                     events.delete_iads_connection(cID)
+            dependent.add_connection_for_tgo(tgo)
+            events.update_iads_node(dependent)
 
         node = self.node_for_tgo(tgo)
         if node is None:
             # Not participating
             return
-        # TODO Add the connections or calculate them..
+        self._add_connections(node)
         events.update_iads_node(node)
 
+    def _connect(self, node: IadsNetworkNode, tgo: TheaterGroundObject) -> None:
+        node.add_connection_for_tgo(tgo)
+        self._dependents[tgo].add(node)
+
+    def _add_connections(self, node: IadsNetworkNode) -> None:
+        """Add the connections of the node for the current network mode"""
+        if not self.advanced_iads:
+            return
+        tgo = node.group.ground_object
+        if self.iads_config:
+            for node_name in self.iads_config.get(tgo.original_name, []):
+                try:
+                    self._connect(node, self.ground_objects[node_name])
+                except KeyError:
+                    logging.error(
+                        f"IADS: No ground object found for connection {node_name}"
+                    )
+        elif self._participates_by_range(tgo):
+            for nearby_go in self._nearby_connections(tgo):
+                self._connect(node, nearby_go)
+
     def node_for_group(self, group: IadsGroundGroup) -> IadsNetworkNode:
         """Get existing node from the iads network or create a new node"""
-        for cn in self.nodes:
-            if cn.group == group:
-                return cn
+        node = self._nodes_by_group.get(group.id)
+        if node is not None:
+            return node
 
         node = IadsNetworkNode(group)
         self.nodes.append(node)
+        self._index_node(node)
         return node
 
     def node_for_tgo(self, tgo: TheaterGroundObject) -> Optional[IadsNetworkNode]:
         """Get existing node from the iads network or create a new node"""
-        for cn in self.nodes:
-            if cn.group.ground_object == tgo:
-                return cn
+        existing = self._nodes_by_tgo.get(tgo)
+        if existing is not None:
+            return existing
 
         # Create new connection_node if none exists
         node: Optional[IadsNetworkNode] = None
@@ -236,42 +331,62 @@ def initialize_network_from_config(self) -> None:
                 continue
 
             # Find all connected ground_objects
-            for node_name in connections:
-                try:
-                    node.add_connection_for_tgo(self.ground_objects[node_name])
-                except KeyError:
-                    logging.error(
-                        f"IADS: No ground object found for connection {node_name}"
-                    )
-                    continue
+            self._add_connections(node)
+
+    @staticmethod
+    def _participates_by_range(go: TheaterGroundObject) -> bool:
+        return (
+            isinstance(go, IadsGroundObject)
+            or isinstance(go, NavalGroundObject)
+            or (
+                isinstance(go, IadsBuildingGroundObject)
+                and IadsRole.for_category(go.category) == IadsRole.COMMAND_CENTER
+            )
+        )
+
+    def _nearby_connections(
+        self, go: TheaterGroundObject
+    ) -> Iterator[TheaterGroundObject]:
+        """Iterates over the power sources and connection nodes in range of the TGO
+
+        Each power source or connection node has its own connection range.
+        """
+        if self._connection_tree is None:
+            candidates = [
+                nearby_go
+                for nearby_go in self.ground_objects.values()
+                if IadsRole.for_category(nearby_go.category).connection_range.meters > 0
+            ]
+            boxes = []
+            for candidate in candidates:
+                x, y = candidate.position.x, candidate.position.y
+                r = IadsRole.for_category(candidate.category).connection_range.meters
+                boxes.append(box(x - r, y - r, x + r, y + r))
+            self._connection_tree = (STRtree(boxes) if boxes else None, candidates)
+        tree, candidates = self._connection_tree
+        if tree is None:
+            return
+        position = ShapelyPoint(go.position.x, go.position.y)
+        # Keep the order of ground_objects so connections are deterministic.
+        for idx in sorted(tree.query_items(position)):
+            nearby_go = candidates[idx]
+            if nearby_go is go:
+                continue
+            role = IadsRole.for_category(nearby_go.category)
+            if (
+                nearby_go.position.distance_to_point(go.position)
+                <= role.connection_range.meters
+            ):
+                yield nearby_go
 
     def initialize_network_from_range(self) -> None:
         """Initialize the IADS Network by range"""
         for go in self.ground_objects.values():
-            if (
-                isinstance(go, IadsGroundObject)
-                or isinstance(go, NavalGroundObject)
-                or (
-                    isinstance(go, IadsBuildingGroundObject)
-                    and IadsRole.for_category(go.category) == IadsRole.COMMAND_CENTER
-                )
-            ):
+            if self._participates_by_range(go):
                 # Set as primary node
                 node = self.node_for_tgo(go)
                 if node is None:
                     # TGO does not participate to iads network
                     continue
                 # Find nearby Power or Connection
-                for nearby_go in self.ground_objects.values():
-                    if nearby_go == go:
-                        continue
-                    if (
-                        IadsRole.for_category(go.category)
-                        in [
-                            IadsRole.POWER_SOURCE,
-                            IadsRole.CONNECTION_NODE,
-                        ]
-                        and nearby_go.position.distance_to_point(go.position)
-                        <= node.group.iads_role.connection_range.meters
-                    ):
-                        node.add_connection_for_tgo(nearby_go)
+                self._add_connections(node)
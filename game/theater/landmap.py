@@ -1,12 +1,211 @@
-from dataclasses import dataclass
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from enum import IntEnum
+import hashlib
 import pickle
 from functools import cached_property
-from typing import Optional, Tuple, Union
+from typing import Iterator, Optional
 import logging
+import math
 from pathlib import Path
 
+import numpy as np
+from numpy.typing import ArrayLike
 from shapely import geometry
-from shapely.geometry import MultiPolygon, Polygon
+from shapely.geometry import MultiPolygon
+from shapely.prepared import PreparedGeometry, prep
+
+from game.profiling import logged_duration
+
+# Increment whenever the grid format or the classification rules change.
+LANDMAP_GRID_VERSION = 1
+LANDMAP_GRID_CELL_SIZE = 1000.0
+
+
+class PointClass(IntEnum):
+    #: Neither land nor sea. Exclusion zones and anything outside of every zone.
+    OTHER = 0
+    LAND = 1
+    SEA = 2
+
+
+# Grid value for cells crossed by a zone boundary, which need an exact test.
+MIXED = -1
+
+
+@dataclass(frozen=True)
+class LandmapGrid:
+    """A coarse raster of a landmap.
+
+    Each cell holds the PointClass shared by every point in the cell, or MIXED if a
+    zone boundary passes through it. The grid covers the bounds of all zones, so
+    points outside of the grid are PointClass.OTHER.
+    """
+
+    key: str
+    origin_x: float
+    origin_y: float
+    cell_size: float
+    #: Cell values indexed by [x cell, y cell].
+    cells: np.ndarray
+
+    def lookup(self, x: float, y: float) -> int:
+        i = math.floor((x - self.origin_x) / self.cell_size)
+        j = math.floor((y - self.origin_y) / self.cell_size)
+        nx, ny = self.cells.shape
+        if 0 <= i < nx and 0 <= j < ny:
+            return int(self.cells[i, j])
+        return PointClass.OTHER
+
+    def lookup_points(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        i = np.floor((xs - self.origin_x) / self.cell_size)
+        j = np.floor((ys - self.origin_y) / self.cell_size)
+        nx, ny = self.cells.shape
+        in_grid = (i >= 0) & (i < nx) & (j >= 0) & (j < ny)
+        result = np.full(xs.shape, PointClass.OTHER, dtype=np.int8)
+        result[in_grid] = self.cells[
+            i[in_grid].astype(np.intp), j[in_grid].astype(np.intp)
+        ]
+        return result
+
+    @classmethod
+    def build(cls, landmap: Landmap, key: str, cell_size: float) -> LandmapGrid:
+        zones = (landmap.inclusion_zones, landmap.exclusion_zones, landmap.sea_zones)
+        bounds = [zone.bounds for zone in zones if not zone.is_empty]
+        origin_x = min(b[0] for b in bounds)
+        origin_y = min(b[1] for b in bounds)
+        shape = (
+            math.floor((max(b[2] for b in bounds) - origin_x) / cell_size) + 1,
+            math.floor((max(b[3] for b in bounds) - origin_y) / cell_size) + 1,
+        )
+
+        def to_grid(rings: Iterator[np.ndarray]) -> Iterator[np.ndarray]:
+            for ring in rings:
+                yield (ring - (origin_x, origin_y)) / cell_size
+
+        included, excluded, sea = (
+            _rasterize(list(to_grid(_rings(zone))), shape) for zone in zones
+        )
+        cells = np.full(shape, PointClass.OTHER, dtype=np.int8)
+        cells[~excluded & sea] = PointClass.SEA
+        cells[~excluded & included] = PointClass.LAND
+        boundaries = [ring for zone in zones for ring in to_grid(_rings(zone))]
+        cells[_boundary_cells(boundaries, shape)] = MIXED
+        return LandmapGrid(key, origin_x, origin_y, cell_size, cells)
+
+    @classmethod
+    def load(cls, path: Path, key: str, cell_size: float) -> Optional[LandmapGrid]:
+        """Loads a cached grid, or returns None if it's missing or out of date."""
+        if not path.is_file():
+            return None
+        try:
+            with np.load(path) as data:
+                if (
+                    int(data["version"]) != LANDMAP_GRID_VERSION
+                    or str(data["key"]) != key
+                    or float(data["cell_size"]) != cell_size
+                ):
+                    return None
+                origin_x, origin_y = data["origin"].tolist()
+                return LandmapGrid(key, origin_x, origin_y, cell_size, data["cells"])
+        except Exception:
+            logging.exception(f"Failed to load landmap grid {path}")
+            return None
+
+    def save(self, path: Path) -> None:
+        with path.open("wb") as f:
+            np.savez_compressed(
+                f,
+                version=LANDMAP_GRID_VERSION,
+                key=self.key,
+                cell_size=self.cell_size,
+                origin=np.array([self.origin_x, self.origin_y]),
+                cells=self.cells,
+            )
+
+
+def _rings(zone: MultiPolygon) -> Iterator[np.ndarray]:
+    for polygon in zone.geoms:
+        yield np.asarray(polygon.exterior.coords)[:, :2]
+        for interior in polygon.interiors:
+            yield np.asarray(interior.coords)[:, :2]
+
+
+def _rasterize(rings: list[np.ndarray], shape: tuple[int, int]) -> np.ndarray:
+    """Returns which cell centers are inside the rings, by even-odd scanlines.
+
+    Ring coordinates are in cell units, so the center of cell (i, j) is at
+    (i + 0.5, j + 0.5).
+    """
+    nx, ny = shape
+    inside = np.zeros(shape, dtype=bool)
+    if not rings:
+        return inside
+    starts = np.concatenate([ring[:-1] for ring in rings]) - 0.5
+    ends = np.concatenate([ring[1:] for ring in rings]) - 0.5
+    x1, y1 = starts.T
+    x2, y2 = ends.T
+
+    # Each edge crosses the scanlines j with min(y1, y2) <= j < max(y1, y2).
+    low = np.clip(np.ceil(np.minimum(y1, y2)), 0, ny).astype(np.intp)
+    high = np.clip(np.ceil(np.maximum(y1, y2)), 0, ny).astype(np.intp)
+    counts = high - low
+    edges = np.repeat(np.arange(len(counts)), counts)
+    rows = (
+        np.arange(counts.sum())
+        - np.repeat(np.cumsum(counts) - counts, counts)
+        + low[edges]
+    )
+    crossings = x1[edges] + (rows - y1[edges]) * (x2[edges] - x1[edges]) / (
+        y2[edges] - y1[edges]
+    )
+
+    order = np.lexsort((crossings, rows))
+    rows = rows[order]
+    crossings = crossings[order]
+    row_starts = np.searchsorted(rows, np.arange(ny + 1))
+    centers = np.arange(nx)
+    for j in range(ny):
+        row = crossings[row_starts[j] : row_starts[j + 1]]
+        if len(row):
+            inside[:, j] = np.searchsorted(row, centers) % 2 == 1
+    return inside
+
+
+def _boundary_cells(rings: list[np.ndarray], shape: tuple[int, int]) -> np.ndarray:
+    """Returns which cells the rings pass through, conservatively.
+
+    Ring coordinates are in cell units. Each edge is sampled at most half a cell
+    apart, so every cell an edge passes through is the cell of a sample or one of its
+    neighbors.
+    """
+    nx, ny = shape
+    sampled = np.zeros(shape, dtype=bool)
+    for ring in rings:
+        starts = ring[:-1]
+        deltas = ring[1:] - starts
+        steps = np.maximum(np.ceil(np.hypot(deltas[:, 0], deltas[:, 1]) * 2), 1).astype(
+            np.intp
+        )
+        edges = np.repeat(np.arange(len(steps)), steps)
+        fractions = (
+            np.arange(steps.sum()) - np.repeat(np.cumsum(steps) - steps, steps)
+        ) / steps[edges]
+        samples = np.vstack(
+            [starts[edges] + fractions[:, np.newaxis] * deltas[edges], ring[-1:]]
+        )
+        i = np.clip(np.floor(samples[:, 0]), 0, nx - 1).astype(np.intp)
+        j = np.clip(np.floor(samples[:, 1]), 0, ny - 1).astype(np.intp)
+        sampled[i, j] = True
+
+    boundary = sampled.copy()
+    boundary[1:, :] |= sampled[:-1, :]
+    boundary[:-1, :] |= sampled[1:, :]
+    dilated = boundary.copy()
+    dilated[:, 1:] |= boundary[:, :-1]
+    dilated[:, :-1] |= boundary[:, 1:]
+    return dilated
 
 
 @dataclass(frozen=True)
@@ -14,6 +213,8 @@ class Landmap:
     inclusion_zones: MultiPolygon
     exclusion_zones: MultiPolygon
     sea_zones: MultiPolygon
+    #: Set by load_landmap. Not part of the landmap pickle.
+    grid: Optional[LandmapGrid] = field(default=None, compare=False, repr=False)
 
     def __post_init__(self) -> None:
         if not self.inclusion_zones.is_valid:
@@ -27,15 +228,76 @@ def __post_init__(self) -> None:
     def inclusion_zone_only(self) -> MultiPolygon:
         return self.inclusion_zones - self.exclusion_zones - self.sea_zones
 
+    @cached_property
+    def prepared_inclusion_zones(self) -> PreparedGeometry:
+        return prep(self.inclusion_zones)
+
+    @cached_property
+    def prepared_exclusion_zones(self) -> PreparedGeometry:
+        return prep(self.exclusion_zones)
+
+    @cached_property
+    def prepared_sea_zones(self) -> PreparedGeometry:
+        return prep(self.sea_zones)
+
+    def classify_point(self, x: float, y: float) -> PointClass:
+        if self.grid is not None:
+            point_class = self.grid.lookup(x, y)
+            if point_class != MIXED:
+                return PointClass(point_class)
+        return self._classify_exact(x, y)
+
+    def classify_points(self, xs: ArrayLike, ys: ArrayLike) -> np.ndarray:
+        """Classifies many points at once.
+
+        Returns an int8 array of PointClass values with the shape of the inputs. Only
+        the points in grid cells crossed by a zone boundary are tested against the
+        zones themselves.
+        """
+        x_array = np.asarray(xs, dtype=float)
+        y_array = np.asarray(ys, dtype=float)
+        if self.grid is None:
+            result = np.full(x_array.shape, MIXED, dtype=np.int8)
+        else:
+            result = self.grid.lookup_points(x_array, y_array)
+        flat_result = result.reshape(-1)
+        flat_x = x_array.reshape(-1)
+        flat_y = y_array.reshape(-1)
+        for index in np.flatnonzero(flat_result == MIXED):
+            flat_result[index] = self._classify_exact(flat_x[index], flat_y[index])
+        return result
+
+    def _classify_exact(self, x: float, y: float) -> PointClass:
+        point = geometry.Point(x, y)
+        if self.prepared_exclusion_zones.contains(point):
+            return PointClass.OTHER
+        if self.prepared_inclusion_zones.contains(point):
+            return PointClass.LAND
+        if self.prepared_sea_zones.contains(point):
+            return PointClass.SEA
+        return PointClass.OTHER
+
 
 def load_landmap(filename: Path) -> Optional[Landmap]:
     try:
         with open(filename, "rb") as f:
-            return pickle.load(f)
+            data = f.read()
+        landmap = pickle.loads(data)
     except:
         logging.exception(f"Failed to load landmap {filename}")
         return None
 
-
-def poly_contains(x: float, y: float, poly: Union[MultiPolygon, Polygon]) -> bool:
-    return poly.contains(geometry.Point(x, y))
+    # The grid is cached next to the landmap and rebuilt whenever the landmap
+    # changes.
+    key = hashlib.sha256(data).hexdigest()
+    grid_path = filename.with_suffix(".grid.npz")
+    grid = LandmapGrid.load(grid_path, key, LANDMAP_GRID_CELL_SIZE)
+    if grid is None:
+        with logged_duration(f"Building landmap grid for {filename}"):
+            grid = LandmapGrid.build(landmap, key, LANDMAP_GRID_CELL_SIZE)
+        try:
+            grid.save(grid_path)
+        except OSError as ex:
+            logging.warning(f"Could not save landmap grid {grid_path}: {ex}")
+    object.__setattr__(landmap, "grid", grid)
+    return landmap
@@ -5,7 +5,10 @@
 from collections import defaultdict
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import Dict, Iterator, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from shapely.geometry import MultiPoint
+from shapely.ops import triangulate
 
 from .conflicttheater import ConflictTheater
 from .controlpoint import ControlPoint
@@ -45,11 +48,47 @@ class TransitConnection(Enum):
     Airlift = auto()
 
 
+@dataclass(frozen=True)
+class ShortestPathTree:
+    """The shortest paths from a single origin to every reachable control point."""
+
+    origin: ControlPoint
+    costs: Dict[ControlPoint, float]
+    came_from: Dict[ControlPoint, Optional[ControlPoint]]
+
+
 class TransitNetwork:
+    """The network of transit links between friendly control points.
+
+    Shortest paths and connectivity are precomputed by compute_routes (called by
+    TransitNetworkBuilder) so that routing queries are lookups proportional to the
+    length of the path. Any trees that have not been computed (or that were
+    invalidated by adding a link) are computed on demand.
+    """
+
     def __init__(self) -> None:
         self.nodes: Dict[
             ControlPoint, Dict[ControlPoint, TransitConnection]
         ] = defaultdict(dict)
+        # Control points that can send and receive airlift. When the network is built
+        # with sparse airlift links, airports may be able to airlift between each
+        # other without being directly linked.
+        self.airports: Set[ControlPoint] = set()
+        self._trees: Dict[ControlPoint, ShortestPathTree] = {}
+        self._components: Optional[Dict[ControlPoint, int]] = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        # The routes are cheap to recompute and would bloat the save.
+        del state["_trees"]
+        del state["_components"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        state.setdefault("airports", set())
+        self.__dict__.update(state)
+        self._trees = {}
+        self._components = None
 
     def has_destinations(self, control_point: ControlPoint) -> bool:
         return bool(self.nodes[control_point])
@@ -65,6 +104,8 @@ def link_with(
     ) -> None:
         self.nodes[a][b] = link_type
         self.nodes[b][a] = link_type
+        self._trees.clear()
+        self._components = None
 
     def link_road(self, a: ControlPoint, b: ControlPoint) -> None:
         self.link_with(a, b, TransitConnection.Road)
@@ -75,6 +116,12 @@ def link_shipping(self, a: ControlPoint, b: ControlPoint) -> None:
     def link_airport(self, a: ControlPoint, b: ControlPoint) -> None:
         self.link_with(a, b, TransitConnection.Airlift)
 
+    def add_airport(self, control_point: ControlPoint) -> None:
+        self.airports.add(control_point)
+
+    def can_airlift_between(self, a: ControlPoint, b: ControlPoint) -> bool:
+        return a != b and a in self.airports and b in self.airports
+
     def connections_from(self, control_point: ControlPoint) -> Iterator[ControlPoint]:
         yield from self.nodes[control_point]
 
@@ -85,26 +132,25 @@ def cost(self, a: ControlPoint, b: ControlPoint) -> float:
             # Set arbitrarily high so that other methods are preferred, but still scaled
             # by distance so that when we do need it we still pick the closest airfield.
             # The units of distance are meters so there's no risk of these
-            TransitConnection.Airlift: a.position.distance_to_point(b.position),
+            TransitConnection.Airlift: self.airlift_cost(a, b),
         }[self.link_type(a, b)]
 
-    def has_path_between(
-        self,
-        origin: ControlPoint,
-        destination: ControlPoint,
-        seen: Optional[set[ControlPoint]] = None,
-    ) -> bool:
-        if seen is None:
-            seen = set()
-        seen.add(origin)
-        for connection in self.connections_from(origin):
-            if connection in seen:
-                continue
-            if connection == destination:
-                return True
-            if self.has_path_between(connection, destination, seen):
-                return True
-        return False
+    @staticmethod
+    def airlift_cost(a: ControlPoint, b: ControlPoint) -> float:
+        return a.position.distance_to_point(b.position)
+
+    def compute_routes(self) -> None:
+        """Precomputes the shortest paths between all nodes and the components."""
+        for node in list(self.nodes):
+            self.shortest_path_tree(node)
+        self._connected_components()
+
+    def has_path_between(self, origin: ControlPoint, destination: ControlPoint) -> bool:
+        if origin == destination:
+            return False
+        components = self._connected_components()
+        component = components.get(origin)
+        return component is not None and component == components.get(destination)
 
     def shortest_path_between(
         self, origin: ControlPoint, destination: ControlPoint
@@ -119,6 +165,27 @@ def shortest_path_with_cost(
         if destination not in self.nodes:
             raise ValueError(f"{destination} is not in the transit network.")
 
+        tree = self.shortest_path_tree(origin)
+
+        # Reconstruct and reverse the path.
+        current = destination
+        path: List[ControlPoint] = []
+        while current != origin:
+            path.append(current)
+            previous = tree.came_from.get(current)
+            if previous is None:
+                raise NoPathError(origin, destination)
+            current = previous
+        path.reverse()
+        return path, tree.costs.get(destination, math.inf)
+
+    def shortest_path_tree(self, origin: ControlPoint) -> ShortestPathTree:
+        if (tree := self._trees.get(origin)) is None:
+            tree = self._dijkstra(origin)
+            self._trees[origin] = tree
+        return tree
+
+    def _dijkstra(self, origin: ControlPoint) -> ShortestPathTree:
         frontier = Frontier()
         frontier.push(origin, 0)
 
@@ -139,22 +206,30 @@ def shortest_path_with_cost(
                     best_known[neighbor] = new_cost
                     frontier.push(neighbor, new_cost)
                     came_from[neighbor] = current
-
-        # Reconstruct and reverse the path.
-        current = destination
-        path: List[ControlPoint] = []
-        while current != origin:
-            path.append(current)
-            previous = came_from.get(current)
-            if previous is None:
-                raise NoPathError(origin, destination)
-            current = previous
-        path.reverse()
-        return path, best_known[destination]
+        return ShortestPathTree(origin, dict(best_known), came_from)
+
+    def _connected_components(self) -> Dict[ControlPoint, int]:
+        if self._components is not None:
+            return self._components
+        components: Dict[ControlPoint, int] = {}
+        for index, start in enumerate(list(self.nodes)):
+            if start in components:
+                continue
+            components[start] = index
+            pending = [start]
+            while pending:
+                for connection in self.nodes[pending.pop()]:
+                    if connection not in components:
+                        components[connection] = index
+                        pending.append(connection)
+        self._components = components
+        return components
 
 
 class TransitNetworkBuilder:
-    def __init__(self, theater: ConflictTheater, for_player: bool) -> None:
+    def __init__(
+        self, theater: ConflictTheater, for_player: bool, sparse_airlift: bool = True
+    ) -> None:
         self.control_points = list(theater.control_points_for(for_player))
         self.network = TransitNetwork()
         self.airports: Set[ControlPoint] = {
@@ -162,6 +237,7 @@ def __init__(self, theater: ConflictTheater, for_player: bool) -> None:
             for cp in self.control_points
             if cp.is_friendly(for_player) and cp.runway_is_operational()
         }
+        self.sparse_airlift = sparse_airlift
 
     def build(self) -> TransitNetwork:
         seen = set()
@@ -169,6 +245,20 @@ def build(self) -> TransitNetwork:
             if control_point not in seen:
                 seen.add(control_point)
                 self.add_transit_links(control_point)
+
+        # Airlift links are added only once all road and sea links exist so that
+        # they never take the place of a road or sea link.
+        airports = [cp for cp in self.control_points if cp in self.airports]
+        for airport in airports:
+            self.network.add_airport(airport)
+        if self.sparse_airlift:
+            self.add_sparse_airlift_links(airports)
+        else:
+            for airport in airports:
+                for other in airports:
+                    self.link_airports(airport, other)
+
+        self.network.compute_routes()
         return self.network
 
     def add_transit_links(self, control_point: ControlPoint) -> None:
@@ -184,13 +274,43 @@ def add_transit_links(self, control_point: ControlPoint) -> None:
             if sea_connection.is_friendly_to(control_point):
                 self.network.link_shipping(control_point, sea_connection)
 
-        # And use airports as a last resort.
-        if control_point in self.airports:
-            for airport in self.airports:
-                if control_point == airport:
-                    continue
-                if self.network.has_link(control_point, airport):
-                    continue
-                if not airport.is_friendly_to(control_point):
+    def link_airports(self, a: ControlPoint, b: ControlPoint) -> None:
+        # Airports are used as a last resort.
+        if a == b or self.network.has_link(a, b) or not b.is_friendly_to(a):
+            return
+        self.network.link_airport(a, b)
+
+    def add_sparse_airlift_links(self, airports: list[ControlPoint]) -> None:
+        """Links airports with as few airlift links as possible.
+
+        Linking every airport to every other airport makes the airlift graph
+        complete, which makes routing slow in theaters with many airfields. Most of
+        those links are redundant: airlift cost is the distance between airports, so
+        flying via an intermediate airport (or driving part of the way) is often no
+        more expensive than the direct flight.
+
+        The network is seeded with the edges of a Delaunay triangulation of the
+        airports, which is a good approximation of the links that are needed. A
+        direct link is then added between any pair of airports for which the network
+        does not already have a path that is at most as expensive as the direct
+        flight. The result has exactly the same shortest path costs as the complete
+        graph.
+        """
+        if len(airports) < 2:
+            return
+
+        by_position = {(a.position.x, a.position.y): a for a in airports}
+        if len(by_position) >= 3:
+            for edge in triangulate(MultiPoint(list(by_position)), edges=True):
+                a, b = (by_position.get(c) for c in edge.coords)
+                if a is not None and b is not None:
+                    self.link_airports(a, b)
+
+        for airport in airports:
+            tree = self.network.shortest_path_tree(airport)
+            for other in airports:
+                if other == airport:
                     continue
-                self.network.link_airport(control_point, airport)
+                cost = tree.costs.get(other, math.inf)
+                if cost > self.network.airlift_cost(airport, other):
+                    self.link_airports(airport, other)
@@ -1,7 +1,18 @@
 from __future__ import annotations
 
-from functools import singledispatchmethod
-from typing import Iterable, Optional, TYPE_CHECKING, Union
+import itertools
+from collections import defaultdict
+from functools import cached_property, singledispatchmethod
+from typing import (
+    Any,
+    Hashable,
+    Iterable,
+    Mapping,
+    Optional,
+    Sequence,
+    TYPE_CHECKING,
+    Union,
+)
 
 from dcs.mapping import Point as DcsPoint
 from shapely.geometry import (
@@ -12,6 +23,8 @@
 )
 from shapely.geometry.base import BaseGeometry
 from shapely.ops import nearest_points, unary_union
+from shapely.prepared import prep
+from shapely.strtree import STRtree
 
 from game.ato import Flight, FlightWaypoint
 from game.ato.closestairfields import ObjectiveDistanceCache
@@ -31,19 +44,118 @@
 ThreatPoly = Union[MultiPolygon, Polygon]
 
 
+class IndexedThreatZone:
+    """A set of threat circles with a spatial index for intersection queries.
+
+    Testing a geometry against the union of every threat circle is expensive because
+    shapely has to walk every vertex of the (often very large) union for each query.
+    Instead, an STRtree over the individual circles finds the few circles whose bounds
+    overlap the query and only those are tested, using prepared geometries.
+
+    The circles are keyed by the object that projects them (a control point or a
+    TGO) so that a zone without one of those sources can be derived cheaply with
+    `without`. Instances are never modified after construction, so they can be
+    freely shared between ThreatZones.
+
+    The union is still available (and computed lazily) for the callers that need the
+    actual shape of the zone, such as the map display and the navmesh.
+    """
+
+    def __init__(self, zones: Mapping[Hashable, Sequence[ThreatPoly]]) -> None:
+        self.zones_by_source = {
+            source: list(polys) for source, polys in zones.items() if polys
+        }
+        self._build_index()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Prepared geometries and the STRtree can't be pickled, so only the zones are
+        # and the index is rebuilt on load.
+        return {"zones_by_source": self.zones_by_source}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.zones_by_source = state["zones_by_source"]
+        self._build_index()
+
+    def _build_index(self) -> None:
+        self.zones = list(itertools.chain.from_iterable(self.zones_by_source.values()))
+        self._sources = [
+            source
+            for source, polys in self.zones_by_source.items()
+            for _ in range(len(polys))
+        ]
+        self._prepared = [prep(z) for z in self.zones]
+        self._tree: Optional[STRtree] = None
+        if self.zones:
+            self._tree = STRtree(self.zones)
+
+    @cached_property
+    def union(self) -> ThreatPoly:
+        return unary_union(self.zones)
+
+    def intersects(self, geometry: BaseGeometry) -> bool:
+        if self._tree is None:
+            return False
+        for idx in self._tree.query_items(geometry):
+            if self._prepared[idx].intersects(geometry):
+                return True
+        return False
+
+    def sources_intersecting(self, geometry: BaseGeometry) -> list[Hashable]:
+        """Returns the sources of every threat that intersects the given geometry.
+
+        Sources are returned in the order they were given to the constructor.
+        """
+        if self._tree is None:
+            return []
+        sources: list[Hashable] = []
+        for idx in sorted(self._tree.query_items(geometry)):
+            source = self._sources[idx]
+            if source in sources:
+                continue
+            if self._prepared[idx].intersects(geometry):
+                sources.append(source)
+        return sources
+
+    def without(self, source: Hashable) -> IndexedThreatZone:
+        """Returns the zone without the threats projected by the given source.
+
+        Returns this zone unmodified if the source contributes no threats to it.
+        """
+        if source not in self.zones_by_source:
+            return self
+        return IndexedThreatZone(
+            {k: v for k, v in self.zones_by_source.items() if k is not source}
+        )
+
+
 class ThreatZones:
     def __init__(
         self,
         theater: ConflictTheater,
-        airbases: ThreatPoly,
-        air_defenses: ThreatPoly,
-        radar_sam_threats: ThreatPoly,
+        airbases: IndexedThreatZone,
+        air_defenses: IndexedThreatZone,
+        radar_sam_threats: IndexedThreatZone,
     ) -> None:
         self.theater = theater
-        self.airbases = airbases
-        self.air_defenses = air_defenses
-        self.radar_sam_threats = radar_sam_threats
-        self.all = unary_union([airbases, air_defenses])
+        self.airbase_zones = airbases
+        self.air_defense_zones = air_defenses
+        self.radar_sam_zones = radar_sam_threats
+
+    @property
+    def airbases(self) -> ThreatPoly:
+        return self.airbase_zones.union
+
+    @property
+    def air_defenses(self) -> ThreatPoly:
+        return self.air_defense_zones.union
+
+    @property
+    def radar_sam_threats(self) -> ThreatPoly:
+        return self.radar_sam_zones.union
+
+    @cached_property
+    def all(self) -> ThreatPoly:
+        return unary_union([self.airbases, self.air_defenses])
 
     def closest_boundary(self, point: DcsPoint) -> DcsPoint:
         boundary, _ = nearest_points(
@@ -63,17 +175,41 @@ def threatened(self, position) -> bool:  # type: ignore
 
     @threatened.register
     def _threatened_geometry(self, position: BaseGeometry) -> bool:
-        return self.all.intersects(position)
+        if self.airbase_zones.intersects(position):
+            return True
+        return self.air_defense_zones.intersects(position)
 
     @threatened.register
     def _threatened_dcs_point(self, position: DcsPoint) -> bool:
-        return self.all.intersects(self.dcs_to_shapely_point(position))
+        return self.threatened(self.dcs_to_shapely_point(position))
+
+    def threatened_many(self, points: Iterable[DcsPoint]) -> list[bool]:
+        """Returns whether each of the given points is threatened.
+
+        Equivalent to calling threatened for each point, but avoids the per-call
+        dispatch overhead for callers that have many points to check.
+        """
+        return [self._threatened_geometry(self.dcs_to_shapely_point(p)) for p in points]
 
     def path_threatened(self, a: DcsPoint, b: DcsPoint) -> bool:
         return self.threatened(
             LineString([self.dcs_to_shapely_point(a), self.dcs_to_shapely_point(b)])
         )
 
+    def segments_threatened(
+        self, segments: Iterable[tuple[DcsPoint, DcsPoint]]
+    ) -> list[bool]:
+        """Returns whether each of the given (start, end) segments is threatened.
+
+        Equivalent to calling path_threatened for each segment.
+        """
+        return [
+            self._threatened_geometry(
+                LineString([self.dcs_to_shapely_point(a), self.dcs_to_shapely_point(b)])
+            )
+            for a, b in segments
+        ]
+
     # Type checking ignored because singledispatchmethod doesn't work with required type
     # definitions. The implementation methods are all typed, so should be fine.
     @singledispatchmethod
@@ -82,7 +218,7 @@ def threatened_by_aircraft(self, target) -> bool:  # type: ignore
 
     @threatened_by_aircraft.register
     def _threatened_by_aircraft_geom(self, position: BaseGeometry) -> bool:
-        return self.airbases.intersects(position)
+        return self.airbase_zones.intersects(position)
 
     @threatened_by_aircraft.register
     def _threatened_by_aircraft_flight(self, flight: Flight) -> bool:
@@ -109,7 +245,7 @@ def threatened_by_air_defense(self, target) -> bool:  # type: ignore
 
     @threatened_by_air_defense.register
     def _threatened_by_air_defense_geom(self, position: BaseGeometry) -> bool:
-        return self.air_defenses.intersects(position)
+        return self.air_defense_zones.intersects(position)
 
     @threatened_by_air_defense.register
     def _threatened_by_air_defense_dcs_point(self, position: DcsPoint) -> bool:
@@ -135,7 +271,7 @@ def threatened_by_radar_sam(self, target) -> bool:  # type: ignore
 
     @threatened_by_radar_sam.register
     def _threatened_by_radar_sam_geom(self, position: BaseGeometry) -> bool:
-        return self.radar_sam_threats.intersects(position)
+        return self.radar_sam_zones.intersects(position)
 
     @threatened_by_radar_sam.register
     def _threatened_by_radar_sam_flight(self, flight: Flight) -> bool:
@@ -231,13 +367,13 @@ def for_threats(
             belongs to the player, it is the zone that will be avoided by the enemy and
             vice versa.
         """
-        air_threats = []
-        air_defense_threats = []
-        radar_sam_threats = []
+        air_threats: dict[Hashable, list[Polygon]] = {}
+        air_defense_threats: dict[Hashable, list[Polygon]] = defaultdict(list)
+        radar_sam_threats: dict[Hashable, list[Polygon]] = defaultdict(list)
         for barcap in barcap_locations:
             point = ShapelyPoint(barcap.position.x, barcap.position.y)
             cap_threat_range = cls.barcap_threat_range(doctrine, barcap)
-            air_threats.append(point.buffer(cap_threat_range.meters))
+            air_threats[barcap] = [point.buffer(cap_threat_range.meters)]
 
         for tgo in air_defenses:
             for group in tgo.groups:
@@ -247,18 +383,33 @@ def for_threats(
                 if threat_range > nautical_miles(3):
                     point = ShapelyPoint(tgo.position.x, tgo.position.y)
                     threat_zone = point.buffer(threat_range.meters)
-                    air_defense_threats.append(threat_zone)
+                    air_defense_threats[tgo].append(threat_zone)
                 radar_threat_range = group.max_threat_range(radar_only=True)
                 if radar_threat_range > nautical_miles(3):
                     point = ShapelyPoint(tgo.position.x, tgo.position.y)
                     threat_zone = point.buffer(radar_threat_range.meters)
-                    radar_sam_threats.append(threat_zone)
+                    radar_sam_threats[tgo].append(threat_zone)
 
         return ThreatZones(
             theater,
-            airbases=unary_union(air_threats),
-            air_defenses=unary_union(air_defense_threats),
-            radar_sam_threats=unary_union(radar_sam_threats),
+            airbases=IndexedThreatZone(air_threats),
+            air_defenses=IndexedThreatZone(air_defense_threats),
+            radar_sam_threats=IndexedThreatZone(radar_sam_threats),
+        )
+
+    def without_air_defense(self, tgo: TheaterGroundObject) -> ThreatZones:
+        """Returns the threat zones that remain after the given TGO is destroyed.
+
+        This is much cheaper than rebuilding the threat zones from scratch with
+        for_threats: the threat circles are not rebuilt, the aircraft threats are
+        shared with this object, and the unions are only computed if needed. This
+        object is not modified.
+        """
+        return ThreatZones(
+            self.theater,
+            airbases=self.airbase_zones,
+            air_defenses=self.air_defense_zones.without(tgo),
+            radar_sam_threats=self.radar_sam_zones.without(tgo),
         )
 
     @staticmethod
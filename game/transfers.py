@@ -719,7 +719,7 @@ def desired_airlift_capacity(self, control_point: ControlPoint) -> int:
                 if (
                     cp.can_deploy_ground_units
                     and not cp.has_factory
-                    and transit_network.has_link(control_point, cp)
+                    and transit_network.can_airlift_between(control_point, cp)
                     and not any(
                         link_type
                         for link, link_type in transit_network.nodes[cp].items()
@@ -1,8 +1,10 @@
 import argparse
 import logging
+import multiprocessing
 import os
 import sys
-from datetime import datetime
+import timeit
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
@@ -14,9 +16,11 @@
 
 from game import Game, VERSION, logging_config, persistency
 from game.campaignloader.campaign import Campaign, DEFAULT_BUDGET
+from game.commander import TheaterCommander
 from game.data.weapons import Pylon, Weapon, WeaponGroup
 from game.dcs.aircrafttype import AircraftType
 from game.factions import FACTIONS
+from game.missiongenerator import MissionGenerator
 from game.profiling import logged_duration
 from game.server import EventStream, Server
 from game.settings import Settings
@@ -100,14 +104,17 @@ def run_ui(game: Game | None, dev: bool) -> None:
     pixmap = QPixmap("./resources/ui/splash_screen.png")
     splash = QSplashScreen(pixmap)
     splash.show()
-
-    # Once splash screen is up : load resources & setup stuff
-    uiconstants.load_icons()
-    uiconstants.load_event_icons()
-    uiconstants.load_aircraft_icons()
-    uiconstants.load_vehicle_icons()
-    uiconstants.load_aircraft_banners()
-    uiconstants.load_vehicle_banners()
+    splash_shown = timeit.default_timer()
+
+    # Once splash screen is up : load resources & setup stuff. Images are only
+    # registered here, and are decoded when they are first used.
+    with logged_duration("Registering UI images"):
+        uiconstants.load_icons()
+        uiconstants.load_event_icons()
+        uiconstants.load_aircraft_icons()
+        uiconstants.load_vehicle_icons()
+        uiconstants.load_aircraft_banners()
+        uiconstants.load_vehicle_banners()
 
     # Show warning if no DCS Installation directory was set
     if liberation_install.get_dcs_install_directory() == "":
@@ -153,6 +160,10 @@ def run_ui(game: Game | None, dev: bool) -> None:
     window = QLiberationWindow(game, dev)
     window.showMaximized()
     splash.finish(window)
+    logging.info(
+        "Main window shown %s after the splash screen",
+        timedelta(seconds=timeit.default_timer() - splash_shown),
+    )
     qt_execution_code = app.exec_()
 
     # Restore Mission Scripting file
@@ -180,6 +191,27 @@ def path_arg(arg: str) -> Path:
 
     parser.add_argument("--dev", action="store_true", help="Enable development mode.")
 
+    parser.add_argument(
+        "--cprofile-mission-stage",
+        action="append",
+        default=[],
+        help=(
+            "Captures the named mission generation stage with cProfile. The results "
+            "are included in the profile written next to the generated mission. May "
+            "be given more than once."
+        ),
+    )
+
+    parser.add_argument(
+        "--trace-planning",
+        type=Path,
+        help=(
+            "Writes a trace of each theater commander plan, and the state it was "
+            "planned from, to the given directory. The traces can be replayed with "
+            "resources/tools/replay_planning_trace.py."
+        ),
+    )
+
     parser.add_argument("--new-map", help="Deprecated. Does nothing.")
     parser.add_argument("--old-map", help="Deprecated. Does nothing.")
 
@@ -343,6 +375,9 @@ def main():
     if args.warn_missing_weapon_data:
         lint_all_weapon_data()
 
+    MissionGenerator.cprofile_stages = set(args.cprofile_mission_stage)
+    TheaterCommander.trace_dir = args.trace_planning
+
     load_mods()
 
     if args.subcommand == "new-game":
@@ -368,4 +403,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Required for worker processes (such as those used for navmesh generation) to
+    # work in the packaged release.
+    multiprocessing.freeze_support()
     main()
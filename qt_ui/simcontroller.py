@@ -69,8 +69,8 @@ def set_simulation_speed(self, simulation_speed: SimSpeedSetting) -> None:
             self.started = True
         self.game_loop.set_simulation_speed(simulation_speed)
 
-    def run_to_first_contact(self) -> None:
-        self.game_loop.run_to_first_contact()
+    def run_to_first_contact(self, fast_forward: bool = True) -> None:
+        self.game_loop.run_to_first_contact(fast_forward)
 
     def generate_miz(self, output: Path) -> None:
         self.game_loop.pause_and_generate_miz(output)
@@ -1,7 +1,13 @@
+from __future__ import annotations
+
 import os
-from typing import Dict
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
 
-from PySide2.QtGui import QPixmap
+from PySide2.QtCore import QObject, Signal
+from PySide2.QtGui import QImage, QPixmap
 
 from game.theater.theatergroundobject import NAME_BY_CATEGORY
 from .liberation_theme import get_theme_icons
@@ -16,210 +22,301 @@
 LABELS_OPTIONS = ["Full", "Abbreviated", "Dot Only", "Neutral Dot", "Off"]
 SKILL_OPTIONS = ["Average", "Good", "High", "Excellent"]
 
-AIRCRAFT_BANNERS: Dict[str, QPixmap] = {}
-AIRCRAFT_ICONS: Dict[str, QPixmap] = {}
-VEHICLE_BANNERS: Dict[str, QPixmap] = {}
-VEHICLES_ICONS: Dict[str, QPixmap] = {}
-ICONS: Dict[str, QPixmap] = {}
+
+class PixmapRegistry(Mapping[str, QPixmap]):
+    """Pixmaps of image files, decoded the first time they are looked up.
+
+    The names and files of the images are registered up front, which only needs
+    directory listings. At most max_cached decoded pixmaps are kept, and the least
+    recently used pixmap is dropped first. Pixmaps are implicitly shared, so a dropped
+    pixmap stays valid for the widgets using it.
+
+    Pixmaps can only be created in the GUI thread. Use async_loader to decode large
+    images in a worker thread instead.
+    """
+
+    def __init__(self, max_cached: int) -> None:
+        self.max_cached = max_cached
+        #: The file of each image, by name.
+        self.paths: dict[str, str] = {}
+        #: The decoded pixmaps, by file, from least to most recently used.
+        self._pixmaps: OrderedDict[str, QPixmap] = OrderedDict()
+        self._async_loader: Optional[AsyncPixmapLoader] = None
+
+    def add(self, name: str, path: str) -> None:
+        self.paths[name] = path
+
+    def alias(self, name: str, target: str) -> None:
+        """Makes the name another name for the target's image."""
+        self.paths[name] = self.paths[target]
+
+    def add_directory(self, directory: str, extension: str, name_end: int) -> None:
+        """Adds each image in the directory with the given extension.
+
+        Each image is named after its file name up to name_end.
+        """
+        for file_name in os.listdir(directory):
+            if file_name.endswith(extension):
+                self.add(file_name[:name_end], os.path.join(directory, file_name))
+
+    def cached(self, name: str) -> Optional[QPixmap]:
+        """Returns the pixmap of the image if it has already been decoded."""
+        path = self.paths[name]
+        pixmap = self._pixmaps.get(path)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(path)
+        return pixmap
+
+    def insert(self, name: str, pixmap: QPixmap) -> None:
+        """Caches a pixmap decoded elsewhere for the image."""
+        self._pixmaps[self.paths[name]] = pixmap
+        self._pixmaps.move_to_end(self.paths[name])
+        while len(self._pixmaps) > self.max_cached:
+            self._pixmaps.popitem(last=False)
+
+    def async_loader(self) -> AsyncPixmapLoader:
+        if self._async_loader is None:
+            self._async_loader = AsyncPixmapLoader(self)
+        return self._async_loader
+
+    def __getitem__(self, name: str) -> QPixmap:
+        pixmap = self.cached(name)
+        if pixmap is None:
+            pixmap = QPixmap(self.paths[name])
+            self.insert(name, pixmap)
+        return pixmap
+
+    def __contains__(self, name: object) -> bool:
+        # Checked without decoding the image.
+        return name in self.paths
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.paths)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+
+class AsyncPixmapLoader(QObject):
+    """Decodes the images of a PixmapRegistry in a worker thread.
+
+    Images are decoded to QImages in the worker thread, and converted to pixmaps in
+    the GUI thread when the decoded signal is delivered there.
+    """
+
+    #: Emitted in the GUI thread with the name and pixmap of each requested image.
+    loaded = Signal(str, QPixmap)
+    _decoded = Signal(str, QImage)
+
+    def __init__(self, registry: PixmapRegistry) -> None:
+        super().__init__()
+        self.registry = registry
+        self._pending: set[str] = set()
+        self._decoded.connect(self._on_decoded)
+
+    def request(self, name: str) -> Optional[QPixmap]:
+        """Returns the pixmap of the image, or None if it is not decoded yet.
+
+        If the image is not decoded yet, loaded is emitted once it is.
+        """
+        pixmap = self.registry.cached(name)
+        if pixmap is not None:
+            return pixmap
+        if name not in self._pending:
+            self._pending.add(name)
+            _pixmap_executor().submit(self._decode, name, self.registry.paths[name])
+        return None
+
+    def _decode(self, name: str, path: str) -> None:
+        # Runs in the worker thread, so the signal is queued to the GUI thread.
+        self._decoded.emit(name, QImage(path))
+
+    def _on_decoded(self, name: str, image: QImage) -> None:
+        self._pending.discard(name)
+        pixmap = QPixmap.fromImage(image)
+        self.registry.insert(name, pixmap)
+        self.loaded.emit(name, pixmap)
+
+
+_pixmap_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _pixmap_executor() -> ThreadPoolExecutor:
+    # A single worker so that images are decoded in the order they are requested.
+    global _pixmap_pool
+    if _pixmap_pool is None:
+        _pixmap_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pixmaps")
+    return _pixmap_pool
+
+
+AIRCRAFT_BANNERS = PixmapRegistry(max_cached=16)
+AIRCRAFT_ICONS = PixmapRegistry(max_cached=256)
+VEHICLE_BANNERS = PixmapRegistry(max_cached=16)
+VEHICLES_ICONS = PixmapRegistry(max_cached=256)
+ICONS = PixmapRegistry(max_cached=256)
 
 
 def load_icons():
 
-    ICONS["New"] = QPixmap("./resources/ui/misc/" + get_theme_icons() + "/new.png")
-    ICONS["Open"] = QPixmap("./resources/ui/misc/" + get_theme_icons() + "/open.png")
-    ICONS["Save"] = QPixmap("./resources/ui/misc/" + get_theme_icons() + "/save.png")
-    ICONS["Discord"] = QPixmap(
-        "./resources/ui/misc/" + get_theme_icons() + "/discord.png"
-    )
-    ICONS["Github"] = QPixmap(
-        "./resources/ui/misc/" + get_theme_icons() + "/github.png"
-    )
-    ICONS["Ukraine"] = QPixmap("./resources/ui/misc/ukraine.png")
+    ICONS.add("New", "./resources/ui/misc/" + get_theme_icons() + "/new.png")
+    ICONS.add("Open", "./resources/ui/misc/" + get_theme_icons() + "/open.png")
+    ICONS.add("Save", "./resources/ui/misc/" + get_theme_icons() + "/save.png")
+    ICONS.add("Discord", "./resources/ui/misc/" + get_theme_icons() + "/discord.png")
+    ICONS.add("Github", "./resources/ui/misc/" + get_theme_icons() + "/github.png")
+    ICONS.add("Ukraine", "./resources/ui/misc/ukraine.png")
 
-    ICONS["Control Points"] = QPixmap(
-        "./resources/ui/misc/" + get_theme_icons() + "/circle.png"
-    )
-    ICONS["Ground Objects"] = QPixmap(
-        "./resources/ui/misc/" + get_theme_icons() + "/industry.png"
-    )
-    ICONS["Lines"] = QPixmap(
-        "./resources/ui/misc/" + get_theme_icons() + "/arrows-h.png"
-    )
-    ICONS["Waypoint Information"] = QPixmap(
-        "./resources/ui/misc/" + get_theme_icons() + "/info.png"
-    )
-    ICONS["Map Polygon Debug Mode"] = QPixmap(
-        "./resources/ui/misc/" + get_theme_icons() + "/map.png"
-    )
-    ICONS["Ally SAM Threat Range"] = QPixmap("./resources/ui/misc/blue-sam.png")
-    ICONS["Enemy SAM Threat Range"] = QPixmap("./resources/ui/misc/red-sam.png")
-    ICONS["SAM Detection Range"] = QPixmap("./resources/ui/misc/detection-sam.png")
-    ICONS["Display Culling Zones"] = QPixmap(
-        "./resources/ui/misc/" + get_theme_icons() + "/eraser.png"
-    )
-    ICONS["Hide Flight Paths"] = QPixmap("./resources/ui/misc/hide-flight-path.png")
-    ICONS["Show Selected Flight Path"] = QPixmap("./resources/ui/misc/flight-path.png")
-    ICONS["Show All Flight Paths"] = QPixmap("./resources/ui/misc/all-flight-paths.png")
+    ICONS.add(
+        "Control Points", "./resources/ui/misc/" + get_theme_icons() + "/circle.png"
+    )
+    ICONS.add(
+        "Ground Objects", "./resources/ui/misc/" + get_theme_icons() + "/industry.png"
+    )
+    ICONS.add("Lines", "./resources/ui/misc/" + get_theme_icons() + "/arrows-h.png")
+    ICONS.add(
+        "Waypoint Information", "./resources/ui/misc/" + get_theme_icons() + "/info.png"
+    )
+    ICONS.add(
+        "Map Polygon Debug Mode",
+        "./resources/ui/misc/" + get_theme_icons() + "/map.png",
+    )
+    ICONS.add("Ally SAM Threat Range", "./resources/ui/misc/blue-sam.png")
+    ICONS.add("Enemy SAM Threat Range", "./resources/ui/misc/red-sam.png")
+    ICONS.add("SAM Detection Range", "./resources/ui/misc/detection-sam.png")
+    ICONS.add(
+        "Display Culling Zones",
+        "./resources/ui/misc/" + get_theme_icons() + "/eraser.png",
+    )
+    ICONS.add("Hide Flight Paths", "./resources/ui/misc/hide-flight-path.png")
+    ICONS.add("Show Selected Flight Path", "./resources/ui/misc/flight-path.png")
+    ICONS.add("Show All Flight Paths", "./resources/ui/misc/all-flight-paths.png")
 
-    ICONS["Hangar"] = QPixmap("./resources/ui/misc/hangar.png")
+    ICONS.add("Hangar", "./resources/ui/misc/hangar.png")
 
-    ICONS["Terrain_Caucasus"] = QPixmap("./resources/ui/terrain_caucasus.gif")
-    ICONS["Terrain_PersianGulf"] = QPixmap("./resources/ui/terrain_pg.gif")
-    ICONS["Terrain_Nevada"] = QPixmap("./resources/ui/terrain_nevada.gif")
-    ICONS["Terrain_Normandy"] = QPixmap("./resources/ui/terrain_normandy.gif")
-    ICONS["Terrain_TheChannel"] = QPixmap("./resources/ui/terrain_channel.gif")
-    ICONS["Terrain_Syria"] = QPixmap("./resources/ui/terrain_syria.gif")
-    ICONS["Terrain_MarianaIslands"] = QPixmap("./resources/ui/terrain_marianas.gif")
+    ICONS.add("Terrain_Caucasus", "./resources/ui/terrain_caucasus.gif")
+    ICONS.add("Terrain_PersianGulf", "./resources/ui/terrain_pg.gif")
+    ICONS.add("Terrain_Nevada", "./resources/ui/terrain_nevada.gif")
+    ICONS.add("Terrain_Normandy", "./resources/ui/terrain_normandy.gif")
+    ICONS.add("Terrain_TheChannel", "./resources/ui/terrain_channel.gif")
+    ICONS.add("Terrain_Syria", "./resources/ui/terrain_syria.gif")
+    ICONS.add("Terrain_MarianaIslands", "./resources/ui/terrain_marianas.gif")
 
-    ICONS["Dawn"] = QPixmap("./resources/ui/conditions/timeofday/dawn.png")
-    ICONS["Day"] = QPixmap("./resources/ui/conditions/timeofday/day.png")
-    ICONS["Dusk"] = QPixmap("./resources/ui/conditions/timeofday/dusk.png")
-    ICONS["Night"] = QPixmap("./resources/ui/conditions/timeofday/night.png")
+    ICONS.add("Dawn", "./resources/ui/conditions/timeofday/dawn.png")
+    ICONS.add("Day", "./resources/ui/conditions/timeofday/day.png")
+    ICONS.add("Dusk", "./resources/ui/conditions/timeofday/dusk.png")
+    ICONS.add("Night", "./resources/ui/conditions/timeofday/night.png")
 
-    ICONS["Money"] = QPixmap(
-        "./resources/ui/misc/" + get_theme_icons() + "/money_icon.png"
-    )
-    ICONS["Campaign Management"] = ICONS["Money"]
-    ICONS["PassTurn"] = QPixmap(
-        "./resources/ui/misc/" + get_theme_icons() + "/hourglass.png"
-    )
-    ICONS["Proceed"] = QPixmap(
-        "./resources/ui/misc/" + get_theme_icons() + "/proceed.png"
-    )
-    ICONS["Settings"] = QPixmap(
-        "./resources/ui/misc/" + get_theme_icons() + "/settings.png"
+    ICONS.add("Money", "./resources/ui/misc/" + get_theme_icons() + "/money_icon.png")
+    ICONS.alias("Campaign Management", "Money")
+    ICONS.add("PassTurn", "./resources/ui/misc/" + get_theme_icons() + "/hourglass.png")
+    ICONS.add("Proceed", "./resources/ui/misc/" + get_theme_icons() + "/proceed.png")
+    ICONS.add("Settings", "./resources/ui/misc/" + get_theme_icons() + "/settings.png")
+    ICONS.add(
+        "Statistics", "./resources/ui/misc/" + get_theme_icons() + "/statistics.png"
     )
-    ICONS["Statistics"] = QPixmap(
-        "./resources/ui/misc/" + get_theme_icons() + "/statistics.png"
-    )
-    ICONS["Ordnance"] = QPixmap(
-        "./resources/ui/misc/" + get_theme_icons() + "/ordnance_icon.png"
+    ICONS.add(
+        "Ordnance", "./resources/ui/misc/" + get_theme_icons() + "/ordnance_icon.png"
     )
 
-    ICONS["Generator"] = QPixmap(
-        "./resources/ui/misc/" + get_theme_icons() + "/generator.png"
-    )
-    ICONS["Mission Generation"] = ICONS["Generator"]
-    ICONS["Missile"] = QPixmap(
-        "./resources/ui/misc/" + get_theme_icons() + "/missile.png"
-    )
-    ICONS["Difficulty"] = ICONS["Missile"]
-    ICONS["Cheat"] = QPixmap("./resources/ui/misc/" + get_theme_icons() + "/cheat.png")
-    ICONS["Plugins"] = QPixmap(
-        "./resources/ui/misc/" + get_theme_icons() + "/plugins.png"
-    )
-    ICONS["PluginsOptions"] = QPixmap(
-        "./resources/ui/misc/" + get_theme_icons() + "/pluginsoptions.png"
-    )
-    ICONS["Notes"] = QPixmap("./resources/ui/misc/" + get_theme_icons() + "/notes.png")
-    ICONS["Reload"] = QPixmap(
-        "./resources/ui/misc/" + get_theme_icons() + "/reload.png"
-    )
+    ICONS.add(
+        "Generator", "./resources/ui/misc/" + get_theme_icons() + "/generator.png"
+    )
+    ICONS.alias("Mission Generation", "Generator")
+    ICONS.add("Missile", "./resources/ui/misc/" + get_theme_icons() + "/missile.png")
+    ICONS.alias("Difficulty", "Missile")
+    ICONS.add("Cheat", "./resources/ui/misc/" + get_theme_icons() + "/cheat.png")
+    ICONS.add("Plugins", "./resources/ui/misc/" + get_theme_icons() + "/plugins.png")
+    ICONS.add(
+        "PluginsOptions",
+        "./resources/ui/misc/" + get_theme_icons() + "/pluginsoptions.png",
+    )
+    ICONS.add("Notes", "./resources/ui/misc/" + get_theme_icons() + "/notes.png")
+    ICONS.add("Reload", "./resources/ui/misc/" + get_theme_icons() + "/reload.png")
 
-    ICONS["TaskCAS"] = QPixmap("./resources/ui/tasks/cas.png")
-    ICONS["TaskCAP"] = QPixmap("./resources/ui/tasks/cap.png")
-    ICONS["TaskSEAD"] = QPixmap("./resources/ui/tasks/sead.png")
-    ICONS["TaskEmpty"] = QPixmap("./resources/ui/tasks/empty.png")
+    ICONS.add("TaskCAS", "./resources/ui/tasks/cas.png")
+    ICONS.add("TaskCAP", "./resources/ui/tasks/cap.png")
+    ICONS.add("TaskSEAD", "./resources/ui/tasks/sead.png")
+    ICONS.add("TaskEmpty", "./resources/ui/tasks/empty.png")
 
     """
     Weather Icons
     """
-    ICONS["Weather_winds"] = QPixmap("./resources/ui/conditions/weather/winds.png")
-    ICONS["Weather_day-clear"] = QPixmap(
-        "./resources/ui/conditions/weather/day-clear.png"
-    )
-    ICONS["Weather_day-cloudy-fog"] = QPixmap(
-        "./resources/ui/conditions/weather/day-cloudy-fog.png"
-    )
-    ICONS["Weather_day-fog"] = QPixmap("./resources/ui/conditions/weather/day-fog.png")
-    ICONS["Weather_day-partly-cloudy"] = QPixmap(
-        "./resources/ui/conditions/weather/day-partly-cloudy.png"
-    )
-    ICONS["Weather_day-rain"] = QPixmap(
-        "./resources/ui/conditions/weather/day-rain.png"
-    )
-    ICONS["Weather_day-thunderstorm"] = QPixmap(
-        "./resources/ui/conditions/weather/day-thunderstorm.png"
-    )
-    ICONS["Weather_day-totally-cloud"] = QPixmap(
-        "./resources/ui/conditions/weather/day-totally-cloud.png"
-    )
-    ICONS["Weather_night-clear"] = QPixmap(
-        "./resources/ui/conditions/weather/night-clear.png"
-    )
-    ICONS["Weather_night-cloudy-fog"] = QPixmap(
-        "./resources/ui/conditions/weather/night-cloudy-fog.png"
-    )
-    ICONS["Weather_night-fog"] = QPixmap(
-        "./resources/ui/conditions/weather/night-fog.png"
-    )
-    ICONS["Weather_night-partly-cloudy"] = QPixmap(
-        "./resources/ui/conditions/weather/night-partly-cloudy.png"
-    )
-    ICONS["Weather_night-rain"] = QPixmap(
-        "./resources/ui/conditions/weather/night-rain.png"
-    )
-    ICONS["Weather_night-thunderstorm"] = QPixmap(
-        "./resources/ui/conditions/weather/night-thunderstorm.png"
-    )
-    ICONS["Weather_night-totally-cloud"] = QPixmap(
-        "./resources/ui/conditions/weather/night-totally-cloud.png"
+    ICONS.add("Weather_winds", "./resources/ui/conditions/weather/winds.png")
+    ICONS.add("Weather_day-clear", "./resources/ui/conditions/weather/day-clear.png")
+    ICONS.add(
+        "Weather_day-cloudy-fog", "./resources/ui/conditions/weather/day-cloudy-fog.png"
+    )
+    ICONS.add("Weather_day-fog", "./resources/ui/conditions/weather/day-fog.png")
+    ICONS.add(
+        "Weather_day-partly-cloudy",
+        "./resources/ui/conditions/weather/day-partly-cloudy.png",
+    )
+    ICONS.add("Weather_day-rain", "./resources/ui/conditions/weather/day-rain.png")
+    ICONS.add(
+        "Weather_day-thunderstorm",
+        "./resources/ui/conditions/weather/day-thunderstorm.png",
+    )
+    ICONS.add(
+        "Weather_day-totally-cloud",
+        "./resources/ui/conditions/weather/day-totally-cloud.png",
+    )
+    ICONS.add(
+        "Weather_night-clear", "./resources/ui/conditions/weather/night-clear.png"
+    )
+    ICONS.add(
+        "Weather_night-cloudy-fog",
+        "./resources/ui/conditions/weather/night-cloudy-fog.png",
+    )
+    ICONS.add("Weather_night-fog", "./resources/ui/conditions/weather/night-fog.png")
+    ICONS.add(
+        "Weather_night-partly-cloudy",
+        "./resources/ui/conditions/weather/night-partly-cloudy.png",
+    )
+    ICONS.add("Weather_night-rain", "./resources/ui/conditions/weather/night-rain.png")
+    ICONS.add(
+        "Weather_night-thunderstorm",
+        "./resources/ui/conditions/weather/night-thunderstorm.png",
+    )
+    ICONS.add(
+        "Weather_night-totally-cloud",
+        "./resources/ui/conditions/weather/night-totally-cloud.png",
     )
 
-    ICONS["heading"] = QPixmap("./resources/ui/misc/heading.png")
+    ICONS.add("heading", "./resources/ui/misc/heading.png")
 
 
-EVENT_ICONS: Dict[str, QPixmap] = {}
+EVENT_ICONS = PixmapRegistry(max_cached=64)
 
 
 def load_event_icons():
-    for image in os.listdir("./resources/ui/events/"):
-        if image.endswith(".PNG"):
-            EVENT_ICONS[image[:-4]] = QPixmap(
-                os.path.join("./resources/ui/events/", image)
-            )
+    EVENT_ICONS.add_directory("./resources/ui/events/", ".PNG", -4)
 
 
 def load_aircraft_icons():
-    for aircraft in os.listdir("./resources/ui/units/aircrafts/icons/"):
-        if aircraft.endswith(".jpg"):
-            AIRCRAFT_ICONS[aircraft[:-7]] = QPixmap(
-                os.path.join("./resources/ui/units/aircrafts/icons/", aircraft)
-            )
-    AIRCRAFT_ICONS["F-16C_50"] = AIRCRAFT_ICONS["F-16C"]
-    AIRCRAFT_ICONS["FA-18C_hornet"] = AIRCRAFT_ICONS["FA-18C"]
-    AIRCRAFT_ICONS["A-10C_2"] = AIRCRAFT_ICONS["A-10C"]
+    AIRCRAFT_ICONS.add_directory("./resources/ui/units/aircrafts/icons/", ".jpg", -7)
+    AIRCRAFT_ICONS.alias("F-16C_50", "F-16C")
+    AIRCRAFT_ICONS.alias("FA-18C_hornet", "FA-18C")
+    AIRCRAFT_ICONS.alias("A-10C_2", "A-10C")
     f1_refuel = ["Mirage-F1CT", "Mirage-F1EE", "Mirage-F1M-EE", "Mirage-F1EQ"]
     for f1 in f1_refuel:
-        AIRCRAFT_ICONS[f1] = AIRCRAFT_ICONS["Mirage-F1C-200"]
-    AIRCRAFT_ICONS["Mirage-F1M-CE"] = AIRCRAFT_ICONS["Mirage-F1CE"]
+        AIRCRAFT_ICONS.alias(f1, "Mirage-F1C-200")
+    AIRCRAFT_ICONS.alias("Mirage-F1M-CE", "Mirage-F1CE")
 
 
 def load_vehicle_icons():
-    for vehicle in os.listdir("./resources/ui/units/vehicles/icons/"):
-        if vehicle.endswith(".jpg"):
-            VEHICLES_ICONS[vehicle[:-7]] = QPixmap(
-                os.path.join("./resources/ui/units/vehicles/icons/", vehicle)
-            )
+    VEHICLES_ICONS.add_directory("./resources/ui/units/vehicles/icons/", ".jpg", -7)
 
 
 def load_aircraft_banners():
-    for aircraft in os.listdir("./resources/ui/units/aircrafts/banners/"):
-        if aircraft.endswith(".jpg"):
-            AIRCRAFT_BANNERS[aircraft[:-7]] = QPixmap(
-                os.path.join("./resources/ui/units/aircrafts/banners/", aircraft)
-            )
+    AIRCRAFT_BANNERS.add_directory(
+        "./resources/ui/units/aircrafts/banners/", ".jpg", -7
+    )
     variants = ["Mirage-F1CT", "Mirage-F1EE", "Mirage-F1M-EE", "Mirage-F1EQ"]
     for f1 in variants:
-        AIRCRAFT_BANNERS[f1] = AIRCRAFT_BANNERS["Mirage-F1C-200"]
+        AIRCRAFT_BANNERS.alias(f1, "Mirage-F1C-200")
     variants = ["Mirage-F1CE", "Mirage-F1M-CE"]
     for f1 in variants:
-        AIRCRAFT_BANNERS[f1] = AIRCRAFT_BANNERS["Mirage-F1C"]
+        AIRCRAFT_BANNERS.alias(f1, "Mirage-F1C")
 
 
 def load_vehicle_banners():
-    for aircraft in os.listdir("./resources/ui/units/vehicles/banners/"):
-        if aircraft.endswith(".jpg"):
-            VEHICLE_BANNERS[aircraft[:-7]] = QPixmap(
-                os.path.join("./resources/ui/units/vehicles/banners/", aircraft)
-            )
+    VEHICLE_BANNERS.add_directory("./resources/ui/units/vehicles/banners/", ".jpg", -7)
@@ -0,0 +1,144 @@
+from pathlib import Path
+from typing import Optional
+
+from PySide2.QtCore import Qt
+from PySide2.QtWidgets import (
+    QAbstractItemView,
+    QDialog,
+    QFileDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from game import persistency
+from game.persistency import SaveInfo
+
+
+class SaveGameTable(QTableWidget):
+    """Table of the save games in a directory.
+
+    The table is populated from the directory's save index, so none of the games
+    need to be loaded.
+    """
+
+    COLUMNS = [
+        "Save",
+        "Turn",
+        "Date",
+        "Theater",
+        "Factions",
+        "Budget",
+        "Bases",
+        "Last Modified",
+    ]
+
+    def __init__(self, saves: list[SaveInfo]) -> None:
+        super().__init__(len(saves), len(self.COLUMNS))
+        self.saves = saves
+        self.setHorizontalHeaderLabels(self.COLUMNS)
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.verticalHeader().setVisible(False)
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.horizontalHeader().setStretchLastSection(True)
+        for row, save in enumerate(saves):
+            for column, text in enumerate(self.row_text(save)):
+                self.setItem(row, column, QTableWidgetItem(text))
+
+    @staticmethod
+    def row_text(save: SaveInfo) -> list[str]:
+        name = save.path.stem
+        modified = f"{save.modified:%Y-%m-%d %H:%M}"
+        header = save.header
+        if header is None:
+            # Saves from before the container format have no header.
+            return [name, "", "", "", "", "", "", modified]
+
+        budget = ""
+        if header.player_budget is not None and header.enemy_budget is not None:
+            budget = f"${header.player_budget:.0f}M / ${header.enemy_budget:.0f}M"
+        bases = ""
+        if header.player_bases is not None and header.enemy_bases is not None:
+            bases = f"{header.player_bases} / {header.enemy_bases}"
+        return [
+            name,
+            str(header.turn),
+            f"{header.date:%Y-%m-%d %H:%M}",
+            header.theater,
+            f"{header.player_faction} vs {header.enemy_faction}",
+            budget,
+            bases,
+            modified,
+        ]
+
+    @property
+    def selected_save(self) -> Optional[SaveInfo]:
+        rows = self.selectionModel().selectedRows()
+        if not rows:
+            return None
+        return self.saves[rows[0].row()]
+
+
+class LoadGameDialog(QDialog):
+    """Dialog for choosing a save game to load."""
+
+    def __init__(self, directory: Path, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.directory = directory
+        self.selected_path: Optional[Path] = None
+
+        self.setMinimumSize(900, 400)
+        self.setWindowTitle("Load Game")
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        self.table = SaveGameTable(persistency.list_saves(directory))
+        self.table.doubleClicked.connect(self.accept)
+        self.table.itemSelectionChanged.connect(self.on_selection_changed)
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        layout.addLayout(button_layout)
+
+        browse_button = QPushButton("Browse...")
+        browse_button.clicked.connect(self.browse)
+        button_layout.addWidget(browse_button)
+
+        button_layout.addStretch()
+
+        self.open_button = QPushButton("Open")
+        self.open_button.setProperty("style", "btn-success")
+        self.open_button.setEnabled(False)
+        self.open_button.clicked.connect(self.accept)
+        button_layout.addWidget(self.open_button, alignment=Qt.AlignRight)
+
+        cancel_button = QPushButton("Cancel")
+        cancel_button.clicked.connect(self.reject)
+        button_layout.addWidget(cancel_button, alignment=Qt.AlignRight)
+
+    def on_selection_changed(self) -> None:
+        self.open_button.setEnabled(self.table.selected_save is not None)
+
+    def browse(self) -> None:
+        file = QFileDialog.getOpenFileName(
+            self,
+            "Select game file to open",
+            dir=str(self.directory),
+            filter="*.liberation",
+        )
+        if file is not None and file[0] != "":
+            self.selected_path = Path(file[0])
+            super().accept()
+
+    def accept(self) -> None:
+        if (save := self.table.selected_save) is None:
+            return
+        self.selected_path = save.path
+        super().accept()
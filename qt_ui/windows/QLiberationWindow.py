@@ -1,6 +1,7 @@
 import logging
 import traceback
 import webbrowser
+from pathlib import Path
 from typing import Optional
 
 from PySide2.QtCore import QSettings, Qt, Signal
@@ -35,6 +36,7 @@
 from qt_ui.widgets.ato import QAirTaskingOrderPanel
 from qt_ui.widgets.map.QLiberationMap import QLiberationMap
 from qt_ui.windows.GameUpdateSignal import GameUpdateSignal
+from qt_ui.windows.LoadGameDialog import LoadGameDialog
 from qt_ui.windows.QDebriefingWindow import QDebriefingWindow
 from qt_ui.windows.basemenu.QBaseMenu2 import QBaseMenu2
 from qt_ui.windows.groundobject.QGroundObjectMenu import QGroundObjectMenu
@@ -308,20 +310,16 @@ def newGame(self):
 
     def openFile(self):
         if self.game is not None and self.game.savepath:
-            save_dir = self.game.savepath
+            save_dir = Path(self.game.savepath).parent
         else:
-            save_dir = str(persistency.save_dir())
-        file = QFileDialog.getOpenFileName(
-            self,
-            "Select game file to open",
-            dir=save_dir,
-            filter="*.liberation",
-        )
-        if file is not None and file[0] != "":
-            game = persistency.load_game(file[0])
+            save_dir = persistency.save_dir()
+        dialog = LoadGameDialog(save_dir, self)
+        if dialog.exec_() and dialog.selected_path is not None:
+            path = str(dialog.selected_path)
+            game = persistency.load_game(path)
             GameUpdateSignal.get_instance().game_loaded.emit(game)
 
-            self.updateWindowTitle(file[0])
+            self.updateWindowTitle(path)
 
     def saveGame(self):
         logging.info("Saving game")
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from PySide2.QtCore import Qt
-from PySide2.QtGui import QIcon
+from PySide2.QtGui import QIcon, QPixmap
 from PySide2.QtWidgets import (
     QDialog,
     QGridLayout,
@@ -34,19 +34,26 @@ def __init__(self, game: Game, unit_type: UnitType) -> None:
 
         self.layout = QGridLayout()
 
-        header = QLabel(self)
-        header.setGeometry(0, 0, 720, 360)
-
-        pixmap = None
+        self.header = QLabel(self)
+        self.header.setGeometry(0, 0, 720, 360)
 
+        banners = AIRCRAFT_BANNERS
+        self.banner_name = "Missing"
         if isinstance(self.unit_type, AircraftType):
-            pixmap = AIRCRAFT_BANNERS.get(self.unit_type.dcs_id)
+            if self.unit_type.dcs_id in AIRCRAFT_BANNERS:
+                self.banner_name = self.unit_type.dcs_id
         elif isinstance(self.unit_type, GroundUnitType):
-            pixmap = VEHICLE_BANNERS.get(self.unit_type.dcs_id)
-        if pixmap is None:
-            pixmap = AIRCRAFT_BANNERS.get("Missing")
-        header.setPixmap(pixmap.scaled(header.width(), header.height()))
-        self.layout.addWidget(header, 0, 0)
+            if self.unit_type.dcs_id in VEHICLE_BANNERS:
+                banners = VEHICLE_BANNERS
+                self.banner_name = self.unit_type.dcs_id
+        # Banners are large, so they are decoded in the background rather than
+        # delaying the window.
+        loader = banners.async_loader()
+        loader.loaded.connect(self.on_banner_loaded)
+        pixmap = loader.request(self.banner_name)
+        if pixmap is not None:
+            self.set_banner(pixmap)
+        self.layout.addWidget(self.header, 0, 0)
 
         self.gridLayout = QGridLayout()
 
@@ -102,6 +109,13 @@ def __init__(self, game: Game, unit_type: UnitType) -> None:
         self.layout.addLayout(self.gridLayout, 1, 0)
         self.setLayout(self.layout)
 
+    def set_banner(self, pixmap: QPixmap) -> None:
+        self.header.setPixmap(pixmap.scaled(self.header.width(), self.header.height()))
+
+    def on_banner_loaded(self, name: str, pixmap: QPixmap) -> None:
+        if name == self.banner_name:
+            self.set_banner(pixmap)
+
     def generateAircraftTasks(self) -> str:
         aircraft_tasks = ""
         unit_type = self.unit_type.dcs_unit_type
@@ -0,0 +1,81 @@
+"""Compares fast-forward simulation against the fixed-step simulation for a save.
+
+Loads the save twice and runs each copy to first contact, once with one second ticks
+and once with fast-forward. The final sim time, the state of every flight, and the
+active combats must be identical. The run times and tick counts of both modes are
+reported.
+"""
+import argparse
+import timeit
+from pathlib import Path
+
+from game import Game, persistency
+from game.sim.gameloop import GameLoop
+from game.sim.gameupdatecallbacks import GameUpdateCallbacks
+
+
+def load(save: Path) -> Game:
+    game = persistency.load_game(str(save))
+    if game is None:
+        raise RuntimeError(f"Could not load {save}")
+    game.on_load()
+    return game
+
+
+def snapshot(game: Game, loop: GameLoop) -> list[str]:
+    lines = [f"time: {loop.current_time_in_sim}"]
+    for player in (True, False):
+        for package in game.coalition_for(player).ato.packages:
+            for flight in package.flights:
+                state = flight.state
+                position = state.estimate_position()
+                lines.append(
+                    f"{flight}: {type(state).__name__} {state.description} "
+                    f"({position.x}, {position.y})"
+                )
+    for combat in loop.sim.aircraft_simulation.combats:
+        lines.append(f"combat: {type(combat).__name__} because {combat.because()}")
+    return lines
+
+
+def run(save: Path, fast_forward: bool) -> tuple[list[str], float, int]:
+    game = load(save)
+    loop = GameLoop(game, GameUpdateCallbacks(lambda: None, lambda _: None))
+    ticks = 0
+    tick = loop.tick
+
+    def counting_tick(
+        suppress_events: bool = False, fast_forward: bool = False
+    ) -> None:
+        nonlocal ticks
+        ticks += 1
+        tick(suppress_events, fast_forward)
+
+    loop.tick = counting_tick  # type: ignore
+    start = timeit.default_timer()
+    loop.run_to_first_contact(fast_forward)
+    elapsed = timeit.default_timer() - start
+    return snapshot(game, loop), elapsed, ticks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("save", type=Path, help="Path to the .liberation save to use.")
+    args = parser.parse_args()
+
+    expected, fixed_time, fixed_ticks = run(args.save, fast_forward=False)
+    actual, fast_time, fast_ticks = run(args.save, fast_forward=True)
+    if expected != actual:
+        for a, b in zip(expected, actual):
+            if a != b:
+                print(f"fixed step:   {a}\nfast-forward: {b}")
+        raise RuntimeError("Fast-forward result differs from fixed-step simulation")
+
+    print(expected[0])
+    print(f"fixed step: {fixed_ticks} ticks, {fixed_time * 1000:.1f} ms")
+    print(f"fast-forward: {fast_ticks} ticks, {fast_time * 1000:.1f} ms")
+    print(f"speedup {fixed_time / fast_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Benchmarks navmesh localization and pathfinding for a saved turn.
+
+Replans every flight in both ATOs of a save game while recording each navmesh query
+that flight planning makes. The recorded legs are then replayed three ways:
+
+* Linear localization followed by an uncached A* search (the original
+  implementation).
+* Indexed localization followed by an uncached A* search.
+* NavMesh.shortest_path, which uses the index and the path cache.
+
+For a representative measurement use a save with a large ATO (200 packages or
+more).
+"""
+import argparse
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+from typing import Optional
+
+from dcs.mapping import Point
+from shapely.geometry import Point as ShapelyPoint
+
+from game import Game, persistency
+from game.ato.flightplans.planningerror import PlanningError
+from game.navmesh import NavMesh, NavMeshPoly, NavPoint
+
+Leg = tuple[Point, Point]
+
+
+def record_legs(game: Game, player: bool) -> list[Leg]:
+    navmesh = game.coalition_for(player).nav_mesh
+    legs: list[Leg] = []
+    shortest_path = navmesh.shortest_path
+
+    def recording_shortest_path(origin: Point, destination: Point) -> list[Point]:
+        legs.append((origin, destination))
+        return shortest_path(origin, destination)
+
+    navmesh.shortest_path = recording_shortest_path  # type: ignore
+    try:
+        for package in game.coalition_for(player).ato.packages:
+            for flight in package.flights:
+                try:
+                    flight.recreate_flight_plan()
+                except PlanningError:
+                    pass
+    finally:
+        del navmesh.shortest_path
+    return legs
+
+
+def localize_linear(navmesh: NavMesh, point: Point) -> Optional[NavMeshPoly]:
+    p = ShapelyPoint(point.x, point.y)
+    for navpoly in navmesh.polys:
+        if navpoly.poly.intersects(p):
+            return navpoly
+    return None
+
+
+def replay_uncached(
+    navmesh: NavMesh,
+    legs: list[Leg],
+    localize: Callable[[NavMesh, Point], Optional[NavMeshPoly]],
+) -> tuple[float, float]:
+    localize_time = 0.0
+    path_time = 0.0
+    for origin, destination in legs:
+        start = timeit.default_timer()
+        origin_poly = localize(navmesh, origin)
+        destination_poly = localize(navmesh, destination)
+        localize_time += timeit.default_timer() - start
+        if origin_poly is None or destination_poly is None:
+            continue
+        start = timeit.default_timer()
+        navmesh._shortest_path(
+            NavPoint(origin.x, origin.y, origin_poly),
+            NavPoint(destination.x, destination.y, destination_poly),
+        )
+        path_time += timeit.default_timer() - start
+    return localize_time, path_time
+
+
+def replay_cached(navmesh: NavMesh, legs: list[Leg]) -> float:
+    navmesh._path_cache.clear()
+    start = timeit.default_timer()
+    for origin, destination in legs:
+        navmesh.shortest_path(origin, destination)
+    return timeit.default_timer() - start
+
+
+def benchmark(game: Game) -> None:
+    for player in (True, False):
+        name = "blue" if player else "red"
+        navmesh = game.coalition_for(player).nav_mesh
+        legs = record_legs(game, player)
+        packages = len(game.coalition_for(player).ato.packages)
+        print(
+            f"{name}: {packages} packages, {len(legs)} navmesh legs, "
+            f"{len(navmesh.polys)} nav polys"
+        )
+
+        localize, path = replay_uncached(navmesh, legs, localize_linear)
+        print(
+            f"\tlinear localize {localize * 1000:.1f} ms, A* {path * 1000:.1f} ms, "
+            f"total {(localize + path) * 1000:.1f} ms"
+        )
+        localize, path = replay_uncached(navmesh, legs, NavMesh.localize)
+        print(
+            f"\tindexed localize {localize * 1000:.1f} ms, A* {path * 1000:.1f} ms, "
+            f"total {(localize + path) * 1000:.1f} ms"
+        )
+        print(
+            f"\tindexed and cached total {replay_cached(navmesh, legs) * 1000:.1f} ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("save", type=Path, help="Path to the .liberation save to use.")
+    args = parser.parse_args()
+
+    game = persistency.load_game(str(args.save))
+    if game is None:
+        raise RuntimeError(f"Could not load {args.save}")
+    game.on_load()
+    benchmark(game)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmarks loading resource files with and without the resource cache.
+
+Loads every unit, weapon, airfield, squadron and faction file bundled with
+Liberation four ways:
+
+* With the pure Python YAML loader, as resources were loaded before the cache.
+* With the resource cache's parser (the C YAML loader, if available), uncached.
+* Through a cold resource cache, which parses every file and saves the cache.
+* Through a warm resource cache opened from the saved file.
+
+The results of each are checked for equality with the first.
+"""
+import json
+import tempfile
+import timeit
+from pathlib import Path
+from typing import Any, Callable
+
+import yaml
+
+from game.resourcecache import ResourceCache, parse_resource
+
+RESOURCE_GLOBS = [
+    "resources/units/aircraft/*.yaml",
+    "resources/units/ground_units/*.yaml",
+    "resources/units/ships/*.yaml",
+    "resources/weapons/**/*.yaml",
+    "resources/airfields/*/*.yaml",
+    "resources/squadrons/*/*.yaml",
+    "resources/factions/*.json",
+]
+
+
+def resource_files() -> list[Path]:
+    return sorted(path for pattern in RESOURCE_GLOBS for path in Path().glob(pattern))
+
+
+def load_python(path: Path) -> Any:
+    with path.open(encoding="utf-8") as resource_file:
+        if path.suffix == ".json":
+            return json.load(resource_file)
+        return yaml.safe_load(resource_file)
+
+
+def timed(load: Callable[[Path], Any], files: list[Path]) -> tuple[list[Any], float]:
+    start = timeit.default_timer()
+    data = [load(path) for path in files]
+    return data, timeit.default_timer() - start
+
+
+def main() -> None:
+    files = resource_files()
+    expected, python_time = timed(load_python, files)
+    parsed, parse_time = timed(parse_resource, files)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_path = Path(temp_dir) / "resources.p"
+
+        start = timeit.default_timer()
+        cold_cache = ResourceCache.open(cache_path)
+        cold, _ = timed(cold_cache.load, files)
+        cold_cache.save()
+        cold_time = timeit.default_timer() - start
+
+        start = timeit.default_timer()
+        warm_cache = ResourceCache.open(cache_path)
+        warm, _ = timed(warm_cache.load, files)
+        warm_time = timeit.default_timer() - start
+        cache_size = cache_path.stat().st_size
+
+    for name, data in (("parsed", parsed), ("cold", cold), ("warm", warm)):
+        if data != expected:
+            raise RuntimeError(f"{name} resources differ from the pure Python loader")
+    if warm_cache.misses:
+        raise RuntimeError(f"Warm cache missed {warm_cache.misses} files")
+
+    print(f"{len(files)} files, cache {cache_size / 1024:.0f} KiB")
+    print(f"Pure Python loader: {python_time * 1000:.1f} ms")
+    print(f"Uncached parse: {parse_time * 1000:.1f} ms")
+    print(f"Cold cache (parse and save): {cold_time * 1000:.1f} ms")
+    print(f"Warm cache: {warm_time * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Benchmarks theater commander planning with copy-on-write planner states.
+
+For each bundled campaign (or the campaigns given on the command line), generates a
+new game with the recommended factions and plans the missions of both coalitions
+for its first turn from the same state in two ways:
+
+* Eagerly, copying every list and dict of the planner state for each clone, as the
+  planner did before the states were copy-on-write.
+* With the copy-on-write states.
+
+The planned packages must be identical. The number of clones, the number of fields
+and bytes copied, and the best planning time of each of several runs are reported.
+"""
+import argparse
+import pickle
+import timeit
+from datetime import datetime, time
+from pathlib import Path
+
+from game import Game
+from game.campaignloader.campaign import Campaign
+from game.commander import TheaterCommander
+from game.commander.theaterstate import COPY_ON_WRITE_FIELDS, TheaterState
+from game.factions import FACTIONS
+from game.profiling import HierarchicalProfiler, MultiEventTracer
+from game.settings import Settings
+from game.sim import GameUpdateEvents
+from game.theater.start_generator import GameGenerator, GeneratorSettings, ModSettings
+
+COW_CLONE = TheaterState.clone
+
+
+def eager_clone(self: TheaterState) -> TheaterState:
+    clone = COW_CLONE(self)
+    for name in COPY_ON_WRITE_FIELDS:
+        clone._writable(name)
+    return clone
+
+
+def generate(campaign: Campaign) -> Game:
+    theater = campaign.load_theater(campaign.advanced_iads)
+    if campaign.recommended_start_date is None:
+        start_date = datetime.now()
+    else:
+        start_date = datetime.combine(campaign.recommended_start_date, time())
+    game = GameGenerator(
+        FACTIONS[campaign.recommended_player_faction],
+        FACTIONS[campaign.recommended_enemy_faction],
+        theater,
+        campaign.load_air_wing_config(theater),
+        Settings(),
+        GeneratorSettings(
+            start_date=start_date,
+            start_time=campaign.recommended_start_time,
+            player_budget=campaign.recommended_player_money,
+            enemy_budget=campaign.recommended_enemy_money,
+            inverted=False,
+            advanced_iads=theater.iads_network.advanced_iads,
+            no_carrier=False,
+            no_lha=False,
+            no_player_navy=False,
+            no_enemy_navy=False,
+        ),
+        ModSettings(),
+    ).generate()
+    game.begin_turn_0()
+    # Nothing can be planned on turn 0 because none of the aircraft have been
+    # delivered yet.
+    game.finish_turn(GameUpdateEvents(), skipped=True)
+    game.initialize_turn(GameUpdateEvents())
+    return game
+
+
+def plan(game: Game, eager: bool) -> tuple[list[str], dict[str, int], float]:
+    TheaterState.clone = eager_clone if eager else COW_CLONE  # type: ignore
+    try:
+        with HierarchicalProfiler("Theater planning") as profiler:
+            start = timeit.default_timer()
+            for player in (True, False):
+                coalition = game.coalition_for(player)
+                coalition.ato.clear()
+                coalition.air_wing.reset()
+                with MultiEventTracer() as tracer:
+                    TheaterCommander(game, player).plan_missions(tracer)
+            elapsed = timeit.default_timer() - start
+    finally:
+        TheaterState.clone = COW_CLONE  # type: ignore
+
+    packages = []
+    for player in (True, False):
+        for package in game.coalition_for(player).ato.packages:
+            flights = ", ".join(
+                f"{f.count}x {f.unit_type} {f.flight_type}" for f in package.flights
+            )
+            packages.append(f"{package.target.name}: {flights}")
+    return packages, profiler.root.counters, elapsed
+
+
+def best_plan(
+    saved: bytes, eager: bool, repeat: int
+) -> tuple[list[str], dict[str, int], float]:
+    runs = [plan(pickle.loads(saved), eager) for _ in range(repeat)]
+    packages, counters, _ = runs[0]
+    return packages, counters, min(elapsed for _, _, elapsed in runs)
+
+
+def benchmark(campaign: Campaign, repeat: int) -> bool:
+    saved = pickle.dumps(generate(campaign))
+    expected, eager_counters, eager_time = best_plan(saved, True, repeat)
+    actual, cow_counters, cow_time = best_plan(saved, False, repeat)
+
+    print(f"{campaign.name}: {len(expected)} packages")
+    for name, counters, elapsed in (
+        ("eager", eager_counters, eager_time),
+        ("copy-on-write", cow_counters, cow_time),
+    ):
+        print(
+            f"\t{name}: {counters.get('theater state clones', 0)} clones, "
+            f"{counters.get('theater state fields copied', 0)} fields copied, "
+            f"{counters.get('theater state bytes copied', 0) / 1024:.0f} KiB copied, "
+            f"{elapsed * 1000:.1f} ms"
+        )
+    if expected != actual:
+        for a, b in zip(expected, actual):
+            if a != b:
+                print(f"\teager:         {a}\n\tcopy-on-write: {b}")
+        return False
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "campaigns",
+        type=Path,
+        nargs="*",
+        help="Campaign yaml files to plan. Defaults to all bundled campaigns.",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Number of times to plan in each mode."
+    )
+    args = parser.parse_args()
+
+    if args.campaigns:
+        campaigns = [Campaign.from_file(path) for path in args.campaigns]
+    else:
+        campaigns = list(Campaign.load_each())
+
+    failed = [c.name for c in campaigns if not benchmark(c, args.repeat)]
+    if failed:
+        raise RuntimeError(f"Copy-on-write plans differ for: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Benchmarks ThreatZones queries against the union-based implementation.
+
+Loads a save game and records the threat queries that flight planning performs for
+that turn: every waypoint, every leg and every full route of each flight in both
+ATOs, plus the position of every control point and ground object. Those queries are
+then replayed both against the plain shapely unions (the pre-index implementation)
+and against ThreatZones, the results are checked for equality, and the speedup is
+reported.
+"""
+import argparse
+import timeit
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from dcs.mapping import Point
+from shapely.geometry import LineString, Point as ShapelyPoint
+
+from game import Game, persistency
+from game.threatzones import ThreatZones
+
+
+@dataclass
+class RecordedQueries:
+    points: list[Point] = field(default_factory=list)
+    segments: list[tuple[Point, Point]] = field(default_factory=list)
+    routes: list[list[Point]] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.points) + len(self.segments) + 3 * len(self.routes)
+
+
+def record_queries(game: Game, player: bool) -> RecordedQueries:
+    """Records the queries made against the threat zones of the given coalition."""
+    queries = RecordedQueries()
+    for cp in game.theater.controlpoints:
+        queries.points.append(cp.position)
+        for tgo in cp.ground_objects:
+            queries.points.append(tgo.position)
+
+    for package in game.coalition_for(not player).ato.packages:
+        for flight in package.flights:
+            route = [w.position for w in flight.points]
+            if len(route) < 2:
+                continue
+            queries.points.extend(route)
+            queries.segments.extend(zip(route, route[1:]))
+            queries.routes.append(route)
+    return queries
+
+
+def to_shapely(point: Point) -> ShapelyPoint:
+    return ShapelyPoint(point.x, point.y)
+
+
+def replay_union(zones: ThreatZones, queries: RecordedQueries) -> list[bool]:
+    everything = zones.all
+    airbases = zones.airbases
+    air_defenses = zones.air_defenses
+    radar_sams = zones.radar_sam_threats
+    results = [everything.intersects(to_shapely(p)) for p in queries.points]
+    results.extend(
+        everything.intersects(LineString([to_shapely(a), to_shapely(b)]))
+        for a, b in queries.segments
+    )
+    for route in queries.routes:
+        line = LineString([to_shapely(p) for p in route])
+        results.append(airbases.intersects(line))
+        results.append(air_defenses.intersects(line))
+        results.append(radar_sams.intersects(line))
+    return results
+
+
+def replay_indexed(zones: ThreatZones, queries: RecordedQueries) -> list[bool]:
+    results = zones.threatened_many(queries.points)
+    results.extend(zones.segments_threatened(queries.segments))
+    for route in queries.routes:
+        line = LineString([to_shapely(p) for p in route])
+        results.append(zones.threatened_by_aircraft(line))
+        results.append(zones.threatened_by_air_defense(line))
+        results.append(zones.threatened_by_radar_sam(line))
+    return results
+
+
+def best_time(func: Callable[[], object], iterations: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=iterations))
+
+
+def benchmark(game: Game, iterations: int) -> None:
+    for player in (True, False):
+        name = "blue" if player else "red"
+        zones = game.threat_zone_for(player)
+        queries = record_queries(game, player)
+
+        # Warm the lazily computed unions so that the legacy path isn't charged for
+        # building them.
+        _ = zones.all, zones.radar_sam_threats
+
+        expected = replay_union(zones, queries)
+        actual = replay_indexed(zones, queries)
+        if expected != actual:
+            mismatches = sum(1 for a, b in zip(expected, actual) if a != b)
+            raise RuntimeError(
+                f"{mismatches} of {len(expected)} {name} threat queries differ"
+            )
+
+        union_time = best_time(lambda: replay_union(zones, queries), iterations)
+        indexed_time = best_time(lambda: replay_indexed(zones, queries), iterations)
+        print(
+            f"{name} threat zones: {queries.count} queries, "
+            f"union {union_time * 1000:.1f} ms, indexed {indexed_time * 1000:.1f} ms, "
+            f"speedup {union_time / indexed_time:.1f}x"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("save", type=Path, help="Path to the .liberation save to use.")
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=5,
+        help="Number of times to replay the queries. The best time is reported.",
+    )
+    args = parser.parse_args()
+
+    game = persistency.load_game(str(args.save))
+    if game is None:
+        raise RuntimeError(f"Could not load {args.save}")
+    game.on_load()
+    benchmark(game, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
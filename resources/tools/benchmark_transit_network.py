@@ -0,0 +1,130 @@
+"""Benchmarks transit network routing for a saved turn.
+
+Builds each coalition's transit network from a save game and replays a batch of
+random transfer queries (a reachability check followed by a shortest path, which is
+what transfer planning does for each pending transfer) two ways:
+
+* With a Dijkstra search and a DFS for every query (the original implementation).
+* With the routes that TransitNetworkBuilder precomputes.
+
+The results of both are checked for equality. Use a save with a large theater for a
+representative measurement.
+"""
+import argparse
+import random
+import timeit
+from pathlib import Path
+
+from game import Game, persistency
+from game.theater import ControlPoint
+from game.theater.transitnetwork import (
+    NoPathError,
+    TransitNetwork,
+    TransitNetworkBuilder,
+)
+
+Query = tuple[ControlPoint, ControlPoint]
+Result = tuple[bool, list[ControlPoint], float]
+
+
+def has_path_between_dfs(
+    network: TransitNetwork,
+    origin: ControlPoint,
+    destination: ControlPoint,
+    seen: set[ControlPoint],
+) -> bool:
+    seen.add(origin)
+    for connection in network.nodes[origin]:
+        if connection in seen:
+            continue
+        if connection == destination:
+            return True
+        if has_path_between_dfs(network, connection, destination, seen):
+            return True
+    return False
+
+
+def replay_uncached(network: TransitNetwork, queries: list[Query]) -> list[Result]:
+    results = []
+    for origin, destination in queries:
+        reachable = has_path_between_dfs(network, origin, destination, set())
+        tree = network._dijkstra(origin)
+        path: list[ControlPoint] = []
+        current = destination
+        while current != origin:
+            path.append(current)
+            previous = tree.came_from.get(current)
+            if previous is None:
+                path = []
+                break
+            current = previous
+        path.reverse()
+        results.append((reachable, path, tree.costs.get(destination, 0.0)))
+    return results
+
+
+def replay_precomputed(network: TransitNetwork, queries: list[Query]) -> list[Result]:
+    results = []
+    for origin, destination in queries:
+        reachable = network.has_path_between(origin, destination)
+        try:
+            path, cost = network.shortest_path_with_cost(origin, destination)
+        except NoPathError:
+            path, cost = [], 0.0
+        results.append((reachable, path, cost))
+    return results
+
+
+def benchmark(game: Game, transfers: int, seed: int) -> None:
+    rng = random.Random(seed)
+    for player in (True, False):
+        name = "blue" if player else "red"
+        start = timeit.default_timer()
+        network = TransitNetworkBuilder(game.theater, player).build()
+        build_time = timeit.default_timer() - start
+
+        nodes = list(network.nodes)
+        if len(nodes) < 2:
+            print(f"{name}: transit network has fewer than two nodes")
+            continue
+        queries = [tuple(rng.sample(nodes, 2)) for _ in range(transfers)]
+
+        start = timeit.default_timer()
+        expected = replay_uncached(network, queries)  # type: ignore
+        uncached_time = timeit.default_timer() - start
+
+        start = timeit.default_timer()
+        actual = replay_precomputed(network, queries)  # type: ignore
+        precomputed_time = timeit.default_timer() - start
+
+        if expected != actual:
+            raise RuntimeError(f"{name} transit routes differ")
+
+        print(
+            f"{name}: {len(nodes)} nodes, {transfers} transfers, "
+            f"build with routes {build_time * 1000:.1f} ms, "
+            f"per-query search {uncached_time * 1000:.1f} ms, "
+            f"precomputed {precomputed_time * 1000:.1f} ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("save", type=Path, help="Path to the .liberation save to use.")
+    parser.add_argument(
+        "--transfers",
+        type=int,
+        default=500,
+        help="Number of random transfers to route.",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    game = persistency.load_game(str(args.save))
+    if game is None:
+        raise RuntimeError(f"Could not load {args.save}")
+    benchmark(game, args.transfers, args.seed)
+
+
+if __name__ == "__main__":
+    main()
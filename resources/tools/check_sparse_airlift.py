@@ -0,0 +1,89 @@
+"""Checks sparse airlift links against the complete airlift graph.
+
+For each bundled campaign (or the campaigns given on the command line), builds the
+transit network of each side with both complete and sparse airlift links and checks
+that every pair of control points has the same shortest path cost and reachability
+in both. Reports the number of links and the time to build and route each network.
+"""
+import argparse
+import math
+import timeit
+from pathlib import Path
+
+from game.campaignloader.campaign import Campaign
+from game.theater import ConflictTheater
+from game.theater.transitnetwork import TransitNetwork, TransitNetworkBuilder
+
+
+def link_count(network: TransitNetwork) -> int:
+    return sum(len(links) for links in network.nodes.values()) // 2
+
+
+def timed_build(
+    theater: ConflictTheater, player: bool, sparse: bool
+) -> tuple[TransitNetwork, float]:
+    start = timeit.default_timer()
+    network = TransitNetworkBuilder(theater, player, sparse_airlift=sparse).build()
+    return network, timeit.default_timer() - start
+
+
+def compare(complete: TransitNetwork, sparse: TransitNetwork) -> list[str]:
+    errors = []
+    for origin in complete.nodes:
+        complete_tree = complete.shortest_path_tree(origin)
+        sparse_tree = sparse.shortest_path_tree(origin)
+        for destination in complete.nodes:
+            expected = complete_tree.costs.get(destination, math.inf)
+            actual = sparse_tree.costs.get(destination, math.inf)
+            if not (expected == actual or math.isclose(expected, actual)):
+                errors.append(
+                    f"{origin} to {destination}: expected cost {expected}, got {actual}"
+                )
+            if complete.has_path_between(
+                origin, destination
+            ) != sparse.has_path_between(origin, destination):
+                errors.append(f"{origin} to {destination}: reachability differs")
+    return errors
+
+
+def check(campaign: Campaign) -> bool:
+    theater = campaign.load_theater(advanced_iads=False)
+    ok = True
+    for player in (True, False):
+        complete, complete_time = timed_build(theater, player, sparse=False)
+        sparse, sparse_time = timed_build(theater, player, sparse=True)
+        errors = compare(complete, sparse)
+        side = "blue" if player else "red"
+        print(
+            f"{campaign.name} ({side}): {len(sparse.airports)} airports, "
+            f"{link_count(complete)} links complete ({complete_time * 1000:.1f} ms), "
+            f"{link_count(sparse)} links sparse ({sparse_time * 1000:.1f} ms)"
+        )
+        for error in errors:
+            print(f"\t{error}")
+        ok = ok and not errors
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "campaigns",
+        type=Path,
+        nargs="*",
+        help="Campaign yaml files to check. Defaults to all bundled campaigns.",
+    )
+    args = parser.parse_args()
+
+    if args.campaigns:
+        campaigns = [Campaign.from_file(path) for path in args.campaigns]
+    else:
+        campaigns = list(Campaign.load_each())
+
+    failed = [c.name for c in campaigns if not check(c)]
+    if failed:
+        raise RuntimeError(f"Sparse airlift links differ for: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
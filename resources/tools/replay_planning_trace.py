@@ -0,0 +1,97 @@
+"""Replays theater commander plans traced with --trace-planning.
+
+Each traced plan is saved as a .state file, the pickled game and TheaterState the plan
+started from, and a .json file with the trace of the plan. For each trace given on the
+command line (or every trace in the given directories), the state is loaded and planned
+from again. The steps of the replayed plan must match the recorded trace. The recorded
+and replayed planning times are reported along with the slowest tasks of the replay
+and the tasks that were backtracked to most often.
+"""
+import argparse
+import pickle
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from game.commander import TheaterCommander
+from game.commander.theaterstate import TheaterState
+from game.htn import PlanningTrace, TRACE_BACKTRACKED
+
+
+def trace_paths(paths: list[Path]) -> list[Path]:
+    traces = []
+    for path in paths:
+        if path.is_dir():
+            traces.extend(sorted(path.glob("*.json")))
+        else:
+            traces.append(path)
+    return traces
+
+
+def replay(state_path: Path) -> PlanningTrace:
+    with state_path.open("rb") as state_file:
+        game, state = pickle.load(state_file)
+    if not isinstance(state, TheaterState):
+        raise TypeError(f"Expected TheaterState in {state_path}, got {type(state)}")
+    trace = PlanningTrace()
+    TheaterCommander(game, state.context.coalition.player).plan(state, trace)
+    return trace
+
+
+def summarize(trace: PlanningTrace, top: int) -> None:
+    durations: dict[str, float] = defaultdict(float)
+    for event in trace.events:
+        durations[event.task] += event.duration
+    slowest = sorted(durations.items(), key=lambda item: item[1], reverse=True)
+    for task, duration in slowest[:top]:
+        print(f"\t{duration * 1000:8.1f} ms {task}")
+    backtracks = Counter(
+        event.task for event in trace.events if event.action == TRACE_BACKTRACKED
+    )
+    for task, count in backtracks.most_common(top):
+        print(f"\t{count:5} backtracks to {task}")
+
+
+def check(path: Path, top: int) -> bool:
+    recorded = PlanningTrace.load_json(path)
+    replayed = replay(path.with_suffix(".state"))
+    backtracks = sum(1 for e in replayed.events if e.action == TRACE_BACKTRACKED)
+    print(
+        f"{path.stem}: {len(replayed.events)} steps, {backtracks} backtracks, "
+        f"recorded {recorded.duration * 1000:.1f} ms, "
+        f"replayed {replayed.duration * 1000:.1f} ms"
+    )
+    summarize(replayed, top)
+
+    expected = recorded.decisions()
+    actual = replayed.decisions()
+    if expected == actual and recorded.succeeded == replayed.succeeded:
+        return True
+    for index, (a, b) in enumerate(zip(expected, actual)):
+        if a != b:
+            print(f"\tstep {index} differs:\n\trecorded: {a}\n\treplayed: {b}")
+            break
+    else:
+        print(f"\trecorded {len(expected)} steps, replayed {len(actual)}")
+    return False
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "traces",
+        type=Path,
+        nargs="+",
+        help="Trace files to replay, or directories of traces.",
+    )
+    parser.add_argument(
+        "--top", type=int, default=5, help="Number of tasks to list for each trace."
+    )
+    args = parser.parse_args()
+
+    failed = [p.stem for p in trace_paths(args.traces) if not check(p, args.top)]
+    if failed:
+        raise RuntimeError(f"Replayed plans differ for: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
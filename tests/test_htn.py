@@ -0,0 +1,97 @@
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from game.htn import (
+    CompoundTask,
+    Method,
+    Planner,
+    PlanningTrace,
+    PrimitiveTask,
+    TRACE_APPLIED,
+    TRACE_BACKTRACKED,
+    TRACE_DECOMPOSED,
+    TRACE_FAILED,
+    WorldState,
+)
+
+
+@dataclass
+class CounterState(WorldState["CounterState"]):
+    count: int = 0
+
+    def clone(self) -> "CounterState":
+        return CounterState(self.count)
+
+
+class Increment(PrimitiveTask[CounterState]):
+    def preconditions_met(self, state: CounterState) -> bool:
+        return True
+
+    def apply_effects(self, state: CounterState) -> None:
+        state.count += 1
+
+
+class NeedsCount(PrimitiveTask[CounterState]):
+    def preconditions_met(self, state: CounterState) -> bool:
+        return state.count > 0
+
+    def apply_effects(self, state: CounterState) -> None:
+        raise AssertionError("Preconditions are never met")
+
+
+class Child(CompoundTask[CounterState]):
+    def each_valid_method(self, state: CounterState) -> Iterator[Method[CounterState]]:
+        yield [Increment()]
+
+
+class Root(CompoundTask[CounterState]):
+    def each_valid_method(self, state: CounterState) -> Iterator[Method[CounterState]]:
+        yield [NeedsCount()]
+        yield [Increment(), Child()]
+
+
+class CounterPlanner(Planner[CounterState, PrimitiveTask[CounterState]]):
+    def __init__(self) -> None:
+        super().__init__(Root())
+
+
+def test_trace_records_backtracking() -> None:
+    trace = PlanningTrace()
+    result = CounterPlanner().plan(CounterState(), trace)
+
+    assert result is not None
+    assert result.end_state.count == 2
+    assert [type(t) for t in result.tasks] == [Increment, Increment]
+    assert trace.succeeded
+    assert trace.decisions() == [
+        (TRACE_DECOMPOSED, "Root", 1),
+        (TRACE_FAILED, "NeedsCount", None),
+        (TRACE_BACKTRACKED, "Root", None),
+        (TRACE_DECOMPOSED, "Root", 2),
+        (TRACE_APPLIED, "Increment", None),
+        (TRACE_DECOMPOSED, "Child", 1),
+        (TRACE_APPLIED, "Increment", None),
+    ]
+    assert [e.parent for e in trace.events] == [None, 0, None, None, 3, 3, 5]
+    assert [e.subtasks for e in trace.events] == [
+        ["NeedsCount"],
+        [],
+        [],
+        ["Increment", "Child"],
+        [],
+        ["Increment"],
+        [],
+    ]
+
+
+def test_trace_json_round_trip() -> None:
+    trace = PlanningTrace()
+    CounterPlanner().plan(CounterState(), trace)
+
+    loaded = PlanningTrace.from_dict(json.loads(json.dumps(trace.to_dict())))
+
+    assert loaded.decisions() == trace.decisions()
+    assert loaded.events == trace.events
+    assert loaded.succeeded == trace.succeeded
+    assert loaded.duration == trace.duration
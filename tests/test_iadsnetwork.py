@@ -0,0 +1,142 @@
+from unittest.mock import MagicMock
+
+import pytest
+from dcs.mapping import Point
+from dcs.terrain import Caucasus
+
+from game.point_with_heading import PointWithHeading
+from game.sim import GameUpdateEvents
+from game.theater import ControlPoint
+from game.theater.iadsnetwork.iadsnetwork import IadsNetwork
+from game.theater.iadsnetwork.iadsrole import IadsRole
+from game.theater.presetlocation import PresetLocation
+from game.theater.theatergroundobject import (
+    IadsBuildingGroundObject,
+    SamGroundObject,
+    TheaterGroundObject,
+)
+from game.theater.theatergroup import IadsGroundGroup
+from game.utils import Heading, nautical_miles
+
+TERRAIN = Caucasus()
+
+
+class GroupIds:
+    def __init__(self) -> None:
+        self.next_id = 0
+
+    def add_group(self, tgo: TheaterGroundObject, role: IadsRole) -> IadsGroundGroup:
+        self.next_id += 1
+        group = IadsGroundGroup(
+            self.next_id,
+            f"{tgo.name} group {self.next_id}",
+            PointWithHeading.from_point(tgo.position, Heading.from_degrees(0)),
+            [],
+            tgo,
+        )
+        group.iads_role = role
+        tgo.groups.append(group)
+        return group
+
+
+@pytest.fixture
+def ids() -> GroupIds:
+    return GroupIds()
+
+
+def location(name: str, x_nm: float) -> PresetLocation:
+    return PresetLocation(name, Point(nautical_miles(x_nm).meters, 0, TERRAIN))
+
+
+def sam(ids: GroupIds, name: str, x_nm: float) -> SamGroundObject:
+    tgo = SamGroundObject(name, location(name, x_nm), MagicMock(spec=ControlPoint))
+    ids.add_group(tgo, IadsRole.SAM)
+    return tgo
+
+
+def building(
+    ids: GroupIds, name: str, category: str, x_nm: float
+) -> IadsBuildingGroundObject:
+    tgo = IadsBuildingGroundObject(
+        name, category, location(name, x_nm), MagicMock(spec=ControlPoint)
+    )
+    ids.add_group(tgo, IadsRole.for_category(category))
+    return tgo
+
+
+def connected_tgos(network: IadsNetwork, tgo: TheaterGroundObject) -> list[str]:
+    node = network.node_for_tgo(tgo)
+    assert node is not None
+    return [group.ground_object.name for group in node.connections.values()]
+
+
+def test_network_from_range_connects_power_and_comms_in_range(ids: GroupIds) -> None:
+    sam_site = sam(ids, "SAM", 0)
+    tgos = [
+        sam_site,
+        building(ids, "Power", "power", 30),
+        building(ids, "Far power", "power", 40),
+        building(ids, "Comms", "comms", -10),
+        building(ids, "Far comms", "comms", 20),
+    ]
+    network = IadsNetwork(advanced=True, iads_data=[])
+    network.initialize_network(iter(tgos))
+
+    # Power sources reach 35 nm and connection nodes 15 nm. Neither is a node of its
+    # own in a range based network.
+    assert [node.group.ground_object for node in network.nodes] == [sam_site]
+    assert connected_tgos(network, sam_site) == ["Power", "Comms"]
+
+
+def test_network_from_range_ignores_power_out_of_range(ids: GroupIds) -> None:
+    near = sam(ids, "SAM", 0)
+    far = sam(ids, "Other SAM", 100)
+    network = IadsNetwork(advanced=True, iads_data=[])
+    network.initialize_network(iter([near, far, building(ids, "Power", "power", 50)]))
+
+    assert connected_tgos(network, near) == []
+    assert connected_tgos(network, far) == []
+
+
+def test_update_tgo_refreshes_connections_to_tgo(ids: GroupIds) -> None:
+    sam_site = sam(ids, "SAM", 0)
+    other_sam = sam(ids, "Other SAM", 60)
+    power = building(ids, "Power", "power", 30)
+    network = IadsNetwork(advanced=True, iads_data=[])
+    network.initialize_network(iter([sam_site, other_sam, power]))
+    old_node = network.node_for_tgo(sam_site)
+    assert old_node is not None
+    old_connections = set(old_node.connections)
+
+    # Replacing the units of the power source replaces its group.
+    power.groups.clear()
+    new_group = ids.add_group(power, IadsRole.POWER_SOURCE)
+    events = GameUpdateEvents()
+    network.update_tgo(power, events)
+
+    assert old_node in events.updated_iads
+    assert network.node_for_tgo(other_sam) in events.updated_iads
+    assert events.deleted_iads_connections >= old_connections
+    assert network.node_for_tgo(sam_site) is old_node
+    assert list(old_node.connections.values()) == [new_group]
+
+
+def test_update_tgo_rebuilds_node_with_connections(ids: GroupIds) -> None:
+    sam_site = sam(ids, "SAM", 0)
+    power = building(ids, "Power", "power", 30)
+    network = IadsNetwork(advanced=True, iads_data=[])
+    network.initialize_network(iter([sam_site, power]))
+    old_node = network.node_for_tgo(sam_site)
+    assert old_node is not None
+
+    sam_site.groups.clear()
+    ids.add_group(sam_site, IadsRole.SAM)
+    events = GameUpdateEvents()
+    network.update_tgo(sam_site, events)
+
+    new_node = network.node_for_tgo(sam_site)
+    assert new_node is not None and new_node is not old_node
+    assert network.nodes == [new_node]
+    assert events.updated_iads == {new_node}
+    assert events.deleted_iads_connections == set(old_node.connections)
+    assert connected_tgos(network, sam_site) == ["Power"]
@@ -0,0 +1,121 @@
+import pickle
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, cast
+
+from game.persistency import (
+    SAVE_FORMAT_VERSION,
+    SaveHeader,
+    _Snapshot,
+    _write_atomic,
+    _write_save,
+    load_game,
+    read_save_header,
+)
+from game.version import VERSION
+
+
+@dataclass
+class FakeGame:
+    """Stands in for Game, which is pickled as a whole by the save format."""
+
+    turn: int
+    data: Any
+    savepath: str = ""
+    bases: dict[str, list[int]] = field(default_factory=dict)
+
+
+HEADER = SaveHeader(
+    format_version=SAVE_FORMAT_VERSION,
+    version=VERSION,
+    turn=3,
+    date=datetime(2005, 6, 1, 8),
+    theater="Caucasus",
+    player_faction="USA 2005",
+    enemy_faction="Russia 2010",
+    player_budget=1200.0,
+    enemy_budget=800.0,
+    player_bases=4,
+    enemy_bases=5,
+)
+
+
+def make_game() -> FakeGame:
+    # The PickleBuffer is written out-of-band, so the buffer frames are also covered.
+    return FakeGame(
+        turn=3,
+        data=pickle.PickleBuffer(bytearray(range(256)) * 1024),
+        bases={"Batumi": list(range(1000)), "Kobuleti": [1, 2, 3]},
+    )
+
+
+def write_game(path: Path, game: FakeGame) -> None:
+    _write_atomic(path, lambda f: _write_save(f, HEADER, game=cast(Any, game)))
+
+
+def test_save_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / "test.liberation"
+    write_game(path, make_game())
+
+    assert read_save_header(str(path)) == HEADER
+    loaded = cast(FakeGame, load_game(str(path)))
+    assert isinstance(loaded, FakeGame)
+    assert loaded.turn == 3
+    assert bytes(loaded.data) == bytes(bytearray(range(256)) * 1024)
+    assert loaded.bases == {"Batumi": list(range(1000)), "Kobuleti": [1, 2, 3]}
+    assert loaded.savepath == str(path)
+    assert not path.with_name(f"{path.name}.tmp").exists()
+
+
+def test_snapshot_round_trip(tmp_path: Path) -> None:
+    game = make_game()
+    buffers: list[pickle.PickleBuffer] = []
+    payload = pickle.dumps(game, protocol=5, buffer_callback=buffers.append)
+    snapshot = _Snapshot(payload, [bytes(b.raw()) for b in buffers])
+    path = tmp_path / "autosave.liberation"
+    _write_atomic(path, lambda f: _write_save(f, HEADER, snapshot=snapshot))
+
+    assert read_save_header(str(path)) == HEADER
+    loaded = cast(FakeGame, load_game(str(path)))
+    assert isinstance(loaded, FakeGame)
+    assert loaded.bases == game.bases
+
+
+def test_load_legacy_pickle(tmp_path: Path) -> None:
+    path = tmp_path / "legacy.liberation"
+    path.write_bytes(pickle.dumps(FakeGame(turn=1, data=None)))
+
+    assert read_save_header(str(path)) is None
+    loaded = cast(FakeGame, load_game(str(path)))
+    assert isinstance(loaded, FakeGame)
+    assert loaded.turn == 1
+
+
+def test_truncated_save_is_rejected(tmp_path: Path) -> None:
+    path = tmp_path / "test.liberation"
+    write_game(path, make_game())
+    data = path.read_bytes()
+
+    path.write_bytes(data[: len(data) // 2])
+    assert read_save_header(str(path)) == HEADER
+    assert load_game(str(path)) is None
+
+    path.write_bytes(data[:20])
+    assert read_save_header(str(path)) is None
+    assert load_game(str(path)) is None
+
+
+def test_corrupted_save_is_rejected(tmp_path: Path) -> None:
+    path = tmp_path / "test.liberation"
+    write_game(path, make_game())
+    data = bytearray(path.read_bytes())
+    # Corrupt the compressed pickle, which follows the header and its length.
+    header_length = len(HEADER.to_bytes())
+    pickle_start = 8 + 4 + header_length + 8
+    for i in range(pickle_start + 32, pickle_start + 64):
+        data[i] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    assert read_save_header(str(path)) == HEADER
+    assert load_game(str(path)) is None
@@ -2,7 +2,16 @@
 
 import pytest
 
-from game.radio.radios import MHz, RadioFrequency, kHz
+from game.radio.radios import (
+    ChannelInUseError,
+    ChannelPressure,
+    MHz,
+    Radio,
+    RadioFrequency,
+    RadioRange,
+    RadioRegistry,
+    kHz,
+)
 
 
 @pytest.mark.parametrize("units,factory", [("kHz", kHz), ("MHz", MHz)])
@@ -34,3 +43,55 @@ def test_radio_parsing(units: str, factory: Callable[..., RadioFrequency]) -> No
         RadioFrequency.parse(f"0. {units}")
     with pytest.raises(ValueError):
         RadioFrequency.parse(f"255.5555 {units}")
+
+
+def test_allocate_lowest_free_channel() -> None:
+    registry = RadioRegistry()
+    radio = Radio("test", (RadioRange(MHz(100), MHz(103), MHz(1)),))
+    registry.reserve(MHz(100))
+    assert registry.alloc_for_radio(radio) == MHz(101)
+    assert registry.alloc_for_radio(radio) == MHz(102)
+
+
+def test_overlapping_radios_do_not_share_channels() -> None:
+    registry = RadioRegistry()
+    narrow = Radio("narrow", (RadioRange(MHz(225), MHz(227), MHz(1)),))
+    fine = Radio("fine", (RadioRange(MHz(225), MHz(226), kHz(500)),))
+    allocated = {registry.alloc_for_radio(fine) for _ in range(2)}
+    allocated.add(registry.alloc_for_radio(narrow))
+    assert allocated == {MHz(225), MHz(225, 500), MHz(226)}
+
+
+def test_excluded_channels_are_not_allocated() -> None:
+    registry = RadioRegistry()
+    radio = Radio(
+        "test",
+        (RadioRange(MHz(243), MHz(245), MHz(1), excludes=frozenset((MHz(243),))),),
+    )
+    assert registry.alloc_for_radio(radio) == MHz(244)
+
+
+def test_exhausted_radio_reuses_least_reused_channel() -> None:
+    registry = RadioRegistry()
+    radio = Radio("test", (RadioRange(MHz(100), MHz(102), MHz(1)),))
+    assert registry.alloc_for_radio(radio) == MHz(100)
+    assert registry.alloc_for_radio(radio) == MHz(101)
+    assert registry.alloc_for_radio(radio) == MHz(100)
+    assert registry.alloc_for_radio(radio) == MHz(101)
+
+
+def test_reserve_again() -> None:
+    registry = RadioRegistry()
+    registry.reserve(MHz(251))
+    with pytest.raises(ChannelInUseError):
+        registry.reserve(MHz(251))
+
+
+def test_channel_pressure() -> None:
+    registry = RadioRegistry()
+    radio = Radio("test", (RadioRange(MHz(100), MHz(104), MHz(1)),))
+    registry.alloc_for_radio(radio)
+    pressure = {p.band: p for p in registry.channel_pressure()}
+    assert pressure["100-104 MHz AM (1000 kHz steps)"] == ChannelPressure(
+        "100-104 MHz AM (1000 kHz steps)", capacity=4, in_use=1
+    )
@@ -101,3 +101,26 @@ def test_tacan_parsing() -> None:
         TacanChannel.parse("1X ")
     with pytest.raises(ValueError):
         TacanChannel.parse("1x")
+
+
+def test_allocations_block_other_usages() -> None:
+    registry = TacanRegistry()
+    for num in ALL_VALID_X_TR:
+        if num != 40:
+            registry.mark_unavailable(TacanChannel(num, TacanBand.X))
+    assert registry.alloc_for_band(
+        TacanBand.X, TacanUsage.TransmitReceive
+    ) == TacanChannel(40, TacanBand.X)
+
+    # 40X is valid for both usages, but it is no longer free.
+    chanA2A = registry.alloc_for_band(TacanBand.X, TacanUsage.AirToAir)
+    assert chanA2A == TacanChannel(47, TacanBand.X)
+
+
+def test_tacan_channel_pressure() -> None:
+    registry = TacanRegistry()
+    registry.alloc_for_band(TacanBand.Y, TacanUsage.AirToAir)
+    pressure = {p.band: p for p in registry.channel_pressure()}
+    assert pressure["TACAN Y air to air"].capacity == len(ALL_VALID_X_A2A)
+    assert pressure["TACAN Y air to air"].in_use == 1
+    assert pressure["TACAN X air to air"].in_use == 0
@@ -0,0 +1,138 @@
+from typing import Any
+from unittest.mock import MagicMock
+
+from game.commander.battlepositions import BattlePositions
+from game.commander.theaterstate import TheaterState
+from game.theater import ControlPoint
+from game.theater.theatergroundobject import (
+    IadsGroundObject,
+    TheaterGroundObject,
+    VehicleGroupGroundObject,
+)
+
+
+def battle_position(control_point: ControlPoint) -> Any:
+    tgo = MagicMock(spec=VehicleGroupGroundObject)
+    tgo.control_point = control_point
+    return tgo
+
+
+def make_state() -> TheaterState:
+    cp = MagicMock(spec=ControlPoint)
+    return TheaterState(
+        context=MagicMock(),
+        barcaps_needed={cp: 2},
+        active_front_lines=[],
+        air_assault_targets=[],
+        front_line_stances={},
+        vulnerable_front_lines=[],
+        aewc_targets=[],
+        refueling_targets=[],
+        enemy_air_defenses=[],
+        threatening_air_defenses=[],
+        detecting_air_defenses=[],
+        enemy_convoys=[],
+        enemy_shipping=[],
+        enemy_ships=[],
+        enemy_battle_positions={
+            cp: BattlePositions([battle_position(cp)], [battle_position(cp)])
+        },
+        oca_targets=[],
+        strike_targets=[
+            MagicMock(spec=TheaterGroundObject),
+            MagicMock(spec=TheaterGroundObject),
+        ],
+        enemy_barcaps=[],
+        threat_zones=MagicMock(),
+    )
+
+
+def snapshot(state: TheaterState) -> tuple[Any, ...]:
+    return (
+        dict(state.barcaps_needed),
+        list(state.strike_targets),
+        {
+            cp: (list(p.blocking_capture), list(p.defending_front_line))
+            for cp, p in state.enemy_battle_positions.items()
+        },
+    )
+
+
+def modify(state: TheaterState) -> None:
+    ((cp, positions),) = state.enemy_battle_positions.items()
+    state.remove_strike_target(state.strike_targets[0])
+    state.eliminate_battle_position(positions.blocking_capture[0])
+    state.eliminate_battle_position(positions.defending_front_line[0])
+    state.remove_barcap_round(cp)
+
+
+def test_modifying_clone_leaves_parent_unchanged() -> None:
+    parent = make_state()
+    before = snapshot(parent)
+    clone = parent.clone()
+
+    modify(clone)
+
+    assert snapshot(parent) == before
+    assert snapshot(clone) != before
+    assert len(clone.strike_targets) == 1
+    ((cp, positions),) = clone.enemy_battle_positions.items()
+    assert clone.barcaps_needed[cp] == 1
+    assert not positions.blocking_capture
+    assert not positions.defending_front_line
+
+
+def test_modifying_parent_leaves_clone_unchanged() -> None:
+    parent = make_state()
+    before = snapshot(parent)
+    clone = parent.clone()
+
+    modify(parent)
+
+    assert snapshot(clone) == before
+    assert snapshot(parent) != before
+
+
+def test_second_clone_is_unaffected() -> None:
+    parent = make_state()
+    before = snapshot(parent)
+    first = parent.clone()
+    second = parent.clone()
+
+    modify(first)
+    assert snapshot(parent) == before
+    assert snapshot(second) == before
+
+    modify(second)
+    assert snapshot(parent) == before
+    # Modifying a clone of a clone must not affect the clone it was made from.
+    third = first.clone()
+    third.remove_strike_target(third.strike_targets[0])
+    assert len(first.strike_targets) == 1
+    assert not third.strike_targets
+
+
+def test_unmodified_fields_are_shared() -> None:
+    parent = make_state()
+    clone = parent.clone()
+
+    assert clone.strike_targets is parent.strike_targets
+    assert clone.enemy_battle_positions is parent.enemy_battle_positions
+    clone.remove_strike_target(clone.strike_targets[0])
+    assert clone.strike_targets is not parent.strike_targets
+    assert clone.barcaps_needed is parent.barcaps_needed
+
+
+def test_persistent_air_defenses_are_shared() -> None:
+    parent = make_state()
+    clone = parent.clone()
+    threat = MagicMock(spec=IadsGroundObject)
+    detector = MagicMock(spec=IadsGroundObject)
+
+    clone.threatening_air_defenses.append(threat)
+    parent.detecting_air_defenses.append(detector)
+
+    assert clone.threatening_air_defenses is parent.threatening_air_defenses
+    assert clone.detecting_air_defenses is parent.detecting_air_defenses
+    assert parent.threatening_air_defenses == [threat]
+    assert clone.detecting_air_defenses == [detector]